@@ -0,0 +1,62 @@
+"""Benchmark: light-task bin packing heuristics, runtime vs partition quality. PDF §5.
+
+Usage: python benchmarks/bench_placement.py [--m 4 16 64] [--n 1000 5000] [--repeat 3]
+
+For every (m, n) draws n light-task utilizations with total ~ 0.9 m (UUniFast-discard
+capped at 1) and packs them with each heuristic, plus the O(n m) scan WFD as reference.
+Quality: cores over capacity (utilization > 1), max core load, load standard deviation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from rts_sim.gen.utilization import uunifast_discard_batch
+from rts_sim.partition.federated import PLACEMENT_HEURISTICS, pack_decreasing
+
+
+def scan_wfd(util: np.ndarray, n_cores: int) -> np.ndarray:
+    """Reference WFD: scan every core per task."""
+    load = [0.0] * n_cores
+    for u in sorted(util.tolist(), reverse=True):
+        c = min(range(n_cores), key=load.__getitem__)
+        load[c] += u
+    return np.asarray(load)
+
+
+def _best_time(fn, repeat: int) -> tuple[float, object]:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--m", type=int, nargs="+", default=[4, 16, 64])
+    ap.add_argument("--n", type=int, nargs="+", default=[1000, 5000])
+    ap.add_argument("--load", type=float, default=0.9, help="total utilization per core")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'m':>4} {'n':>6} {'heuristic':>9} {'ms':>9} {'overloaded':>10} {'max load':>9} {'load std':>9}")
+    for m in args.m:
+        for n in args.n:
+            util = uunifast_discard_batch(n, np.array([args.load * m]), seed=rng)[0]
+            rows = [(h, *_best_time(lambda h=h: pack_decreasing(util, m, h)[1], args.repeat)) for h in PLACEMENT_HEURISTICS]
+            rows.append(("scan-wfd", *_best_time(lambda: scan_wfd(util, m), args.repeat)))
+            for name, t, load in rows:
+                print(
+                    f"{m:>4} {n:>6} {name:>9} {t * 1e3:9.2f} {int((load > 1 + 1e-9).sum()):>10}"
+                    f" {load.max():9.3f} {load.std():9.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
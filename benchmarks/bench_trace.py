@@ -0,0 +1,90 @@
+"""Benchmark: CA-EDF simulation with and without the schedule trace recorder. PDF §5–6.
+
+Usage: python benchmarks/bench_trace.py [--sets 5] [--m 8] [--n-tasks 10] [--repeat 3]
+
+Simulates the same generated task sets (with resources and overruns) untraced, traced
+into the in-memory ring and traced into chunked files. The untraced run is the plain
+Simulator, which has no tracing code; its time is the reference. Tracing must not change
+the schedule, so the SimStats of all three runs are compared too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from rts_sim.config import load_config
+from rts_sim.experiments.runner import with_resources
+from rts_sim.gen.dag import generate_packed_task_sets
+from rts_sim.models import ExperimentPoint
+from rts_sim.partition.federated import federated_allocation_batch, light_task_placement
+from rts_sim.sched.ca_edf import build_clusters
+from rts_sim.sched.simulator import Simulator, TracingSimulator
+from rts_sim.sched.trace import TraceRecorder
+from rts_sim.utils.seeds import RngStreams
+
+
+def _cases(args: argparse.Namespace) -> list[tuple]:
+    config = load_config()
+    point = ExperimentPoint(
+        n_tasks=args.n_tasks, m=args.m, U_norm=args.u_norm, n_resources=4, total_resource_accesses=4 * args.n_tasks
+    )
+    cases = []
+    for k, packed in enumerate(generate_packed_task_sets(config, args.sets, seed=0, U_sum=args.m * args.u_norm)):
+        packed = with_resources(config, packed, point, RngStreams(k).child("point"))
+        fed = federated_allocation_batch(
+            packed.C_overflow, packed.L_overflow, packed.D, [0, packed.n_tasks], args.m, U=packed.U_overflow
+        )
+        alloc = dict(zip(packed.task_ids, fed.m_i.tolist()))
+        partition = light_task_placement(packed.to_task_set(), alloc, args.m)
+        cases.append((packed, *build_clusters(packed.task_ids, alloc, partition)))
+    return cases
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sets", type=int, default=5)
+    ap.add_argument("--m", type=int, default=8)
+    ap.add_argument("--n-tasks", type=int, default=10)
+    ap.add_argument("--u-norm", type=float, default=0.5)
+    ap.add_argument("--overrun-prob", type=float, default=0.2)
+    ap.add_argument("--capacity", type=int, default=1 << 16, help="records per ring / file chunk")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    cases = _cases(args)
+    tmp = Path(tempfile.mkdtemp())
+
+    def run_all(mode: str) -> tuple[float, list[dict], int]:
+        best, metrics, records = float("inf"), [], 0
+        for _ in range(args.repeat):
+            metrics, records = [], 0
+            t0 = time.perf_counter()
+            for k, (packed, task_cluster, cluster_cores) in enumerate(cases):
+                if mode == "off":
+                    sim = Simulator(packed, task_cluster, cluster_cores)
+                else:
+                    path = tmp / f"{k}.trace" if mode == "file" else None
+                    sim = TracingSimulator(
+                        packed, task_cluster, cluster_cores, trace=TraceRecorder(args.capacity, path)
+                    )
+                st = sim.run(overrun_prob=args.overrun_prob, seed=k)
+                if mode != "off":
+                    sim.trace.close()
+                    records += sim.trace.total
+                metrics.append(st.metrics())
+            best = min(best, time.perf_counter() - t0)
+        return best, metrics, records
+
+    base, ref, _ = run_all("off")
+    print(f"{'trace':>6} {'s':>9} {'vs off':>7} {'records':>9} {'rec/s':>11} {'same schedule':>13}")
+    print(f"{'off':>6} {base:9.3f} {1.0:7.2f} {'-':>9} {'-':>11} {'-':>13}")
+    for mode in ("ring", "file"):
+        t, metrics, records = run_all(mode)
+        print(f"{mode:>6} {t:9.3f} {t / base:7.2f} {records:>9} {records / t:11.0f} {str(metrics == ref):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """Plots and aggregations. PDF §1–6."""
 
 from rts_sim.analysis.plots import plot_results
-from rts_sim.analysis.aggregate import aggregate_results
+from rts_sim.analysis.aggregate import GROUP_KEYS, StreamingAggregator, Welford, aggregate_results
 
-__all__ = ["plot_results", "aggregate_results"]
+__all__ = ["plot_results", "aggregate_results", "GROUP_KEYS", "StreamingAggregator", "Welford"]
@@ -1,30 +1,314 @@
-"""Aggregate experiment results. PDF §1–6."""
+"""Aggregate experiment results. PDF §1–6.
+
+Points are consumed one at a time: StreamingAggregator keeps, per group of sweep
+dimensions, feasibility counts and an online (Welford) mean / variance for every metric,
+so memory grows with the number of groups and metrics, never with the number of points.
+Summaries carry normal-approximation confidence intervals for metric means and Wilson
+score intervals for feasibility ratios; they are written as CSV (one row per group) or
+JSON. A columnar ResultsStore is consumed chunk by chunk, reading only the grouping,
+feasibility and metric columns the summary needs. Stage wall times (time_<stage>) vary
+between runs and are summarized only when asked for by name.
+"""
 
 from __future__ import annotations
 
+import csv
+import json
+import math
+from dataclasses import dataclass, field
 from pathlib import Path
+from statistics import NormalDist
+from typing import Iterable, Sequence
+
+import numpy as np
 
+from rts_sim.experiments.metrics import TIME_PREFIX
 from rts_sim.models import ExperimentPoint
+from rts_sim.store.results import METRIC_PREFIX, Predicate, ResultsStore
+
+# Sweep dimensions points can be grouped by (ExperimentPoint fields).
+GROUP_KEYS = ("n_tasks", "m", "U_norm", "n_resources", "total_resource_accesses")
+
+
+@dataclass
+class Welford:
+    """Online count, mean and sum of squared deviations of one metric.
+
+    Invariants: numerically stable single pass; merge() combines two partial
+    accumulators exactly (Chan et al.), e.g. results of several workers.
+    """
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def merge(self, other: Welford) -> None:
+        n = self.n + other.n
+        if n == 0:
+            return
+        d = other.mean - self.mean
+        self.mean += d * other.n / n
+        self.m2 += other.m2 + d * d * self.n * other.n / n
+        self.n = n
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 below two values)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def ci_halfwidth(self, z: float) -> float:
+        """Half-width of the normal-approximation interval mean +- z * s / sqrt(n)."""
+        return z * self.std / math.sqrt(self.n) if self.n > 1 else 0.0
+
+
+def wilson_interval(k: int, n: int, z: float) -> tuple[float, float]:
+    """Wilson score interval of a ratio k / n; (0, 1) without observations."""
+    if n == 0:
+        return 0.0, 1.0
+    p = k / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+@dataclass
+class GroupStats:
+    """Accumulated statistics of one group of points.
+
+    Invariants: n_feasible <= n_results <= n_points (points without a result are
+    counted but have neither feasibility nor metrics); metrics[name].n <= n_results.
+    """
+
+    n_points: int = 0
+    n_results: int = 0
+    n_feasible: int = 0
+    metrics: dict[str, Welford] = field(default_factory=dict)
+
+    def add(self, point: ExperimentPoint, names: Sequence[str] | None = None) -> None:
+        self.n_points += 1
+        result = point.result
+        if result is None:
+            return
+        self.n_results += 1
+        self.n_feasible += bool(result.feasible)
+        values = result.metrics
+        for name in values if names is None else names:
+            x = values.get(name)
+            if x is None or not math.isfinite(x):
+                continue
+            acc = self.metrics.get(name)
+            if acc is None:
+                acc = self.metrics[name] = Welford()
+            acc.add(float(x))
+
+    def merge(self, other: GroupStats) -> None:
+        self.n_points += other.n_points
+        self.n_results += other.n_results
+        self.n_feasible += other.n_feasible
+        for name, acc in other.metrics.items():
+            self.metrics.setdefault(name, Welford()).merge(acc)
+
+    def summary(self, confidence: float = 0.95) -> dict[str, float]:
+        """Flat summary: counts, feasibility ratio with its interval, per metric
+        `<name>_mean`, `_std`, `_ci` (half-width) and `_n`."""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        low, high = wilson_interval(self.n_feasible, self.n_results, z)
+        out = {
+            "n_points": float(self.n_points),
+            "n_results": float(self.n_results),
+            "n_feasible": float(self.n_feasible),
+            "feasibility_ratio": self.n_feasible / self.n_results if self.n_results else 0.0,
+            "feasibility_ci_low": low,
+            "feasibility_ci_high": high,
+        }
+        for name in sorted(self.metrics):
+            acc = self.metrics[name]
+            out[f"{name}_mean"] = acc.mean
+            out[f"{name}_std"] = acc.std
+            out[f"{name}_ci"] = acc.ci_halfwidth(z)
+            out[f"{name}_n"] = float(acc.n)
+        return out
+
+
+def _default_metrics(names: Iterable[str]) -> list[str]:
+    """Metrics summarized when none are named: all but the run-dependent wall times."""
+    return [n for n in names if not n.startswith(TIME_PREFIX)]
+
+
+class StreamingAggregator:
+    """Group-by aggregation over a stream of experiment points. PDF §1–6.
+
+    Inputs: `by` (any subset of GROUP_KEYS, () = one overall group), optional metric
+    names (default: every metric a point reports except the time_<stage> wall times),
+    confidence level of the intervals.
+    Outputs: add / update consume points; rows() / total() / write() summarize.
+    Invariants: O(groups * metrics) memory; the result does not depend on how the
+    stream is split (merge() of partial aggregators equals one pass), only float
+    rounding depends on the order.
+    """
+
+    def __init__(
+        self,
+        by: Sequence[str] = GROUP_KEYS,
+        metrics: Sequence[str] | None = None,
+        confidence: float = 0.95,
+    ) -> None:
+        unknown = [k for k in by if k not in GROUP_KEYS]
+        if unknown:
+            raise ValueError(f"cannot group by {unknown}; choose from {GROUP_KEYS}")
+        if not 0 < confidence < 1:
+            raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+        self.by = tuple(by)
+        self.metrics = None if metrics is None else tuple(metrics)
+        self.confidence = confidence
+        self.groups: dict[tuple, GroupStats] = {}
+
+    def add(self, point: ExperimentPoint) -> None:
+        key = tuple(getattr(point, k) for k in self.by)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = GroupStats()
+        names = self.metrics
+        if names is None and point.result is not None:
+            names = _default_metrics(point.result.metrics)
+        group.add(point, names)
+
+    def update(self, points: Iterable[ExperimentPoint]) -> StreamingAggregator:
+        for p in points:
+            self.add(p)
+        return self
+
+    def add_columns(self, cols: dict[str, np.ndarray]) -> None:
+        """Consume one chunk of a ResultsStore: the `by` columns, has_result, feasible and
+        METRIC_PREFIX columns (NaN = metric absent); per-group moments are computed
+        vectorized and merged."""
+        n = cols["has_result"].size
+        if n == 0:
+            return
+        if self.by:
+            keys = np.stack([np.asarray(cols[k], dtype=np.float64) for k in self.by], axis=1)
+            _, first, inv = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+            inv = inv.reshape(-1)
+        else:
+            first, inv = np.zeros(1, dtype=np.int64), np.zeros(n, dtype=np.int64)
+        g = first.size
+        has = np.asarray(cols["has_result"], dtype=bool)
+        n_points = np.bincount(inv, minlength=g)
+        n_results = np.bincount(inv, weights=has, minlength=g)
+        n_feasible = np.bincount(inv, weights=has & cols["feasible"], minlength=g)
+        names = self.metrics
+        if names is None:
+            names = _default_metrics(c[len(METRIC_PREFIX) :] for c in cols if c.startswith(METRIC_PREFIX))
+        moments = {}
+        for name in names:
+            x = cols.get(METRIC_PREFIX + name)
+            if x is None:
+                continue
+            ok = has & np.isfinite(x)
+            cnt = np.bincount(inv, weights=ok, minlength=g)
+            xs = np.where(ok, x, 0.0)
+            mean = np.bincount(inv, weights=xs, minlength=g) / np.maximum(cnt, 1)
+            m2 = np.bincount(inv, weights=np.where(ok, (x - mean[inv]) ** 2, 0.0), minlength=g)
+            moments[name] = (cnt.astype(np.int64).tolist(), mean.tolist(), m2.tolist())
+        for q in range(g):
+            key = tuple(cols[k][first[q]].item() for k in self.by)
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = GroupStats()
+            part = GroupStats(int(n_points[q]), int(n_results[q]), int(n_feasible[q]))
+            for name, (cnt, mean, m2) in moments.items():
+                if cnt[q]:
+                    part.metrics[name] = Welford(cnt[q], mean[q], m2[q])
+            group.merge(part)
+
+    def update_store(self, store: ResultsStore, where: Predicate | None = None) -> StreamingAggregator:
+        """Consume a ResultsStore, projecting only the columns the summary needs."""
+        metrics = _default_metrics(store.metric_names) if self.metrics is None else self.metrics
+        columns = [*self.by, "has_result", "feasible"]
+        columns += [METRIC_PREFIX + m for m in metrics if METRIC_PREFIX + m in store.columns]
+        for cols in store.iter_chunks(columns, where):
+            self.add_columns(cols)
+        return self
+
+    def merge(self, other: StreamingAggregator) -> None:
+        if other.by != self.by:
+            raise ValueError(f"cannot merge aggregators grouped by {other.by} and {self.by}")
+        for key, group in other.groups.items():
+            self.groups.setdefault(key, GroupStats()).merge(group)
+
+    def total(self) -> GroupStats:
+        """All groups merged into one."""
+        out = GroupStats()
+        for group in self.groups.values():
+            out.merge(group)
+        return out
+
+    def rows(self) -> list[dict[str, float]]:
+        """One summary row per group, ordered by the group key, key columns first."""
+        return [
+            {**dict(zip(self.by, key)), **self.groups[key].summary(self.confidence)}
+            for key in sorted(self.groups)
+        ]
+
+    def write(self, path: Path) -> Path:
+        """Write rows() as JSON (`.json`) or CSV (anything else; union of columns)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows = self.rows()
+        if path.suffix == ".json":
+            doc = {"group_by": list(self.by), "confidence": self.confidence, "groups": rows}
+            path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+            return path
+        columns = list(self.by) + sorted({c for r in rows for c in r} - set(self.by), key=_column_order)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=columns, restval="")
+            w.writeheader()
+            w.writerows(rows)
+        return path
+
+
+_COUNT_COLUMNS = ("n_points", "n_results", "n_feasible", "feasibility_ratio", "feasibility_ci_low", "feasibility_ci_high")
+
+
+def _column_order(column: str) -> tuple[int, str]:
+    """Counts and feasibility first, then metric columns alphabetically."""
+    if column in _COUNT_COLUMNS:
+        return _COUNT_COLUMNS.index(column), ""
+    return len(_COUNT_COLUMNS), column
 
 
 def aggregate_results(
-    points: list[ExperimentPoint],
+    points: Iterable[ExperimentPoint] | ResultsStore,
     output_path: Path | None = None,
+    by: Sequence[str] = (),
+    confidence: float = 0.95,
 ) -> dict[str, float]:
     """Aggregate metrics across experiment points. PDF §1–6.
 
-    Inputs: list of ExperimentPoint, optional output_path to write CSV/JSON.
-    Outputs: dict of aggregated metric name -> value.
-    Invariants: deterministic; optional file write.
+    Inputs: experiment points (any iterable, consumed once, or a ResultsStore read by
+    column), optional output_path (`.json` or CSV), sweep dimensions to group the
+    written summary by, confidence.
+    Outputs: overall summary (GroupStats.summary) over all points; {} without points.
+    Invariants: deterministic; streaming (StreamingAggregator); optional file write.
     """
-    # TODO: mean feasibility, std, etc.; write CSV if output_path set
-    if not points:
+    agg = StreamingAggregator(by, confidence=confidence)
+    if isinstance(points, ResultsStore):
+        agg.update_store(points)
+    else:
+        agg.update(points)
+    if not agg.groups:
         return {}
-    feasible = sum(1 for p in points if p.result and p.result.feasible)
-    out = {"feasibility_ratio": feasible / len(points), "n_points": len(points)}
     if output_path is not None:
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(f"feasibility_ratio,{out['feasibility_ratio']}\nn_points,{out['n_points']}\n")
-    return out
+        agg.write(output_path)
+    return agg.total().summary(confidence)
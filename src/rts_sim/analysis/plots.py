@@ -1,22 +1,245 @@
-"""Plotting (placeholder). PDF §1–6. Do NOT produce plots yet."""
+"""Schedulability plots from pre-aggregated summaries. PDF §1–6.
+
+Every figure (FIGURES) is drawn from a small summary table: StreamingAggregator rows
+grouped by the figure's x axis and series dimension, built from the columnar results
+store (only the columns the figures need) or from a stream of points. Each summary is
+written next to its figure as CSV and hashed; a figure is rendered again only when the
+hash of its summary (and spec) differs from the one recorded in PLOT_MANIFEST or its
+image is missing, and figures are rendered in separate worker processes. matplotlib is
+optional (`pip install .[plots]`): without it the summaries are still written and the
+figures are left for a later run.
+"""
 
 from __future__ import annotations
 
+import csv
+import hashlib
+import importlib.util
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Callable, Iterable
 
+from rts_sim.analysis.aggregate import StreamingAggregator
 from rts_sim.models import ExperimentPoint
+from rts_sim.store.results import METRIC_PREFIX, ResultsStore
+from rts_sim.utils.workers import resolve_workers
+
+logger = logging.getLogger(__name__)
+
+PLOT_MANIFEST = "plots.json"
+# Bump when the drawing code changes, so unchanged summaries are drawn again.
+RENDER_VERSION = 1
+
+# plot_results status per figure.
+PLOT_RENDERED = "rendered"
+PLOT_SKIPPED = "skipped"  # summary unchanged, image present
+PLOT_UNAVAILABLE = "unavailable"  # matplotlib missing; summary written only
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """One figure: y columns of the summary over `x`, one line per `series` value.
+
+    Invariants: x and series are GROUP_KEYS (series None = one line per y column); y
+    holds (summary column, legend label) pairs; band names the summary columns of the
+    confidence band drawn around the first y column.
+    """
+
+    name: str
+    title: str
+    x: str
+    series: str | None
+    y: tuple[tuple[str, str], ...] = (("feasibility_ratio", "schedulable"),)
+    band: tuple[str, str] | None = ("feasibility_ci_low", "feasibility_ci_high")
+    ylabel: str = "schedulability ratio"
+
+    @property
+    def by(self) -> tuple[str, ...]:
+        return (self.x,) if self.series is None else (self.x, self.series)
+
+    @property
+    def metrics(self) -> tuple[str, ...]:
+        """Metrics the summary needs beyond feasibility (`<metric>_mean` y columns)."""
+        return tuple(col[: -len("_mean")] for col, _ in self.y if col.endswith("_mean"))
+
+
+FIGURES = (
+    FigureSpec("schedulability_vs_U_norm", "Schedulability vs normalized utilization", "U_norm", "m"),
+    FigureSpec("schedulability_vs_n_resources", "Schedulability vs number of resources", "n_resources", "m"),
+    FigureSpec(
+        "schedulability_vs_accesses",
+        "Schedulability vs total resource accesses",
+        "total_resource_accesses",
+        "n_resources",
+    ),
+    # Schedulability of the federated CA-EDF partition next to the one of the
+    # grouping-by-resource partition (PDF §6) of the same task sets.
+    FigureSpec(
+        "federated_vs_grouping",
+        "Federated scheduling vs grouping by resource",
+        "U_norm",
+        None,
+        y=(("feasibility_ratio", "federated: schedulable"), ("group_feasible_mean", "grouping: schedulable")),
+        ylabel="schedulability ratio",
+    ),
+)
+
+
+def figure_summaries(
+    source: ResultsStore | Iterable[ExperimentPoint],
+    figures: Iterable[FigureSpec] = FIGURES,
+) -> dict[str, list[dict[str, float]]]:
+    """Summary rows per figure name, from a results store (column reads) or points.
+
+    Inputs: results store or points (consumed once), figure specs.
+    Outputs: figure name -> StreamingAggregator.rows() grouped by the figure's axes.
+    Invariants: a store is scanned once, chunk by chunk, reading the union of the
+    columns of all figures.
+    """
+    aggs = {f.name: StreamingAggregator(f.by, metrics=f.metrics) for f in figures}
+    if isinstance(source, ResultsStore):
+        # One scan of the union of the columns every figure needs.
+        columns = [*dict.fromkeys(k for agg in aggs.values() for k in agg.by), "has_result", "feasible"]
+        metrics = dict.fromkeys(METRIC_PREFIX + m for agg in aggs.values() for m in agg.metrics or ())
+        columns += [c for c in metrics if c in source.columns]
+        for cols in source.iter_chunks(columns):
+            for agg in aggs.values():
+                agg.add_columns(cols)
+    else:
+        for p in source:
+            for agg in aggs.values():
+                agg.add(p)
+    return {name: agg.rows() for name, agg in aggs.items()}
+
+
+def summary_hash(spec: FigureSpec, rows: list[dict[str, float]]) -> str:
+    """sha256 over spec, summary rows and RENDER_VERSION."""
+    doc = {"spec": asdict(spec), "rows": rows, "version": RENDER_VERSION}
+    return hashlib.sha256(json.dumps(doc, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def render_figure(spec: FigureSpec, rows: list[dict[str, float]], path: Path) -> None:
+    """Draw one figure with matplotlib (Agg backend) into `path`."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    lines: dict[object, list[dict[str, float]]] = {}
+    for r in rows:
+        lines.setdefault(None if spec.series is None else r[spec.series], []).append(r)
+    for value, group in sorted(lines.items(), key=lambda kv: (kv[0] is None, kv[0])):
+        group = sorted(group, key=lambda r: r[spec.x])
+        xs = [r[spec.x] for r in group]
+        for col, label in spec.y:
+            ys = [r.get(col, float("nan")) for r in group]
+            name = label if value is None else f"{spec.series}={value}"
+            (line,) = ax.plot(xs, ys, marker="o", label=name)
+            if spec.band is not None and col == spec.y[0][0]:
+                lo, hi = ([r[c] for r in group] for c in spec.band)
+                ax.fill_between(xs, lo, hi, alpha=0.2, color=line.get_color())
+    ax.set_title(spec.title)
+    ax.set_xlabel(spec.x)
+    ax.set_ylabel(spec.ylabel)
+    ax.set_ylim(-0.02, 1.02)
+    ax.grid(True, alpha=0.3)
+    ax.legend(fontsize="small")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def _write_summary(rows: list[dict[str, float]], path: Path) -> None:
+    columns = list(dict.fromkeys(c for r in rows for c in r))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=columns, restval="")
+        w.writeheader()
+        w.writerows(rows)
 
 
 def plot_results(
-    points: list[ExperimentPoint],
+    points: ResultsStore | Iterable[ExperimentPoint],
     output_dir: Path,
-) -> None:
-    """Generate plots from experiment points. PDF §1–6.
+    workers: int = 1,
+    force: bool = False,
+    figures: Iterable[FigureSpec] = FIGURES,
+    renderer: Callable[[FigureSpec, list[dict[str, float]], Path], None] | None = None,
+    fmt: str = "png",
+) -> dict[str, str]:
+    """Generate plots from experiment results. PDF §1–6.
 
-    Inputs: list of ExperimentPoint, output directory.
-    Outputs: None. Do NOT produce plots in this step (placeholder).
-    Invariants: creates output_dir if needed; no plot files written yet.
+    Inputs: results store or points, output directory, worker processes for rendering
+    (1 = in this process, 0 = all CPUs), force (ignore the manifest), figure specs,
+    renderer (default render_figure; must be picklable for workers > 1), image format.
+    Outputs: figure name -> PLOT_RENDERED / PLOT_SKIPPED / PLOT_UNAVAILABLE.
+    Invariants: creates output_dir; writes <name>.csv summaries; a figure whose summary
+    hash matches the manifest and whose image exists is not rendered again; the
+    manifest records only figures rendered successfully. A failing figure does not stop
+    the others: the manifest is written with every success, then the first error is
+    raised.
     """
-    # TODO: plots (schedulability vs U_norm, vs n_resources, etc.)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    figures = tuple(figures)
+    manifest_path = output_dir / PLOT_MANIFEST
+    manifest: dict[str, str] = {}
+    if manifest_path.exists() and not force:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if renderer is None:
+        if importlib.util.find_spec("matplotlib") is None:
+            logger.warning("matplotlib not installed (pip install .[plots]); writing plot summaries only")
+        else:
+            renderer = render_figure
+
+    status: dict[str, str] = {}
+    summaries = figure_summaries(points, figures)
+    jobs = []
+    for spec in figures:
+        rows = summaries[spec.name]
+        path = output_dir / f"{spec.name}.{fmt}"
+        _write_summary(rows, output_dir / f"{spec.name}.csv")
+        digest = summary_hash(spec, rows)
+        if manifest.get(spec.name) == digest and path.exists():
+            status[spec.name] = PLOT_SKIPPED
+        elif renderer is None:
+            status[spec.name] = PLOT_UNAVAILABLE
+        else:
+            jobs.append((spec, rows, path, digest))
+    workers = min(resolve_workers(workers), max(len(jobs), 1))
+    errors: list[Exception] = []
+
+    def rendered(spec: FigureSpec, digest: str) -> None:
+        status[spec.name] = PLOT_RENDERED
+        manifest[spec.name] = digest
+
+    if workers <= 1:
+        for spec, rows, path, digest in jobs:
+            try:
+                renderer(spec, rows, path)
+            except Exception as exc:
+                errors.append(exc)
+            else:
+                rendered(spec, digest)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {pool.submit(renderer, spec, rows, path): (spec, digest) for spec, rows, path, digest in jobs}
+            for f in as_completed(futures):
+                try:
+                    f.result()
+                except Exception as exc:
+                    errors.append(exc)
+                else:
+                    rendered(*futures[f])
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    if errors:
+        raise errors[0]
+    logger.info(
+        "plots: %d rendered, %d unchanged",
+        sum(s == PLOT_RENDERED for s in status.values()),
+        sum(s == PLOT_SKIPPED for s in status.values()),
+    )
+    return status
@@ -0,0 +1,27 @@
+"""Benchmark suite: per-stage throughput, stored baselines, regression checks. PDF §1–6."""
+
+from rts_sim.bench.suite import (
+    BENCHMARKS,
+    DEFAULT_THRESHOLD,
+    BenchParams,
+    BenchResult,
+    Comparison,
+    compare,
+    load_results,
+    param_grid,
+    run_benchmarks,
+    write_results,
+)
+
+__all__ = [
+    "BENCHMARKS",
+    "DEFAULT_THRESHOLD",
+    "BenchParams",
+    "BenchResult",
+    "Comparison",
+    "compare",
+    "load_results",
+    "param_grid",
+    "run_benchmarks",
+    "write_results",
+]
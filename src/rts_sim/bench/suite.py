@@ -0,0 +1,318 @@
+"""Throughput benchmarks of the pipeline stages. PDF §1–6.
+
+Every benchmark (BENCHMARKS) is a setup function: it builds its inputs for one
+BenchParams (n_tasks, nodes per task, m, resource accesses) outside the timed region
+and returns the call to time. Calls are timed timeit-style: the number of calls per
+sample grows until a sample takes at least `min_time`, and the best of `repeat` samples
+is kept. Results are written as JSON; a stored baseline (same format) is compared
+against with a relative slowdown threshold, so regressions in hot paths show up in a
+local `rts_sim bench` run.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import platform
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+
+from rts_sim.config import Config
+from rts_sim.gen.critical_path import critical_paths
+from rts_sim.gen.dag import MAX_TASK_UTIL_PER_NODE, NORMAL_WCET_RATIO, generate_packed_task_sets
+from rts_sim.gen.erdos_renyi import erdos_renyi_dag_batch
+from rts_sim.gen.utilization import rand_fixed_sum_batch, uunifast_discard_batch
+from rts_sim.models import ExperimentPoint
+from rts_sim.packed import PackedTaskSet
+from rts_sim.partition.federated import FederatedAllocation, federated_allocation_batch, light_task_placement_packed
+from rts_sim.partition.grouping import group_by_resource
+from rts_sim.resources.access import AccessMatrix
+from rts_sim.sched.ca_edf import ca_edf_schedule
+from rts_sim.utils.seeds import RngStreams
+
+# Bump when a benchmark's workload changes, so old baselines are not compared against.
+BENCH_VERSION = 1
+# Vectors per RandFixedSum / UUniFast-discard call (one per task set of a batch).
+BENCH_BATCH = 64
+# Relative slowdown (best time) reported as a regression.
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass(frozen=True)
+class BenchParams:
+    """One benchmark configuration: task-set size, platform and resource load.
+
+    Invariants: every task has exactly nodes_per_task internal nodes; the set has
+    utilization m * U_norm and total_resource_accesses accesses over n_resources.
+    """
+
+    n_tasks: int = 10
+    nodes_per_task: int = 20
+    m: int = 8
+    total_resource_accesses: int = 40
+    n_resources: int = 4
+    U_norm: float = 0.5
+    seed: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"n={self.n_tasks},v={self.nodes_per_task},m={self.m},a={self.total_resource_accesses}"
+
+    def config(self) -> Config:
+        config = Config(seed=self.seed)
+        config.gen.n_tasks = self.n_tasks
+        config.gen.nodes_per_task_min = config.gen.nodes_per_task_max = self.nodes_per_task
+        return config
+
+    def point(self) -> ExperimentPoint:
+        return ExperimentPoint(
+            n_tasks=self.n_tasks,
+            m=self.m,
+            U_norm=self.U_norm,
+            n_resources=self.n_resources,
+            total_resource_accesses=self.total_resource_accesses,
+            seed=self.seed,
+        )
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """Timing of one benchmark at one BenchParams; seconds are per call."""
+
+    name: str
+    params: BenchParams
+    best_s: float
+    mean_s: float
+    number: int  # calls per sample
+    repeat: int  # samples
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.params.label}]"
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """One benchmark against its baseline; ratio = best / baseline best."""
+
+    key: str
+    baseline_s: float
+    current_s: float
+    ratio: float
+    regressed: bool
+
+
+def _packed(p: BenchParams) -> tuple[Config, PackedTaskSet]:
+    """Generated task set with resources, as run_experiment sees it."""
+    from rts_sim.experiments.runner import with_resources
+
+    config = p.config()
+    (packed,) = generate_packed_task_sets(config, k=1, seed=p.seed, U_sum=p.m * p.U_norm)
+    streams = RngStreams(p.seed).child("point")
+    return config, with_resources(config, packed, p.point(), streams)
+
+
+def _federated(packed: PackedTaskSet, m: int) -> FederatedAllocation:
+    return federated_allocation_batch(
+        packed.C_overflow, packed.L_overflow, packed.D, [0, packed.n_tasks], m, U=packed.U_overflow
+    )
+
+
+def _allocation(packed: PackedTaskSet, m: int) -> dict[str, int]:
+    return dict(zip(packed.task_ids, _federated(packed, m).m_i.tolist()))
+
+
+def bench_dag_generation(p: BenchParams) -> Callable[[], object]:
+    """Erdős–Rényi sampling of the set's DAGs in one batch (PDF §2)."""
+    p_edge = p.config().gen.erdos_renyi_p
+    return lambda: erdos_renyi_dag_batch(p.n_tasks, p.nodes_per_task, p.nodes_per_task, p_edge, seed=p.seed)
+
+
+def bench_rand_fixed_sum(p: BenchParams) -> Callable[[], object]:
+    """Task utilizations of BENCH_BATCH sets, bounded as generation bounds them (PDF §1)."""
+    total = p.m * p.U_norm
+    b = min(total, MAX_TASK_UTIL_PER_NODE * p.nodes_per_task)
+    return lambda: rand_fixed_sum_batch(p.n_tasks, total, BENCH_BATCH, b=b, seed=p.seed)
+
+
+def bench_uunifast(p: BenchParams) -> Callable[[], object]:
+    """Node utilizations of every task of BENCH_BATCH sets (PDF §2)."""
+    total = p.m * p.U_norm
+    b = min(total, MAX_TASK_UTIL_PER_NODE * p.nodes_per_task)
+    U = rand_fixed_sum_batch(p.n_tasks, total, BENCH_BATCH, b=b, seed=p.seed).ravel()
+    return lambda: uunifast_discard_batch(p.nodes_per_task, U, seed=p.seed)
+
+
+def bench_critical_path(p: BenchParams) -> Callable[[], object]:
+    """C_i and L_i in both modes for every DAG of the set (PDF §2)."""
+    batch = erdos_renyi_dag_batch(p.n_tasks, p.nodes_per_task, p.nodes_per_task, seed=p.seed)
+    c_overflow = np.random.default_rng(p.seed).uniform(1.0, 10.0, int(batch.node_offsets[-1]))
+    c_normal = NORMAL_WCET_RATIO * c_overflow
+    return lambda: critical_paths(batch, c_normal, c_overflow)
+
+
+def bench_federated(p: BenchParams) -> Callable[[], object]:
+    """Federated core allocation of the set (PDF §5)."""
+    _, packed = _packed(p)
+    return lambda: _allocation(packed, p.m)
+
+
+def bench_wfd(p: BenchParams) -> Callable[[], object]:
+    """Worst-fit decreasing placement of the light tasks (PDF §5)."""
+    _, packed = _packed(p)
+    fed = _federated(packed, p.m)
+    return lambda: light_task_placement_packed(packed.U_overflow, fed.heavy, fed.m_i, packed.task_ids, p.m, "wfd")
+
+
+def bench_grouping(p: BenchParams) -> Callable[[], object]:
+    """Access matrix and grouping by most-requested resource (PDF §6)."""
+    _, packed = _packed(p)
+    return lambda: group_by_resource(AccessMatrix.from_packed(packed), packed.U_overflow, p.m)
+
+
+def bench_lock_simulation(p: BenchParams) -> Callable[[], object]:
+    """CA-EDF simulation with FIFO HI/LO locks and overruns (PDF §5–6)."""
+    config, packed = _packed(p)
+    fed = _federated(packed, p.m)
+    alloc = dict(zip(packed.task_ids, fed.m_i.tolist()))
+    partition = light_task_placement_packed(
+        packed.U_overflow, fed.heavy, fed.m_i, packed.task_ids, p.m, config.partition.placement
+    )
+    access = AccessMatrix.from_packed(packed)
+    sched = config.sched
+    return lambda: ca_edf_schedule(
+        packed, alloc, partition, horizon=sched.horizon, overrun_prob=sched.overrun_prob, seed=p.seed, access=access
+    )
+
+
+def bench_run_experiment(p: BenchParams) -> Callable[[], object]:
+    """One sweep point end to end, without the task-set cache (PDF §1–6)."""
+    from rts_sim.experiments.runner import run_experiment
+
+    config = p.config()
+    return lambda: run_experiment(config, p.point())
+
+
+BENCHMARKS: dict[str, Callable[[BenchParams], Callable[[], object]]] = {
+    "dag_generation": bench_dag_generation,
+    "rand_fixed_sum": bench_rand_fixed_sum,
+    "uunifast_discard": bench_uunifast,
+    "critical_path": bench_critical_path,
+    "federated": bench_federated,
+    "wfd": bench_wfd,
+    "grouping": bench_grouping,
+    "lock_simulation": bench_lock_simulation,
+    "run_experiment": bench_run_experiment,
+}
+
+
+def time_call(fn: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> tuple[float, float, int]:
+    """(best, mean) seconds per call and calls per sample, timeit-style.
+
+    Invariants: calls per sample go 1, 2, 5, 10, 20, ... until one sample takes at least
+    min_time; that calibration sample counts as the first of `repeat`.
+    """
+    number = 1
+    for step in itertools.cycle((2, 2.5, 2)):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= min_time:
+            break
+        number = int(number * step)
+    samples = [elapsed]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append(time.perf_counter() - t0)
+    return min(samples) / number, sum(samples) / len(samples) / number, number
+
+
+def param_grid(
+    n_tasks: Sequence[int], nodes_per_task: Sequence[int], m: Sequence[int], accesses: Sequence[int]
+) -> list[BenchParams]:
+    """Cartesian product of the parameter lists (last varies fastest)."""
+    return [BenchParams(n, v, k, a) for n, v, k, a in itertools.product(n_tasks, nodes_per_task, m, accesses)]
+
+
+def run_benchmarks(
+    params: Iterable[BenchParams],
+    names: Sequence[str] | None = None,
+    repeat: int = 5,
+    min_time: float = 0.05,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    """Time every selected benchmark at every parameter set. PDF §1–6.
+
+    Inputs: parameter sets, benchmark names (default: all of BENCHMARKS), samples per
+    benchmark, minimum sample duration, optional callback per finished result.
+    Outputs: BenchResults in (params, BENCHMARKS order) order.
+    Invariants: setup (generation of inputs) is never timed; KeyError on unknown names.
+    """
+    names = list(BENCHMARKS) if names is None else list(names)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise KeyError(f"unknown benchmarks {unknown}; choose from {list(BENCHMARKS)}")
+    out = []
+    for p in params:
+        for name in names:
+            best, mean, number = time_call(BENCHMARKS[name](p), repeat, min_time)
+            result = BenchResult(name, p, best, mean, number, repeat)
+            out.append(result)
+            if progress is not None:
+                progress(result)
+    return out
+
+
+def write_results(path: Path, results: Sequence[BenchResult]) -> Path:
+    """Write results as JSON, with the environment the numbers were taken in."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = {
+        "version": BENCH_VERSION,
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": [{"key": r.key, **asdict(r)} for r in results],
+    }
+    path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    return path
+
+
+def load_results(path: Path) -> dict[str, float]:
+    """Best seconds per call by result key from a written results / baseline file.
+
+    Invariants: ValueError for files of another BENCH_VERSION.
+    """
+    doc = json.loads(Path(path).read_text(encoding="utf-8"))
+    if doc.get("version") != BENCH_VERSION:
+        raise ValueError(f"{path}: benchmark version {doc.get('version')}, expected {BENCH_VERSION}")
+    return {r["key"]: float(r["best_s"]) for r in doc["results"]}
+
+
+def compare(
+    results: Sequence[BenchResult], baseline: dict[str, float], threshold: float = DEFAULT_THRESHOLD
+) -> list[Comparison]:
+    """Compare best times against a baseline (load_results).
+
+    Outputs: one Comparison per result with a baseline entry, in result order.
+    Invariants: regressed iff best > baseline * (1 + threshold); results without a
+    baseline entry are left out.
+    """
+    out = []
+    for r in results:
+        base = baseline.get(r.key)
+        if base is None:
+            continue
+        ratio = r.best_s / base if base > 0 else float("inf")
+        out.append(Comparison(r.key, base, r.best_s, ratio, ratio > 1 + threshold))
+    return out
@@ -1,16 +1,31 @@
-"""CLI via Typer: generate, run, plot, all. PDF §1–6."""
+"""CLI via Typer: generate, run, plot, all, bench. PDF §1–6."""
 
 from __future__ import annotations
 
+import io
+import pstats
 from pathlib import Path
 
 import typer
 from rts_sim import __version__
 from rts_sim.config import load_config, resolve_config_path
-from rts_sim.experiments.runner import run_all
-from rts_sim.gen.dag import generate_dag_task_set
+from rts_sim.experiments.runner import PROFILE_DIR_NAME, PointsFailedError, run_all
+from rts_sim.gen.dag import generate_dag_task_set, generate_task_set_corpus
+from rts_sim.store.cache import cache_from_config
+from rts_sim.store.checkpoint import ConfigMismatchError
+from rts_sim.store.results import RESULTS_STORE_NAME, ResultsStore
+from rts_sim.store.tasksets import is_streaming_path
 from rts_sim.analysis.plots import plot_results
-from rts_sim.analysis.aggregate import aggregate_results
+from rts_sim.analysis.aggregate import GROUP_KEYS, aggregate_results
+from rts_sim.bench.suite import (
+    BENCHMARKS,
+    DEFAULT_THRESHOLD,
+    compare,
+    load_results,
+    param_grid,
+    run_benchmarks,
+    write_results,
+)
 from rts_sim.utils.logging import setup_logging
 
 app = typer.Typer(
@@ -27,19 +42,39 @@ def _get_config(config_path: str | None) -> "Config":
     return load_config(path)
 
 
+def _echo_profile(profile_dir: Path, top: int = 15) -> None:
+    """Merge the per-worker cProfile dumps and print the top functions by cumulative time."""
+    dumps = sorted(profile_dir.glob("worker-*.prof"))
+    if not dumps:
+        return
+    stream = io.StringIO()
+    pstats.Stats(*map(str, dumps), stream=stream).sort_stats("cumulative").print_stats(top)
+    typer.echo(stream.getvalue().strip())
+    typer.echo(f"Profiles ({len(dumps)} process(es)) -> {profile_dir}; inspect with python -m pstats")
+
+
 @app.command()
 def generate(
     config_path: str | None = typer.Option(None, "--config", "-c"),
     output: Path = typer.Option(Path("output/task_set.json"), "--output", "-o"),
     seed: int | None = typer.Option(None, "--seed", "-s"),
+    sets: int = typer.Option(1, "--sets", "-n", min=1, help="Task sets to generate (.rtsb/.jsonl only if > 1)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always regenerate; bypass the task-set cache"),
 ) -> None:
-    """Generate task set and DAGs (PDF §2). Writes task set to --output."""
+    """Generate task set and DAGs (PDF §2). Writes task set to --output (.json, .jsonl or .rtsb)."""
     cfg = _get_config(config_path)
     if seed is not None:
         cfg.seed = seed
     output = Path(output)
     output.parent.mkdir(parents=True, exist_ok=True)
-    ts = generate_dag_task_set(cfg, seed=cfg.seed, output_path=output)
+    if sets > 1:
+        if not is_streaming_path(output):
+            raise typer.BadParameter("--sets > 1 needs a .rtsb or .jsonl output", param_hint="--output")
+        n = generate_task_set_corpus(cfg, sets, output, seed=cfg.seed)
+        typer.echo(f"Generated {sets} task sets ({n} tasks) -> {output}")
+        return
+    cache = None if no_cache else cache_from_config(cfg)
+    ts = generate_dag_task_set(cfg, seed=cfg.seed, output_path=output, cache=cache)
     typer.echo(f"Generated {len(ts.tasks)} tasks -> {output}")
 
 
@@ -48,6 +83,12 @@ def run(
     config_path: str | None = typer.Option(None, "--config", "-c"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Validate config and create dirs only"),
     output_dir: Path | None = typer.Option(None, "--output-dir", "-o"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always regenerate; bypass the task-set cache"),
+    workers: int | None = typer.Option(
+        None, "--workers", "-j", min=0, help="Worker processes (1 = serial, 0 = all CPUs; default: config)"
+    ),
+    resume: bool = typer.Option(False, "--resume", help="Skip points already in results_dir/points.jsonl"),
+    profile: bool = typer.Option(False, "--profile", help="cProfile dump per worker in results_dir/profile"),
 ) -> None:
     """Run experiments (PDF §5–6). Use --dry-run to skip simulation."""
     cfg = _get_config(config_path)
@@ -57,8 +98,19 @@ def run(
         cfg.results_dir.mkdir(parents=True, exist_ok=True)
         typer.echo("Dry run: config validated, output dirs created.")
         return
-    points = run_all(cfg, dry_run=False, output_dir=out)
-    typer.echo(f"Ran {len(points)} experiment point(s).")
+    try:
+        store_path = run_all(
+            cfg, dry_run=False, output_dir=out, use_cache=not no_cache, workers=workers, resume=resume, profile=profile
+        )
+    except ConfigMismatchError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--resume") from None
+    except PointsFailedError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1) from None
+    if profile:
+        _echo_profile(cfg.results_dir / PROFILE_DIR_NAME)
+    with ResultsStore(store_path) as store:
+        typer.echo(f"{len(store)} experiment point(s) in {store_path}.")
 
 
 @app.command()
@@ -66,15 +118,20 @@ def plot(
     config_path: str | None = typer.Option(None, "--config", "-c"),
     results_dir: Path | None = typer.Option(None, "--results-dir"),
     output_dir: Path | None = typer.Option(None, "--output-dir", "-o"),
+    workers: int = typer.Option(1, "--workers", "-j", min=0, help="Render processes (0 = all CPUs)"),
+    force: bool = typer.Option(False, "--force", help="Render every figure, even if its summary is unchanged"),
 ) -> None:
-    """Generate plots from results (PDF §1–6). Placeholder: no plots yet."""
+    """Generate plots from results_dir/points.rcol (PDF §1–6); unchanged figures are skipped."""
     cfg = _get_config(config_path)
     res_dir = Path(results_dir) if results_dir else cfg.results_dir
     out_dir = Path(output_dir) if output_dir else cfg.plots_dir
-    out_dir.mkdir(parents=True, exist_ok=True)
-    # TODO: load experiment points from results_dir; call plot_results
-    plot_results([], out_dir)
-    typer.echo(f"Plots dir ready: {out_dir} (no plot files yet).")
+    store_path = res_dir / RESULTS_STORE_NAME
+    if not store_path.exists():
+        raise typer.BadParameter(f"no results store at {store_path}; run the sweep first", param_hint="--results-dir")
+    with ResultsStore(store_path) as store:
+        status = plot_results(store, out_dir, workers=workers, force=force)
+    counts = {s: list(status.values()).count(s) for s in dict.fromkeys(status.values())}
+    typer.echo(f"Plots -> {out_dir}: " + ", ".join(f"{n} {s}" for s, n in counts.items()))
 
 
 @app.command()
@@ -82,6 +139,12 @@ def all(
     config_path: str | None = typer.Option(None, "--config", "-c"),
     dry_run: bool = typer.Option(False, "--dry-run", help="Validate configs and create folders only"),
     output_dir: Path | None = typer.Option(None, "--output-dir", "-o"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always regenerate; bypass the task-set cache"),
+    workers: int | None = typer.Option(
+        None, "--workers", "-j", min=0, help="Worker processes (1 = serial, 0 = all CPUs; default: config)"
+    ),
+    resume: bool = typer.Option(False, "--resume", help="Skip points already in results_dir/points.jsonl"),
+    profile: bool = typer.Option(False, "--profile", help="cProfile dump per worker in results_dir/profile"),
 ) -> None:
     """Run full pipeline: generate -> run -> plot. Use --dry-run to validate only."""
     cfg = _get_config(config_path)
@@ -93,15 +156,75 @@ def all(
         typer.echo("Dry run: config validated, output/results/plots dirs created.")
         return
     # Generate
-    ts = generate_dag_task_set(cfg, output_path=out / "task_set.json")
+    cache = None if no_cache else cache_from_config(cfg, out)
+    ts = generate_dag_task_set(cfg, output_path=out / "task_set.json", cache=cache)
     # Run
-    points = run_all(cfg, dry_run=False, output_dir=out)
+    try:
+        store_path = run_all(
+            cfg, dry_run=False, output_dir=out, use_cache=not no_cache, workers=workers, resume=resume, profile=profile
+        )
+    except ConfigMismatchError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--resume") from None
+    except PointsFailedError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(1) from None
+    if profile:
+        _echo_profile(cfg.results_dir / PROFILE_DIR_NAME)
     # Aggregate + plot
-    aggregate_results(points, output_path=cfg.results_dir / "aggregate.csv")
-    plot_results(points, cfg.plots_dir)
+    with ResultsStore(store_path) as store:
+        aggregate_results(store, output_path=cfg.results_dir / "aggregate.csv", by=GROUP_KEYS)
+        plot_results(store, cfg.plots_dir, workers=workers if workers is not None else cfg.sweep.workers)
     typer.echo("Pipeline complete.")
 
 
+@app.command()
+def bench(
+    config_path: str | None = typer.Option(None, "--config", "-c"),
+    names: list[str] | None = typer.Option(None, "--bench", "-b", help="Benchmark to run (repeatable; default: all)"),
+    n_tasks: list[int] = typer.Option([10], "--n-tasks", help="Tasks per set (repeatable)"),
+    nodes: list[int] = typer.Option([20], "--nodes", help="Internal nodes per task (repeatable)"),
+    m: list[int] = typer.Option([8], "--m", "-m", help="Cores (repeatable)"),
+    accesses: list[int] = typer.Option([40], "--accesses", help="Total resource accesses (repeatable)"),
+    repeat: int = typer.Option(5, "--repeat", min=1, help="Timed samples per benchmark (best is kept)"),
+    min_time: float = typer.Option(0.05, "--min-time", min=0, help="Minimum seconds per sample"),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Results JSON (default: results_dir/bench.json)"),
+    baseline: Path = typer.Option(Path("benchmarks/baseline.json"), "--baseline", help="Stored baseline JSON"),
+    threshold: float = typer.Option(DEFAULT_THRESHOLD, "--threshold", min=0, help="Allowed relative slowdown"),
+    save_baseline: bool = typer.Option(False, "--save-baseline", help="Store these results as the new baseline"),
+) -> None:
+    """Time the pipeline stages (PDF §1–6) and compare against a stored baseline; exit 1 on regression."""
+    cfg = _get_config(config_path)
+    if names:
+        unknown = [n for n in names if n not in BENCHMARKS]
+        if unknown:
+            raise typer.BadParameter(f"unknown {unknown}; choose from {list(BENCHMARKS)}", param_hint="--bench")
+    params = param_grid(n_tasks, nodes, m, accesses)
+    results = run_benchmarks(
+        params,
+        names or None,
+        repeat=repeat,
+        min_time=min_time,
+        progress=lambda r: typer.echo(f"{r.key:<60} {r.best_s * 1e3:10.3f} ms  (x{r.number})"),
+    )
+    out = write_results(output if output is not None else cfg.results_dir / "bench.json", results)
+    typer.echo(f"Results -> {out}")
+    if save_baseline:
+        write_results(baseline, results)
+        typer.echo(f"Baseline -> {baseline}")
+        return
+    if not baseline.exists():
+        typer.echo(f"No baseline at {baseline}; store one with --save-baseline.")
+        return
+    comparisons = compare(results, load_results(baseline), threshold)
+    regressed = [c for c in comparisons if c.regressed]
+    for c in comparisons:
+        flag = "REGRESSION" if c.regressed else "ok"
+        typer.echo(f"{c.key:<60} {c.ratio:6.2f}x baseline  {flag}")
+    if regressed:
+        typer.echo(f"{len(regressed)} benchmark(s) slower than baseline by more than {threshold:.0%}.", err=True)
+        raise typer.Exit(1)
+
+
 @app.callback()
 def global_options(
     version: bool = typer.Option(False, "--version", "-V", help="Show version", is_eager=True),
@@ -7,7 +7,7 @@ Invariants: defaults match PDF (m in [2,64], U_norm in [0.1,1], etc.).
 """
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, Field, field_validator
@@ -16,7 +16,7 @@ from pydantic import BaseModel, Field, field_validator
 class GenConfig(BaseModel):
     """Task-set and DAG generation. PDF §2."""
 
-    n_tasks: int = Field(ge=1, description="Number of tasks")
+    n_tasks: int = Field(10, ge=1, description="Number of tasks")
     nodes_per_task_min: int = Field(20, ge=1)
     nodes_per_task_max: int = Field(50, ge=1)
     erdos_renyi_p: float = Field(0.1, ge=0, le=1, description="Erdős–Rényi edge probability")
@@ -50,6 +50,9 @@ class PartitionConfig(BaseModel):
 
     use_federated: bool = True
     use_grouping_by_resource: bool = True
+    placement: Literal["wfd", "ffd", "bfd", "nfd"] = Field(
+        "wfd", description="Light-task bin packing: worst/first/best/next fit decreasing"
+    )
 
 
 class SchedConfig(BaseModel):
@@ -58,6 +61,40 @@ class SchedConfig(BaseModel):
     use_ca_edf: bool = True
     fifo_lock_hi_lo: bool = True
     deadlock_drop_low: bool = True
+    overrun_prob: float = Field(0.1, ge=0, le=1, description="Probability a job overruns its normal budgets")
+    horizon: float | None = Field(None, gt=0, description="Simulated time; default 10 hyperperiods")
+    stop_at_first_miss: bool = Field(
+        False, description="End a simulation at its first deadline miss (verdict only; response metrics truncated)"
+    )
+    analytic_fast_path: bool = Field(True, description="Decide points by analytical bounds when conclusive")
+
+
+class SweepConfig(BaseModel):
+    """Experiment sweep grid and executor. PDF §1, §5–6.
+
+    Unset value lists fall back to the single default point (gen.n_tasks, system.m_max,
+    mid U_norm, resources.n_resources_max, first total_access_options entry).
+    """
+
+    n_tasks_values: list[int] | None = None
+    m_values: list[int] | None = None
+    U_norm_values: list[float] | None = None
+    n_resources_values: list[int] | None = None
+    total_access_values: list[int] | None = None
+    n_seeds: int = Field(1, ge=1, description="Seeds per grid cell: config.seed, config.seed+1, ...")
+    workers: int = Field(1, ge=0, description="Worker processes; 1 = serial, 0 = all CPUs")
+    chunk_size: int = Field(0, ge=0, description="Points per dispatched chunk; 0 = auto")
+    stage_timers: bool = Field(
+        False, description="Record per-stage wall times (time_<stage>) in metrics; they vary between runs"
+    )
+
+
+class CacheConfig(BaseModel):
+    """On-disk cache of generated task sets (keyed by gen/system/resources + seed)."""
+
+    enabled: bool = True
+    max_mb: float = Field(512.0, gt=0, description="LRU size budget in MiB")
+    directory: Path | None = Field(None, description="Default: <output_dir>/cache")
 
 
 class Config(BaseModel):
@@ -68,6 +105,8 @@ class Config(BaseModel):
     resources: ResourcesConfig = Field(default_factory=ResourcesConfig)
     partition: PartitionConfig = Field(default_factory=PartitionConfig)
     sched: SchedConfig = Field(default_factory=SchedConfig)
+    sweep: SweepConfig = Field(default_factory=SweepConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
     seed: int = 0
     output_dir: Path = Field(default=Path("output"))
     results_dir: Path = Field(default=Path("results"))
@@ -1,6 +1,15 @@
 """Experiment runner, metrics, reproducibility. PDF §1–6."""
 
-from rts_sim.experiments.runner import run_experiment, run_all
-from rts_sim.experiments.metrics import compute_metrics
+from rts_sim.experiments.runner import PointsFailedError, run_all, run_experiment, run_points, sweep_points
+from rts_sim.experiments.metrics import StageTimer, compute_metrics, stage_summary
 
-__all__ = ["run_experiment", "run_all", "compute_metrics"]
+__all__ = [
+    "run_experiment",
+    "run_all",
+    "run_points",
+    "sweep_points",
+    "PointsFailedError",
+    "compute_metrics",
+    "StageTimer",
+    "stage_summary",
+]
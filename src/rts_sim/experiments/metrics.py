@@ -1,8 +1,101 @@
-"""Metrics for experiments. PDF §5–6."""
+"""Metrics for experiments. PDF §5–6.
+
+Besides the schedulability metrics, every point records where its time went: a
+StageTimer takes one perf_counter reading per stage boundary of run_experiment and the
+stage wall times land in SimulationResult.metrics as `time_<stage>` (seconds), next to
+work counters (DAG nodes and edges generated, segments; events and lock waits come from
+the simulator). stage_summary rolls both up over a sweep, reading only those columns
+when given the columnar results store.
+"""
 
 from __future__ import annotations
 
-from rts_sim.models import SimulationResult, TaskSet
+import time
+from typing import Iterable
+
+import numpy as np
+
+from rts_sim.models import ExperimentPoint, SimulationResult, TaskSet
+from rts_sim.store.results import METRIC_PREFIX, ResultsStore
+
+# run_experiment stages, in pipeline order.
+STAGES = ("generate", "resources", "partition", "bounds", "grouping", "schedule")
+TIME_PREFIX = "time_"
+# Work counters rolled up by stage_summary (absent when the stage did not run).
+STAGE_COUNTERS = ("dag_nodes", "dag_edges", "segments", "events", "lock_requests", "lock_waits")
+
+
+class StageTimer:
+    """Wall time per pipeline stage, one perf_counter call per boundary.
+
+    Invariants: lap(stage) charges the time since the previous lap (or construction) to
+    `stage`; repeated stages accumulate; disabled timers record nothing.
+    """
+
+    __slots__ = ("enabled", "times", "_last")
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.times: dict[str, float] = {}
+        self._last = time.perf_counter() if enabled else 0.0
+
+    def lap(self, stage: str) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.times[stage] = self.times.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def metrics(self) -> dict[str, float]:
+        """`time_<stage>` per recorded stage and `time_total`; {} when disabled."""
+        if not self.enabled:
+            return {}
+        out = {TIME_PREFIX + s: t for s, t in self.times.items()}
+        out[TIME_PREFIX + "total"] = sum(self.times.values())
+        return out
+
+
+def stage_summary(points: Iterable[ExperimentPoint] | ResultsStore) -> dict[str, dict[str, float]]:
+    """Roll stage times and work counters up over a sweep. PDF §1–6.
+
+    Inputs: experiment points (consumed once; points without a result are skipped) or a
+    ResultsStore (only the stage columns are read, chunk by chunk).
+    Outputs: `time_<stage>` / counter name -> {"n", "total", "mean", "max"}; time
+    entries also carry "share" (fraction of the summed time_total).
+    Invariants: only metrics some point reports appear; O(stages) memory.
+    """
+    names = [TIME_PREFIX + s for s in (*STAGES, "total")] + list(STAGE_COUNTERS)
+    acc = {name: [0, 0.0, 0.0] for name in names}  # n, total, max
+    if isinstance(points, ResultsStore):
+        names = [name for name in names if METRIC_PREFIX + name in points.columns]
+        for cols in points.iter_chunks(["has_result", *(METRIC_PREFIX + name for name in names)]):
+            for name in names:
+                x = cols[METRIC_PREFIX + name][cols["has_result"]]
+                x = x[~np.isnan(x)]  # points without the metric
+                if x.size:
+                    a = acc[name]
+                    a[0] += x.size
+                    a[1] += float(x.sum())
+                    a[2] = max(a[2], float(x.max()))
+    else:
+        for p in points:
+            if p.result is None:
+                continue
+            values = p.result.metrics
+            for name in names:
+                x = values.get(name)
+                if x is None:
+                    continue
+                a = acc[name]
+                a[0] += 1
+                a[1] += x
+                a[2] = max(a[2], x)
+    out = {name: {"n": float(n), "total": tot, "mean": tot / n, "max": mx} for name, (n, tot, mx) in acc.items() if n}
+    total = out.get(TIME_PREFIX + "total", {}).get("total", 0.0)
+    for name, row in out.items():
+        if name.startswith(TIME_PREFIX):
+            row["share"] = row["total"] / total if total > 0 else 0.0
+    return out
 
 
 def compute_metrics(
@@ -2,63 +2,521 @@
 
 from __future__ import annotations
 
+import cProfile
+import itertools
+import json
+import logging
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+import numpy as np
+
 from rts_sim.config import Config
+from rts_sim.experiments.metrics import TIME_PREFIX, StageTimer, stage_summary
+from rts_sim.gen.dag import GENERATOR_VERSION, cached_packed_task_set, max_U_sum
 from rts_sim.models import ExperimentPoint, SimulationResult, TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.partition.federated import federated_allocation_batch, light_task_placement_packed
+from rts_sim.resources.access import AccessMatrix
+from rts_sim.resources.requests import distribute_accesses_packed, generate_resource_requests
+from rts_sim.resources.segments import assign_segments_packed
+from rts_sim.partition.grouping import GroupAllocation, group_by_resource
+from rts_sim.sched.bounds import TIER_SIMULATION, analytic_verdict, mandatory_work
+from rts_sim.sched.ca_edf import ca_edf_schedule
+from rts_sim.sched.simulator import simulate
+from rts_sim.store.cache import TaskSetCache, cache_from_config
+from rts_sim.store.checkpoint import RESULTS_LOG_NAME, ResultsLog, config_hash, iter_results
+from rts_sim.store.results import RESULTS_STORE_NAME, ResultsStore, ResultsStoreWriter
+from rts_sim.utils.seeds import RngStreams
+from rts_sim.utils.workers import resolve_workers
+
+logger = logging.getLogger(__name__)
+
+STAGE_SUMMARY_NAME = "stages.json"
+PROFILE_DIR_NAME = "profile"
+
+
+class PointsFailedError(RuntimeError):
+    """Some sweep points raised; every other point was still run, logged and stored."""
+
+    def __init__(self, failures: dict[str, str]) -> None:
+        self.failures = failures  # point key -> formatted traceback
+        first = next(iter(failures.values()))
+        super().__init__(
+            f"{len(failures)} point(s) failed: {', '.join(failures)}; finished points are logged "
+            f"(rerun with --resume for the rest). First failure:\n{first}"
+        )
+
+
+# Per-worker state, set once by _init_worker so chunks only carry points.
+_worker_config: Config | None = None
+_worker_cache: TaskSetCache | None = None
+_worker_store: ResultsStoreWriter | None = None
+_worker_profile: tuple[cProfile.Profile, Path] | None = None
 
 
 def run_experiment(
     config: Config,
     point: ExperimentPoint,
     dry_run: bool = False,
+    cache: TaskSetCache | None = None,
 ) -> ExperimentPoint:
     """Run one experiment point. PDF §1–6.
 
-    Inputs: config, experiment point (n_tasks, m, U_norm, ...), dry_run.
+    Inputs: config, experiment point (n_tasks, m, U_norm, ...), dry_run, optional
+    task-set cache.
     Outputs: ExperimentPoint with result filled (or unchanged if dry_run).
-    Invariants: seed set for reproducibility; no side effects if dry_run.
+    Invariants: seed set for reproducibility; no side effects if dry_run; the task set
+    (U_sum = m * U_norm) comes from the cache when it was generated before.
+    Pipeline: generation -> resource accesses and segments -> federated allocation ->
+    placement of light tasks (config.partition.placement) -> analytical tiers (sched.bounds) -> CA-EDF simulation
+    only when the tiers are inconclusive (or config.sched.analytic_fast_path is off).
+    With config.partition.use_grouping_by_resource the grouping-by-resource partition
+    (PDF §6) is recorded in group_allocation and its own verdict in
+    metrics["group_feasible"] (grouping_feasible); one AccessMatrix serves grouping,
+    bounds and simulator.
+    metrics["decision_tier"] records the deciding tier (sched.bounds.DECISION_TIERS).
+    Work counters (dag_nodes, dag_edges, segments) are always recorded; with
+    config.sweep.stage_timers the wall time of every stage (metrics.STAGES) is recorded
+    as time_<stage>, which is the only part of the result that varies between runs.
+    ValueError (check_point) if the point's task set cannot be generated.
     """
     if dry_run:
         return point
-    # TODO: generate task set, resources, partition, schedule; compute metrics; fill point.result
+    check_point(config, point)
+    timer = StageTimer(config.sweep.stage_timers)
+    key, packed = cached_packed_task_set(
+        config, cache, seed=point.seed, n_tasks=point.n_tasks, U_sum=point.m * point.U_norm
+    )
+    timer.lap("generate")
+    streams = RngStreams(point.seed).child("point")
+    packed = with_resources(config, packed, point, streams)
+    access = AccessMatrix.from_packed(packed)  # shared by grouping, bounds and simulator
+    timer.lap("resources")
+    fed = federated_allocation_batch(
+        packed.C_overflow, packed.L_overflow, packed.D, [0, packed.n_tasks], point.m, U=packed.U_overflow
+    )
+    core_allocation = dict(zip(packed.task_ids, fed.m_i.tolist()))
+    partition = light_task_placement_packed(
+        packed.U_overflow, fed.heavy, fed.m_i, packed.task_ids, point.m, config.partition.placement
+    )
+    timer.lap("partition")
+    sched = config.sched
+    lo_droppable = sched.overrun_prob > 0  # non-nested locks never deadlock, so only overruns drop LO nodes
+    verdict = analytic_verdict(
+        packed, point.m, core_allocation, partition, lo_droppable, access, hi_first=sched.fifo_lock_hi_lo
+    )
+    timer.lap("bounds")
+    metrics = {
+        "U_sum": packed.U_sum,
+        "dag_nodes": float(packed.n_nodes),
+        "dag_edges": float(packed.n_edges),
+        "segments": float(packed.seg_kind.size),
+        **verdict.metrics(),
+    }
+    group_allocation: dict[str, object] = {}
+    if config.partition.use_grouping_by_resource:
+        groups = group_by_resource(access, packed.U_overflow, point.m)
+        group_allocation = {
+            access.resource_ids[g]: {
+                "tasks": [packed.task_ids[i] for i in np.flatnonzero(groups.group_of == g)],
+                "cores": groups.group_cores[g],
+            }
+            for g in groups.order
+        }
+        metrics["groups"] = float(len(groups.order))
+        metrics["group_cores_shared"] = 1.0 if groups.shared else 0.0
+        group_ok = grouping_feasible(config, packed, groups, access, lo_droppable, streams.rng("grouping"))
+        metrics["group_feasible"] = 1.0 if group_ok else 0.0
+        timer.lap("grouping")
+    feasible = verdict.feasible
+    if not sched.analytic_fast_path and verdict.fits:
+        feasible = None
+    if feasible is None:
+        sim = ca_edf_schedule(
+            packed,
+            core_allocation,
+            partition,
+            horizon=sched.horizon,
+            overrun_prob=sched.overrun_prob,
+            seed=streams.rng("sched"),
+            stop_at_first_miss=sched.stop_at_first_miss,
+            lock_hi_first=sched.fifo_lock_hi_lo,
+            deadlock_drop=sched.deadlock_drop_low,
+            access=access,
+        )
+        feasible = sim.feasible
+        metrics.update(sim.metrics)
+        metrics["decision_tier"] = float(TIER_SIMULATION)
+        timer.lap("schedule")
+    metrics.update(timer.metrics())
     point.result = SimulationResult(
-        task_set_id="",
-        feasible=True,
-        core_allocation={},
-        group_allocation={},
-        metrics={},
+        task_set_id=key[:16],
+        feasible=feasible,
+        core_allocation=core_allocation,
+        group_allocation=group_allocation,
+        metrics=metrics,
     )
     return point
 
 
+def check_point(config: Config, point: ExperimentPoint) -> None:
+    """Reject a point whose task set cannot be generated. PDF §1–2.
+
+    Inputs: config (gen), experiment point.
+    Outputs: None; ValueError naming the point if U_sum = m * U_norm exceeds what its
+    n_tasks tasks can carry (gen.dag.max_U_sum).
+    """
+    U_sum = point.m * point.U_norm
+    cap = max_U_sum(config, point.n_tasks)
+    if U_sum > cap + 1e-9:
+        raise ValueError(
+            f"point {point.key}: U_sum = m * U_norm = {U_sum:g} exceeds {cap:g}, the most "
+            f"{point.n_tasks} tasks can carry; use more tasks or a lower U_norm"
+        )
+
+
+def grouping_feasible(
+    config: Config,
+    packed: PackedTaskSet,
+    groups: GroupAllocation,
+    access: AccessMatrix,
+    lo_droppable: bool,
+    rng: np.random.Generator,
+) -> bool:
+    """Schedulability of the grouping-by-resource partition. PDF §6.
+
+    Inputs: config (sched options), packed set, its GroupAllocation and access matrix,
+    whether LO nodes can be dropped, the rng of the simulation.
+    Outputs: True iff no deadline is missed on the partition's clusters.
+    Invariants: a cluster whose mandatory utilization exceeds its cores, or a mandatory
+    critical path longer than its deadline, fails without simulation; otherwise the
+    engine runs on GroupAllocation.clusters() up to its first miss (verdict only), with
+    the same sched options as the federated run.
+    """
+    task_cluster, cluster_cores = groups.clusters()
+    C, L = mandatory_work(packed, lo_droppable)
+    if (L > packed.D + 1e-9).any():
+        return False
+    load = np.bincount(task_cluster, weights=C / packed.T, minlength=cluster_cores.size)
+    if (load > cluster_cores + 1e-9).any():
+        return False
+    sched = config.sched
+    stats = simulate(
+        packed,
+        task_cluster,
+        cluster_cores,
+        horizon=sched.horizon,
+        overrun_prob=sched.overrun_prob,
+        seed=rng,
+        stop_at_first_miss=True,
+        lock_hi_first=sched.fifo_lock_hi_lo,
+        deadlock_drop=sched.deadlock_drop_low,
+        access=access,
+    )
+    return stats.feasible
+
+
+def with_resources(
+    config: Config,
+    packed: PackedTaskSet,
+    point: ExperimentPoint,
+    streams: RngStreams,
+) -> PackedTaskSet:
+    """Add the point's shared resources and critical segments to a generated task set. PDF §3–4.
+
+    Inputs: config (CSP range), packed task set, point (n_resources, total accesses),
+    RNG streams of the point.
+    Outputs: PackedTaskSet with segments; every node gets a CSP fraction drawn uniformly
+    from [csp_min, csp_max].
+    """
+    r = config.resources
+    requests = generate_resource_requests(
+        TaskSet(tasks=[]), point.n_resources, point.total_resource_accesses, r.csp_min, r.csp_max
+    )
+    offsets, resource = distribute_accesses_packed(packed, requests, seed=streams.rng("accesses"))
+    csp = streams.rng("csp").uniform(r.csp_min, r.csp_max, size=packed.n_nodes)
+    return assign_segments_packed(
+        packed, offsets, resource, tuple(q.resource_id for q in requests), csp, seed=streams.rng("segments")
+    )
+
+
+def sweep_points(config: Config) -> list[ExperimentPoint]:
+    """Cartesian sweep grid from config.sweep. PDF §1.
+
+    Inputs: config (sweep value lists; unset lists use the default point).
+    Outputs: points in a fixed order (n_tasks, m, U_norm, n_resources, total accesses,
+    seed; last varies fastest).
+    Invariants: seeds are config.seed + s for s < n_seeds.
+    """
+    sw = config.sweep
+    U_mid = (config.system.U_norm_min + config.system.U_norm_max) / 2
+    grid = itertools.product(
+        sw.n_tasks_values or [config.gen.n_tasks],
+        sw.m_values or [config.system.m_max],
+        sw.U_norm_values or [U_mid],
+        sw.n_resources_values or [config.resources.n_resources_max],
+        sw.total_access_values or [config.resources.total_access_options[0]],
+        range(sw.n_seeds),
+    )
+    return [
+        ExperimentPoint(
+            n_tasks=n,
+            m=m,
+            U_norm=u,
+            n_resources=r,
+            total_resource_accesses=a,
+            seed=config.seed + s,
+        )
+        for n, m, u, r, a, s in grid
+    ]
+
+
+def profile_path(profile_dir: Path) -> Path:
+    """cProfile dump of this process: <profile_dir>/worker-<pid>.prof."""
+    return Path(profile_dir) / f"worker-{os.getpid()}.prof"
+
+
+def _init_worker(
+    config: Config,
+    cache_root: Path | None,
+    cache_bytes: int,
+    store_path: Path | None = None,
+    profile_dir: Path | None = None,
+) -> None:
+    global _worker_config, _worker_cache, _worker_store, _worker_profile
+    _worker_config = config
+    _worker_cache = TaskSetCache(cache_root, cache_bytes) if cache_root is not None else None
+    _worker_store = ResultsStoreWriter(store_path, append=True) if store_path is not None else None
+    _worker_profile = (cProfile.Profile(), profile_path(profile_dir)) if profile_dir is not None else None
+
+
+def _run_point(config: Config, point: ExperimentPoint, cache: TaskSetCache | None) -> str | None:
+    """Run one point; the formatted traceback if it raised (point.result stays None)."""
+    try:
+        run_experiment(config, point, cache=cache)
+    except Exception:
+        point.result = None
+        return traceback.format_exc()
+    return None
+
+
+def _run_chunk(points: list[ExperimentPoint]) -> tuple[list[SimulationResult | None], dict[str, str]]:
+    """Worker side: run a chunk, append its finished points to the results store, return
+    only the results (points stay with the parent) and the tracebacks of failed points by
+    key. When profiling, the worker's cumulative profile is dumped after every chunk (pool
+    workers have no exit hook)."""
+    assert _worker_config is not None
+    if _worker_profile is not None:
+        _worker_profile[0].enable()
+    failures = {}
+    for p in points:
+        error = _run_point(_worker_config, p, _worker_cache)
+        if error is not None:
+            failures[p.key] = error
+    if _worker_profile is not None:
+        _worker_profile[0].disable()
+        _worker_profile[0].dump_stats(_worker_profile[1])
+    if _worker_store is not None:
+        _worker_store.extend(p for p in points if p.result is not None)
+        _worker_store.flush()
+    return [p.result for p in points], failures
+
+
+def _chunks(points: list[ExperimentPoint], size: int) -> list[list[ExperimentPoint]]:
+    return [points[i : i + size] for i in range(0, len(points), size)]
+
+
+def run_points(
+    config: Config,
+    points: list[ExperimentPoint],
+    cache: TaskSetCache | None = None,
+    workers: int = 1,
+    chunk_size: int = 0,
+    log: ResultsLog | None = None,
+    store_path: Path | None = None,
+    profile_dir: Path | None = None,
+    keep_results: bool = True,
+) -> list[ExperimentPoint]:
+    """Run points serially (workers == 1) or on a process pool. PDF §1–6.
+
+    Inputs: config, points, optional cache, worker count (0 = all CPUs), points per
+    dispatched chunk (0 = about four chunks per worker), optional results log, optional
+    columnar results store (an existing store is appended to), optional directory for
+    one cProfile dump per process running points (profile_path; read with pstats),
+    keep_results (False: a result is dropped once it is logged and stored, so memory
+    does not grow with the sweep).
+    Outputs: the same points, in the same order, with results filled (keep_results).
+    Invariants: every point draws only from its own seed, so pool results equal serial
+    results exactly, except the time_<stage> wall times recorded when
+    config.sweep.stage_timers is on; workers get config and cache location once (pool initializer) and
+    return results only. Each point (serial) or chunk (pool) is appended to the log as
+    soon as it finishes, in completion order; pool workers append their chunks to the
+    store themselves. A point that raises is left without result, out of log and store;
+    the other points still run, and PointsFailedError (tracebacks by key) is raised at
+    the end.
+    """
+    workers = min(resolve_workers(workers), max(len(points), 1))
+    if profile_dir is not None:
+        Path(profile_dir).mkdir(parents=True, exist_ok=True)
+    if workers <= 1:
+        failures: dict[str, str] = {}
+        store = ResultsStoreWriter(store_path, append=True) if store_path is not None else None
+        profiler = cProfile.Profile() if profile_dir is not None else None
+        try:
+            for p in points:
+                if profiler is not None:
+                    profiler.enable()
+                error = _run_point(config, p, cache)
+                if profiler is not None:
+                    profiler.disable()
+                if error is not None:
+                    failures[p.key] = error
+                    continue
+                if log is not None:
+                    log.append(p)
+                if store is not None:
+                    # The writer buffers up to a chunk; it keeps a copy so p can let go.
+                    store.append(p if keep_results else p.model_copy())
+                if not keep_results:
+                    p.result = None
+        finally:
+            if store is not None:
+                store.close()
+            if profiler is not None:
+                profiler.dump_stats(profile_path(profile_dir))
+        if failures:
+            raise PointsFailedError(failures)
+        return points
+    size = chunk_size or max(1, -(-len(points) // (4 * workers)))
+    if cache is not None:
+        init = (config, cache.root, cache.max_bytes, store_path, profile_dir)
+    else:
+        init = (config, None, 0, store_path, profile_dir)
+    logger.info("sweep: %d points, %d workers, chunks of %d", len(points), workers, size)
+    failures = {}
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init) as pool:
+        futures = {pool.submit(_run_chunk, chunk): chunk for chunk in _chunks(points, size)}
+        for fut in as_completed(futures):
+            chunk = futures[fut]
+            results, chunk_failures = fut.result()
+            for p, r in zip(chunk, results):
+                p.result = r
+            failures.update(chunk_failures)
+            if log is not None:
+                log.extend(p for p in chunk if p.result is not None)
+            if not keep_results:
+                for p in chunk:
+                    p.result = None
+    if cache is not None:
+        # Workers each bound only their own writes; apply the budget to the union.
+        cache.refresh()
+        cache.evict()
+    if failures:
+        raise PointsFailedError(failures)
+    return points
+
+
+def _sync_store(path: Path, log: ResultsLog, resume: bool) -> None:
+    """Make the columnar store hold exactly the logged points before new ones are added.
+
+    The log decides what is done: a store missing logged points gets them appended; a
+    store with points the log lost (they are about to run again) is rewritten from the log.
+    Logged points are streamed from the file (iter_results), never held all at once.
+    """
+    stored: list[str] = []
+    if resume and path.exists():
+        try:
+            with ResultsStore(path) as have:
+                stored = have.keys()
+        except ValueError:
+            stored = [""]  # unreadable: rewrite
+    keep = resume and len(set(stored)) == len(stored) and set(stored) <= log.done
+    if keep and path.exists() and len(stored) == len(log.done):
+        return
+    with ResultsStoreWriter(path, append=keep) as store:
+        have_keys = set(stored) if keep else set()
+        if log.done - have_keys:
+            store.extend(p for p in iter_results(log.path) if p.key not in have_keys)
+
+
 def run_all(
     config: Config,
     dry_run: bool = False,
     output_dir: Path | None = None,
-) -> list[ExperimentPoint]:
+    use_cache: bool = True,
+    workers: int | None = None,
+    resume: bool = False,
+    profile: bool = False,
+) -> Path:
     """Run full experiment sweep. PDF §1–6.
 
-    Inputs: config, dry_run, optional output_dir.
-    Outputs: list of ExperimentPoint with results (or empty/placeholders if dry_run).
-    Invariants: validates config; creates output dirs when not dry_run.
+    Inputs: config, dry_run, optional output_dir, use_cache (task-set cache under
+    output_dir unless config.cache disables it), workers (default config.sweep.workers),
+    resume (reuse points already in the results log), profile (one cProfile dump per
+    process in results_dir/profile, replacing the dumps of an earlier run).
+    Outputs: path of the columnar results store results_dir/points.rcol (store.results;
+    not written if dry_run), which holds every finished point.
+    Invariants: validates config; creates output dirs when not dry_run; every finished
+    point is in results_dir/points.jsonl, so a resumed run only executes missing points;
+    resuming a log written under another config (checkpoint.config_hash) raises
+    ConfigMismatchError; a grid point whose task set cannot be generated raises
+    ValueError (check_point) before any point runs. A resumed run first brings the
+    store in line with the log.
+    Results are streamed: each one is dropped from memory once it is logged and stored,
+    and the log keeps only keys, so memory does not grow with the sweep. Stage times and
+    work counters of the stored points (metrics.stage_summary) are logged and written to
+    results_dir/stages.json.
     """
     out = Path(output_dir or config.output_dir)
-    if not dry_run:
-        out.mkdir(parents=True, exist_ok=True)
-        config.results_dir.mkdir(parents=True, exist_ok=True)
-    # TODO: sweep over n_tasks, m, U_norm, n_resources, total_accesses; run_experiment each
-    points: list[ExperimentPoint] = []
-    points.append(
-        ExperimentPoint(
-            n_tasks=config.gen.n_tasks,
-            m=config.system.m_max,
-            U_norm=(config.system.U_norm_min + config.system.U_norm_max) / 2,
-            n_resources=config.resources.n_resources_max,
-            total_resource_accesses=config.resources.total_access_options[0],
-            seed=config.seed,
-        )
-    )
+    store_path = config.results_dir / RESULTS_STORE_NAME
+    points = sweep_points(config)
+    if dry_run:
+        return store_path
+    out.mkdir(parents=True, exist_ok=True)
+    config.results_dir.mkdir(parents=True, exist_ok=True)
+    cache = cache_from_config(config, out) if use_cache else None
+    profile_dir = config.results_dir / PROFILE_DIR_NAME if profile else None
+    if profile_dir is not None and profile_dir.is_dir():
+        for old in profile_dir.glob("worker-*.prof"):
+            old.unlink()
+    log_path = config.results_dir / RESULTS_LOG_NAME
     for p in points:
-        run_experiment(config, p, dry_run=dry_run)
-    return points
+        check_point(config, p)  # fail before any work, not mid-sweep
+    with ResultsLog(log_path, resume=resume, config_hash=config_hash(config, GENERATOR_VERSION)) as log:
+        pending = [p for p in points if p not in log]
+        _sync_store(store_path, log, resume)
+        if resume:
+            logger.info("resume: %d of %d points already done", len(points) - len(pending), len(points))
+        run_points(
+            config,
+            pending,
+            cache=cache,
+            workers=config.sweep.workers if workers is None else workers,
+            chunk_size=config.sweep.chunk_size,
+            log=log,
+            store_path=store_path,
+            profile_dir=profile_dir,
+            keep_results=False,
+        )
+    with ResultsStore(store_path) as store:
+        summary = stage_summary(store)
+    (config.results_dir / STAGE_SUMMARY_NAME).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    _log_stage_summary(summary)
+    return store_path
+
+
+def _log_stage_summary(summary: dict[str, dict[str, float]]) -> None:
+    stages = [
+        (name, row) for name, row in summary.items() if name.startswith(TIME_PREFIX) and name != TIME_PREFIX + "total"
+    ]
+    if stages:
+        logger.info(
+            "stages: %s",
+            ", ".join(f"{n[len(TIME_PREFIX):]} {r['total']:.2f} s ({r['share']:.0%})" for n, r in stages),
+        )
+    counters = [f"{name} {row['total']:.0f}" for name, row in summary.items() if not name.startswith(TIME_PREFIX)]
+    if counters:
+        logger.info("counters: %s", ", ".join(counters))
@@ -1,12 +1,33 @@
 """Task-set and DAG generation. PDF §2."""
 
-from rts_sim.gen.dag import generate_dag_task_set
-from rts_sim.gen.erdos_renyi import erdos_renyi_dag_with_source_sink
-from rts_sim.gen.utilization import uunifast_discard, rand_fixed_sum
+from rts_sim.gen.critical_path import CriticalPaths, critical_path_length, critical_paths
+from rts_sim.gen.dag import generate_dag_task_set, generate_packed_task_sets, max_U_sum
+from rts_sim.gen.erdos_renyi import (
+    DAGBatch,
+    erdos_renyi_dag_batch,
+    erdos_renyi_dag_with_source_sink,
+)
+from rts_sim.gen.utilization import (
+    UUniFastStats,
+    rand_fixed_sum,
+    rand_fixed_sum_batch,
+    uunifast_discard,
+    uunifast_discard_batch,
+)
 
 __all__ = [
     "generate_dag_task_set",
+    "generate_packed_task_sets",
+    "max_U_sum",
     "erdos_renyi_dag_with_source_sink",
+    "erdos_renyi_dag_batch",
+    "DAGBatch",
     "uunifast_discard",
+    "uunifast_discard_batch",
+    "UUniFastStats",
     "rand_fixed_sum",
+    "rand_fixed_sum_batch",
+    "critical_path_length",
+    "critical_paths",
+    "CriticalPaths",
 ]
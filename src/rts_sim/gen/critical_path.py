@@ -1,8 +1,146 @@
-"""Critical path computation for DAG tasks. PDF §2."""
+"""Critical path computation for DAG tasks. PDF §2.
+
+`critical_paths` is the batched engine: it computes topological levels of a whole
+DAGBatch once, then sweeps the levels with vectorized max-plus updates to get C_i and
+L_i in normal and overflow mode together with per-node earliest start / latest finish
+times. `critical_path_length` is the per-DAG convenience wrapper over pydantic objects.
+"""
 
 from __future__ import annotations
 
-from rts_sim.models import DAGTask, Edge, Node
+from dataclasses import dataclass
+
+import numpy as np
+
+from rts_sim.models import Edge, Node
+from rts_sim.packed import DAGBatch, PackedTaskSet
+
+MODE_NORMAL = 0
+MODE_OVERFLOW = 1
+
+
+@dataclass(frozen=True)
+class CriticalPaths:
+    """Per-DAG C_i/L_i and per-node timing windows for a batch. PDF §2, §5.
+
+    Invariants: arrays indexed by mode (MODE_NORMAL, MODE_OVERFLOW) on axis 0;
+    per-node arrays use the batch's global node order. latest_finish is relative to the
+    DAG's deadline (or to its L_i in that mode when no deadline is given).
+    """
+
+    C: np.ndarray  # (2, n_dags) sum of node WCETs
+    L: np.ndarray  # (2, n_dags) longest path length
+    level: np.ndarray  # (n_nodes,) topological level (longest hop count from a root)
+    earliest_start: np.ndarray  # (2, n_nodes)
+    latest_finish: np.ndarray  # (2, n_nodes)
+
+    @property
+    def C_normal(self) -> np.ndarray:
+        return self.C[MODE_NORMAL]
+
+    @property
+    def C_overflow(self) -> np.ndarray:
+        return self.C[MODE_OVERFLOW]
+
+    @property
+    def L_normal(self) -> np.ndarray:
+        return self.L[MODE_NORMAL]
+
+    @property
+    def L_overflow(self) -> np.ndarray:
+        return self.L[MODE_OVERFLOW]
+
+
+def topological_levels(batch: DAGBatch) -> np.ndarray:
+    """Level of every node: longest hop distance from a root (vectorized Kahn). PDF §2.
+
+    Inputs: DAGBatch (edges need not be sorted).
+    Outputs: int32 array (n_nodes,).
+    Invariants: level[dst] > level[src] for every edge; ValueError if a DAG has a cycle.
+    """
+    n = int(batch.node_offsets[-1])
+    gsrc, gdst = batch.global_edges()
+    order = np.argsort(gsrc, kind="stable")
+    succ = gdst[order]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(gsrc, minlength=n), out=indptr[1:])
+    indeg = np.bincount(gdst, minlength=n)
+    level = np.full(n, -1, dtype=np.int32)
+    frontier = np.flatnonzero(indeg == 0)
+    depth = 0
+    while frontier.size:
+        level[frontier] = depth
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        first = np.cumsum(counts) - counts
+        edges = np.repeat(starts - first, counts) + np.arange(int(counts.sum()))
+        targets = succ[edges]
+        indeg -= np.bincount(targets, minlength=n)
+        frontier = np.unique(targets[indeg[targets] == 0])
+        depth += 1
+    if (level < 0).any():
+        bad = np.searchsorted(batch.node_offsets, np.flatnonzero(level < 0)[0], side="right") - 1
+        raise ValueError(f"DAG {bad} contains a cycle")
+    return level
+
+
+def critical_paths(
+    batch: DAGBatch,
+    c_normal: np.ndarray,
+    c_overflow: np.ndarray,
+    deadline: np.ndarray | None = None,
+) -> CriticalPaths:
+    """C_i, L_i (both modes) and per-node windows for every DAG in one pass. PDF §2.
+
+    Inputs: batch adjacency, per-node WCETs in normal and overflow mode (global node
+    order), optional per-DAG deadline D_i for latest_finish.
+    Outputs: CriticalPaths.
+    Invariants: L_i = max over paths of summed node WCETs; earliest_start + w <= L_i;
+    source/sink with zero WCET do not change L_i.
+    """
+    n = int(batch.node_offsets[-1])
+    w = np.vstack([np.asarray(c_normal, dtype=np.float64), np.asarray(c_overflow, dtype=np.float64)])
+    if w.shape[1] != n:
+        raise ValueError(f"expected {n} node WCETs, got {w.shape[1]}")
+    level = topological_levels(batch)
+    gsrc, gdst = batch.global_edges()
+    by_level = np.argsort(level[gsrc], kind="stable")
+    gsrc, gdst = gsrc[by_level], gdst[by_level]
+    bounds = np.searchsorted(level[gsrc], np.arange(int(level.max(initial=-1)) + 2))
+
+    # Forward sweep: a node's start is final once every lower level has pushed into it.
+    est = np.zeros_like(w)
+    for lv in range(bounds.size - 1):
+        s, d = gsrc[bounds[lv] : bounds[lv + 1]], gdst[bounds[lv] : bounds[lv + 1]]
+        for mode in (MODE_NORMAL, MODE_OVERFLOW):
+            np.maximum.at(est[mode], d, est[mode, s] + w[mode, s])
+    # Backward sweep: tail[v] = w[v] + longest path strictly after v.
+    tail = w.copy()
+    for lv in range(bounds.size - 2, -1, -1):
+        s, d = gsrc[bounds[lv] : bounds[lv + 1]], gdst[bounds[lv] : bounds[lv + 1]]
+        for mode in (MODE_NORMAL, MODE_OVERFLOW):
+            np.maximum.at(tail[mode], s, w[mode, s] + tail[mode, d])
+
+    counts = np.diff(batch.node_offsets)
+    # reduceat over non-empty DAGs only: each segment then ends at the next start.
+    filled = counts > 0
+    starts = batch.node_offsets[:-1][filled]
+    L = np.zeros((2, counts.size))
+    C = np.zeros((2, counts.size))
+    if starts.size:
+        L[:, filled] = np.maximum.reduceat(est + w, starts, axis=1)
+        C[:, filled] = np.add.reduceat(w, starts, axis=1)
+    if deadline is None:
+        horizon = L
+    else:
+        horizon = np.broadcast_to(np.asarray(deadline, dtype=np.float64), (2, counts.size))
+    lft = np.repeat(horizon, counts, axis=1) - (tail - w)
+    return CriticalPaths(C=C, L=L, level=level, earliest_start=est, latest_finish=lft)
+
+
+def packed_critical_paths(packed: PackedTaskSet) -> CriticalPaths:
+    """Critical paths for a packed task set, latest finish relative to D_i. PDF §2, §5."""
+    return critical_paths(packed.dag_batch(), packed.c_normal, packed.c_overflow, packed.D)
 
 
 def critical_path_length(
@@ -16,7 +154,15 @@ def critical_path_length(
     Outputs: length of longest path (sum of node_lengths along path).
     Invariants: graph is a DAG; source/sink have length 0.
     """
-    # TODO: topological sort + dynamic programming (longest path)
     if not nodes:
         return 0.0
-    return max(node_lengths.get(n.id, 0.0) for n in nodes)
+    index = {n.id: k for k, n in enumerate(nodes)}
+    batch = DAGBatch(
+        n_nodes=np.array([len(nodes)]),
+        node_offsets=np.array([0, len(nodes)]),
+        edge_offsets=np.array([0, len(edges)]),
+        src=np.array([index[e.src] for e in edges], dtype=np.int64),
+        dst=np.array([index[e.dst] for e in edges], dtype=np.int64),
+    )
+    w = np.array([node_lengths.get(n.id, 0.0) for n in nodes])
+    return float(critical_paths(batch, w, w).L_normal[0])
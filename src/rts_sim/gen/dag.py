@@ -2,71 +2,203 @@
 
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
+import numpy as np
+
 from rts_sim.config import Config
-from rts_sim.gen.erdos_renyi import erdos_renyi_dag_with_source_sink
-from rts_sim.gen.utilization import rand_fixed_sum, uunifast_discard
-from rts_sim.models import DAGTask, TaskSet
-from rts_sim.utils.seeds import get_rng, set_global_seed
+from rts_sim.gen.critical_path import critical_paths
+from rts_sim.gen.erdos_renyi import erdos_renyi_dag_batch
+from rts_sim.gen.utilization import UUniFastStats, rand_fixed_sum_batch, uunifast_discard_batch
+from rts_sim.models import TaskSet
+from rts_sim.packed import CRIT_HI, CRIT_LO, PackedTaskSet
+from rts_sim.store.cache import TaskSetCache, cache_key
+from rts_sim.store.tasksets import is_streaming_path, open_task_set_writer, write_task_sets
+from rts_sim.utils.seeds import RngStreams
+
+# Normal-mode WCET as a fraction of overflow WCET (normal <= overflow per node).
+NORMAL_WCET_RATIO = 0.8
+# Cap on U_i per internal node: UUniFast-discard acceptance collapses as U_i nears |V_i|.
+MAX_TASK_UTIL_PER_NODE = 0.5
+# Part of every task-set cache key: bump whenever generation output changes for a fixed
+# (config, seed), so stale cache entries are never returned.
+GENERATOR_VERSION = "1"
+
+logger = logging.getLogger(__name__)
+
+
+def default_U_sum(config: Config) -> float:
+    """U_sum = m * U_norm for the config's default point (m_max, mid U_norm). PDF §1."""
+    U_norm = (config.system.U_norm_min + config.system.U_norm_max) / 2
+    return config.system.m_max * U_norm
+
+
+def max_U_sum(config: Config, n_tasks: int | None = None) -> float:
+    """Largest U_sum that generate_packed_task_sets samples for n_tasks tasks (default
+    config.gen.n_tasks): every U_i is capped at MAX_TASK_UTIL_PER_NODE * nodes_per_task_min."""
+    n = n_tasks if n_tasks is not None else config.gen.n_tasks
+    return n * MAX_TASK_UTIL_PER_NODE * config.gen.nodes_per_task_min
+
+
+def generate_packed_task_sets(
+    config: Config,
+    k: int = 1,
+    seed: int | None = None,
+    n_tasks: int | None = None,
+    U_sum: float | None = None,
+    stats: UUniFastStats | None = None,
+    streams: RngStreams | None = None,
+) -> list[PackedTaskSet]:
+    """Generate k independent task sets at once, in packed form. PDF §1–2.
+
+    Inputs: config (gen + system), number of task sets k, optional seed, n_tasks and U_sum
+    overrides (defaults: config.gen.n_tasks, default_U_sum(config)), optional
+    UUniFastStats to accumulate node-utilization sampling cost into, optional RNG streams
+    (default: RngStreams(seed or config.seed).child("gen")).
+    Outputs: k PackedTaskSets; node WCETs, C_i and L_i filled in both modes.
+    Invariants: task utilizations come from one RandFixedSum call (k rows, capped at
+    MAX_TASK_UTIL_PER_NODE * nodes_per_task_min); node utilizations come from one
+    UUniFast-discard batch per node count; D_i = T_i; every DAG of every set is sampled in
+    one Erdős–Rényi batch and measured in one critical-path pass. Each stage draws from its
+    own stream, so changing one stage never shifts the randomness of another.
+    ValueError if U_sum > max_U_sum (the cap keeps UUniFast-discard acceptance usable).
+    """
+    if streams is None:
+        streams = RngStreams(seed if seed is not None else config.seed).child("gen")
+    g = config.gen
+    n = n_tasks if n_tasks is not None else g.n_tasks
+    total = default_U_sum(config) if U_sum is None else U_sum
+    if total > max_U_sum(config, n) + 1e-9:
+        raise ValueError(
+            f"U_sum {total:g} exceeds {max_U_sum(config, n):g}, the most {n} tasks with "
+            f">= {g.nodes_per_task_min} nodes each can carry (MAX_TASK_UTIL_PER_NODE per node)"
+        )
+    u_max = min(total, MAX_TASK_UTIL_PER_NODE * g.nodes_per_task_min)
+    U = rand_fixed_sum_batch(n, total, k, a=0.0, b=u_max, seed=streams.rng("task_util"))
+    U = U.ravel()
+    batch = erdos_renyi_dag_batch(
+        k * n, g.nodes_per_task_min, g.nodes_per_task_max, g.erdos_renyi_p, seed=streams.rng("dag")
+    )
+    T = streams.rng("period").choice(np.asarray(g.period_values, dtype=np.float64), size=k * n)
+
+    n_internal = batch.n_nodes - 2
+    c_overflow = np.zeros(int(batch.node_offsets[-1]))
+    st = stats if stats is not None else UUniFastStats()
+    node_rng = streams.rng("node_util")
+    for n_int in np.unique(n_internal).tolist():
+        # One UUniFast-discard batch per node count; source/sink keep zero execution.
+        rows = np.flatnonzero(n_internal == n_int)
+        u_nodes = uunifast_discard_batch(n_int, U[rows], seed=node_rng, stats=st)
+        slots = batch.node_offsets[rows, None] + 1 + np.arange(n_int)
+        c_overflow[slots] = u_nodes * T[rows, None]
+    logger.debug(
+        "UUniFast-discard: %d vectors, %d draws, acceptance %.3f",
+        st.accepted,
+        st.draws,
+        st.acceptance_rate,
+    )
+    c_normal = NORMAL_WCET_RATIO * c_overflow
+    hi = streams.rng("criticality").random(c_overflow.size) < g.hi_fraction
+    criticality = np.where(hi, CRIT_HI, CRIT_LO)
+    criticality[batch.node_offsets[:-1]] = CRIT_LO
+    criticality[batch.node_offsets[1:] - 1] = CRIT_LO
+
+    cp = critical_paths(batch, c_normal, c_overflow, deadline=T)
+    packed = PackedTaskSet.from_dag_batch(
+        batch,
+        c_normal,
+        c_overflow,
+        criticality,
+        task_ids=tuple(f"tau_{i % n}" for i in range(k * n)),
+        T=T,
+        D=T,
+        U_normal=cp.C_normal / T,
+        U_overflow=cp.C_overflow / T,
+        C_normal=cp.C_normal,
+        C_overflow=cp.C_overflow,
+        L_normal=cp.L_normal,
+        L_overflow=cp.L_overflow,
+    )
+    return [packed.slice_tasks(j * n, (j + 1) * n) for j in range(k)]
+
+
+def task_set_key(config: Config, seed: int, **params: object) -> str:
+    """Cache key of a generated task set: config gen/system/resources, seed, GENERATOR_VERSION."""
+    return cache_key(config, seed, GENERATOR_VERSION, **params)
+
+
+def cached_packed_task_set(
+    config: Config,
+    cache: TaskSetCache | None,
+    seed: int | None = None,
+    n_tasks: int | None = None,
+    U_sum: float | None = None,
+) -> tuple[str, PackedTaskSet]:
+    """One packed task set, served from `cache` when an identical one was generated before.
+
+    Inputs: config, cache (None: always generate), seed (default config.seed), optional
+    n_tasks / U_sum overrides as in generate_packed_task_sets.
+    Outputs: (cache key, PackedTaskSet).
+    Invariants: a hit is bit-identical to regenerating; the key covers everything that
+    feeds generation, so the options outside gen/system/resources never invalidate it.
+    """
+    seed = config.seed if seed is None else seed
+    n = config.gen.n_tasks if n_tasks is None else n_tasks
+    total = default_U_sum(config) if U_sum is None else U_sum
+    key = task_set_key(config, seed, n_tasks=n, U_sum=float(total))
+
+    def factory() -> PackedTaskSet:
+        return generate_packed_task_sets(config, k=1, seed=seed, n_tasks=n, U_sum=total)[0]
+
+    if cache is None:
+        return key, factory()
+    return key, cache.get_or_create(key, factory)
+
+
+def generate_task_set_corpus(
+    config: Config,
+    n_sets: int,
+    output_path: Path,
+    seed: int | None = None,
+    batch_size: int = 64,
+) -> int:
+    """Generate n_sets task sets and stream them to a `.rtsb`/`.jsonl` file. PDF §2.
+
+    Inputs: config, number of task sets, output path, optional seed, sets per batch.
+    Outputs: number of tasks written; each task set is one chunk (meta {"set": j}).
+    Invariants: at most batch_size task sets are held in memory; batch b draws from
+    stream ("gen", "batch", b), so the corpus is reproducible for a given batch_size.
+    """
+    streams = RngStreams(seed if seed is not None else config.seed).child("gen")
+    with open_task_set_writer(output_path) as writer:
+        for b, lo in enumerate(range(0, n_sets, batch_size)):
+            k = min(batch_size, n_sets - lo)
+            for j, packed in enumerate(
+                generate_packed_task_sets(config, k=k, streams=streams.child("batch", b))
+            ):
+                writer.write_packed(packed, meta={"set": lo + j})
+        return writer.n_tasks
 
 
 def generate_dag_task_set(
     config: Config,
     seed: int | None = None,
     output_path: Path | None = None,
+    cache: TaskSetCache | None = None,
 ) -> TaskSet:
     """Generate a full task set: DAGs + U_i + T_i + C_i, L_i. PDF §2.
 
-    Inputs: config (gen + system), optional seed, optional output_path to write JSON.
+    Inputs: config (gen + system), optional seed, optional output_path (`.json` pretty
+    JSON, `.jsonl` JSON lines, `.rtsb` chunked binary), optional task-set cache.
     Outputs: TaskSet with DAGTask list; each task has C_normal, C_overflow, L_normal, L_overflow.
     Invariants: D_i = T_i; 50% HI / 50% LO nodes; periods in {2000, 4000, 6000}.
     """
-    s = seed if seed is not None else config.seed
-    set_global_seed(s)
-    rng = get_rng(s)
-    g = config.gen
-    m = config.system.m_max  # TODO: derive m from U_norm and n_tasks
-    U_norm = (config.system.U_norm_min + config.system.U_norm_max) / 2
-    U_sum = m * U_norm
-    # TODO: RandFixedSum for task utilizations
-    u_list = rand_fixed_sum(g.n_tasks, U_sum, seed=s)
-    tasks: list[DAGTask] = []
-    for i, U_i in enumerate(u_list):
-        # TODO: n_nodes = random in [nodes_per_task_min, nodes_per_task_max]
-        n_nodes = g.nodes_per_task_min
-        nodes, edges = erdos_renyi_dag_with_source_sink(
-            n_nodes, g.erdos_renyi_p, seed=rng.randint(0, 2**31 - 1)
-        )
-        # TODO: UUniFast for node utils (overflow); normal <= overflow
-        node_utils = uunifast_discard(len(nodes), U_i, seed=rng.randint(0, 2**31 - 1))
-        # TODO: T_i from period_values; D_i = T_i; c(v) = u * T per node; C_i = sum c; L_i = critical path
-        T = float(rng.choice(g.period_values))
-        C_normal = C_overflow = 0.0
-        for j, node in enumerate(nodes):
-            u_node = node_utils[j] if j < len(node_utils) else 0.0
-            # Placeholder: we don't mutate Node; would need to build new nodes with c_normal, c_overflow
-            C_overflow += u_node * T
-        C_normal = C_overflow * 0.8  # placeholder
-        L_normal = C_normal  # TODO: critical path
-        L_overflow = C_overflow
-        tasks.append(
-            DAGTask(
-                task_id=f"tau_{i}",
-                nodes=nodes,
-                edges=edges,
-                T=T,
-                D=T,
-                U_normal=U_i * 0.8,
-                U_overflow=U_i,
-                C_normal=C_normal,
-                C_overflow=C_overflow,
-                L_normal=L_normal,
-                L_overflow=L_overflow,
-            )
-        )
-    ts = TaskSet(tasks=tasks)
-    if output_path is not None:
+    _, packed = cached_packed_task_set(config, cache, seed=seed)
+    if output_path is not None and is_streaming_path(output_path):
+        write_task_sets([packed], output_path)
+    ts = packed.to_task_set()
+    if output_path is not None and not is_streaming_path(output_path):
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, "w", encoding="utf-8") as f:
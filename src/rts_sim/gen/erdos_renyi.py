@@ -4,13 +4,23 @@ PDF reference: Section 2 – task generation, G(|V_i|, p), p=0.1, add source and
 Inputs: n_nodes (int), p (float), rng (optional).
 Outputs: nodes list, edges list (with single root and single sink).
 Invariants: one source (in-degree 0), one sink (out-degree 0); source/sink have zero execution.
+
+Two paths are provided: `erdos_renyi_dag_with_source_sink` builds one DAG as pydantic
+objects; `erdos_renyi_dag_batch` samples many DAGs at once with NumPy and returns a
+compact `DAGBatch` (per-DAG offsets + edge arrays), converted to objects only on demand.
 """
 
 from __future__ import annotations
 
+import numpy as np
+
 from rts_sim.models import Edge, Node
 from rts_sim.models import Criticality
-from rts_sim.utils.seeds import get_rng
+from rts_sim.packed import DAGBatch, node_id
+from rts_sim.utils.seeds import SeedLike, get_rng
+
+# Upper bound on the number of adjacency cells materialized per vectorized chunk.
+_CHUNK_CELLS = 1 << 22
 
 
 def erdos_renyi_dag_with_source_sink(
@@ -22,15 +32,114 @@ def erdos_renyi_dag_with_source_sink(
 
     Inputs: n_nodes (internal nodes, excluding source/sink), p (edge probability), seed.
     Outputs: (nodes, edges) with source and sink; source/sink have c_normal=c_overflow=0.
-    Invariants: graph is a DAG; single root, single leaf.
+    Invariants: graph is a DAG; single root, single leaf. Nodes are listed in topological
+    order (source, v1..vn, sink); edges are sorted by (src, dst) index.
     """
     rng = get_rng(seed)
-    # TODO: generate G(n_nodes, p) as DAG (only i->j for i < j or random topological order)
-    # TODO: add source connected to all roots, sink connected from all leaves
-    # Placeholder: minimal structure
+    n = n_nodes
+    draws = iter(rng.random(n * (n - 1) // 2).tolist())
     nodes: list[Node] = [
-        Node(id="source", criticality=Criticality.LO, c_normal=0.0, c_overflow=0.0),
-        Node(id="sink", criticality=Criticality.LO, c_normal=0.0, c_overflow=0.0),
+        Node(id=node_id(k, n), criticality=Criticality.LO, c_normal=0.0, c_overflow=0.0)
+        for k in range(n + 2)
+    ]
+    # Edges only go from lower to higher index, so G(n, p) is acyclic by construction.
+    succ: list[list[int]] = [[] for _ in range(n + 1)]
+    indeg = [0] * (n + 2)
+    for i in range(1, n + 1):
+        for j in range(i + 1, n + 1):
+            if next(draws) < p:
+                succ[i].append(j)
+                indeg[j] += 1
+    for j in range(1, n + 1):
+        if indeg[j] == 0:
+            succ[0].append(j)
+    for i in range(1, n + 1):
+        if not succ[i]:
+            succ[i].append(n + 1)
+    if n == 0:
+        succ[0].append(1)
+    edges: list[Edge] = [
+        Edge(src=nodes[i].id, dst=nodes[j].id) for i in range(n + 1) for j in succ[i]
     ]
-    edges: list[Edge] = [Edge(src="source", dst="sink")]
     return nodes, edges
+
+
+def erdos_renyi_dag_batch(
+    n_dags: int,
+    n_nodes_min: int,
+    n_nodes_max: int | None = None,
+    p: float = 0.1,
+    seed: SeedLike = None,
+) -> DAGBatch:
+    """Sample many G(n, p) DAGs with source/sink at once. PDF §2.
+
+    Inputs: n_dags, internal node count range [n_nodes_min, n_nodes_max] (drawn uniformly
+    per DAG), edge probability p, seed / SeedSequence / Generator.
+    Outputs: DAGBatch in compact form.
+    Invariants: deterministic for a given (n_dags, range, p, seed); each DAG is
+    structurally identical to what the per-object path builds (single root, single leaf).
+    """
+    if n_nodes_max is None:
+        n_nodes_max = n_nodes_min
+    if n_nodes_min < 1 or n_nodes_max < n_nodes_min:
+        raise ValueError(f"invalid node range [{n_nodes_min}, {n_nodes_max}]")
+    rng = get_rng(seed)
+    sizes = rng.integers(n_nodes_min, n_nodes_max + 1, size=n_dags)
+
+    parts: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+    edge_counts = np.zeros(n_dags, dtype=np.int64)
+    for n in np.unique(sizes).tolist():
+        idx = np.flatnonzero(sizes == n)
+        iu, ju = np.triu_indices(n, k=1)
+        step = max(1, _CHUNK_CELLS // (n * n))
+        for lo in range(0, idx.size, step):
+            g_ids = idx[lo : lo + step]
+            d, s, t = _sample_chunk(rng, g_ids.size, n, p, iu, ju)
+            counts = np.bincount(d, minlength=g_ids.size)
+            edge_counts[g_ids] = counts
+            parts.append((g_ids, counts, s, t))
+
+    edge_offsets = np.zeros(n_dags + 1, dtype=np.int64)
+    np.cumsum(edge_counts, out=edge_offsets[1:])
+    src = np.empty(int(edge_offsets[-1]), dtype=np.int32)
+    dst = np.empty_like(src)
+    for g_ids, counts, s, t in parts:
+        # Scatter the chunk's edges (grouped by DAG) into their global slots.
+        local_start = np.cumsum(counts) - counts
+        rank = np.arange(s.size) - np.repeat(local_start, counts)
+        pos = np.repeat(edge_offsets[g_ids], counts) + rank
+        src[pos] = s
+        dst[pos] = t
+
+    n_total = sizes.astype(np.int64) + 2
+    node_offsets = np.zeros(n_dags + 1, dtype=np.int64)
+    np.cumsum(n_total, out=node_offsets[1:])
+    return DAGBatch(
+        n_nodes=n_total,
+        node_offsets=node_offsets,
+        edge_offsets=edge_offsets,
+        src=src,
+        dst=dst,
+    )
+
+
+def _sample_chunk(
+    rng: np.random.Generator,
+    k: int,
+    n: int,
+    p: float,
+    iu: np.ndarray,
+    ju: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sample k DAGs with n internal nodes; return (dag, src, dst) sorted by (dag, src, dst)."""
+    adj = np.zeros((k, n, n), dtype=bool)
+    adj[:, iu, ju] = rng.random((k, iu.size)) < p
+    d_in, i_in, j_in = np.nonzero(adj)
+    # Roots (in-degree 0) hang off the source, leaves (out-degree 0) feed the sink.
+    d_src, j_src = np.nonzero(~adj.any(axis=1))
+    d_snk, i_snk = np.nonzero(~adj.any(axis=2))
+    d = np.concatenate([d_src, d_in, d_snk])
+    s = np.concatenate([np.zeros_like(j_src), i_in + 1, i_snk + 1])
+    t = np.concatenate([j_src + 1, j_in + 1, np.full_like(i_snk, n + 1)])
+    order = np.lexsort((t, s, d))
+    return d[order], s[order].astype(np.int32), t[order].astype(np.int32)
@@ -8,6 +8,83 @@ Invariants: each u_i in (0,1) for UUniFast; sum(u_i)=U_sum for RandFixedSum.
 
 from __future__ import annotations
 
+import math
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+from rts_sim.utils.seeds import SeedLike, get_rng
+
+_REALMAX = sys.float_info.max
+_TINY = 2.0**-1074
+
+
+def rand_fixed_sum_batch(
+    n: int,
+    U_sum: float,
+    k: int,
+    a: float = 0.0,
+    b: float | None = None,
+    seed: SeedLike = None,
+) -> np.ndarray:
+    """Stafford's RandFixedSum: k independent vectors, each of n values in [a, b] summing to U_sum. PDF §1, §4.
+
+    Inputs: n (values per vector), U_sum (target sum), k (number of vectors), bounds
+    [a, b] (b defaults to U_sum, i.e. the plain simplex), seed / SeedSequence / Generator.
+    Outputs: (k, n) float64 matrix; rows are uniformly distributed on the constrained simplex.
+    Invariants: n*a <= U_sum <= n*b (ValueError otherwise); each row sums to U_sum
+    within float precision. The loop runs over n only; all k vectors are drawn together.
+    """
+    if b is None:
+        b = max(U_sum, a)
+    if n <= 0 or k <= 0:
+        return np.zeros((max(k, 0), max(n, 0)))
+    if b < a or not (n * a - 1e-12 <= U_sum <= n * b + 1e-12):
+        raise ValueError(f"RandFixedSum infeasible: n={n}, U_sum={U_sum}, bounds=[{a}, {b}]")
+    if b == a:
+        return np.full((k, n), a, dtype=np.float64)
+    rng = get_rng(seed)
+
+    # Rescale to the unit cube: find x in [0,1]^n with sum s.
+    s = (U_sum - n * a) / (b - a)
+    kk = max(min(math.floor(s), n - 1), 0)
+    s = max(min(s, kk + 1), kk)
+    s1 = s - np.arange(kk, kk - n, -1, dtype=np.float64)
+    s2 = np.arange(kk + n, kk, -1, dtype=np.float64) - s
+    # w[i, :] are scaled simplex-slice volumes; t[i, :] the transition probabilities.
+    w = np.zeros((n, n + 1))
+    w[0, 1] = _REALMAX
+    t = np.zeros((max(n - 1, 1), n))
+    for i in range(2, n + 1):
+        tmp1 = w[i - 2, 1 : i + 1] * s1[:i] / i
+        tmp2 = w[i - 2, :i] * s2[n - i :] / i
+        w[i - 1, 1 : i + 1] = tmp1 + tmp2
+        tmp3 = w[i - 1, 1 : i + 1] + _TINY
+        tmp4 = s2[n - i :] > s1[:i]
+        t[i - 2, :i] = np.where(tmp4, tmp2 / tmp3, 1.0 - tmp1 / tmp3)
+
+    x = np.empty((n, k))
+    rt = rng.random((n - 1, k))
+    rs = rng.random((n - 1, k))
+    s_vec = np.full(k, s)
+    j = np.full(k, kk, dtype=np.int64)
+    sm = np.zeros(k)
+    pr = np.ones(k)
+    for i in range(n - 1, 0, -1):
+        e = rt[n - i - 1] <= t[i - 1, j]
+        sx = rs[n - i - 1] ** (1.0 / i)
+        sm += (1.0 - sx) * pr * s_vec / (i + 1)
+        pr *= sx
+        x[n - i - 1] = sm + pr * e
+        s_vec -= e
+        j -= e
+    x[n - 1] = sm + pr * s_vec
+    # Randomly permute the coordinates of each vector.
+    perm = np.argsort(rng.random((n, k)), axis=0)
+    x = np.take_along_axis(x, perm, axis=0)
+    return (b - a) * x.T + a
+
 
 def rand_fixed_sum(
     n: int,
@@ -20,12 +97,91 @@ def rand_fixed_sum(
     Outputs: [u_1, ..., u_n] with sum equal to U_sum.
     Invariants: each u_i >= 0; sum(u_i) = U_sum (within float precision).
     """
-    # TODO: implement RandFixedSum (rejection or Dirichlet-based)
-    # Placeholder: equal split
     if n <= 0:
         return []
-    u = U_sum / n
-    return [u] * n
+    return rand_fixed_sum_batch(n, U_sum, 1, seed=seed)[0].tolist()
+
+
+@dataclass
+class UUniFastStats:
+    """Instrumentation for UUniFast-discard: where generation time goes at high U_i. PDF §2.
+
+    Invariants: draws >= accepted; counters only grow (one object may span many calls).
+    """
+
+    accepted: int = 0  # vectors returned
+    draws: int = 0  # candidate vectors sampled
+    rounds: int = 0  # refill rounds
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.draws if self.draws else 1.0
+
+    @property
+    def rejected(self) -> int:
+        return self.draws - self.accepted
+
+
+def _uunifast_unit(rng: np.random.Generator, shape: tuple[int, ...], n: int) -> np.ndarray:
+    """Plain UUniFast vectors summing to 1, shape (*shape, n)."""
+    if n == 1:
+        return np.ones((*shape, 1))
+    # sum_{i+1} = sum_i * r^(1/(n-i)); u_i = sum_i - sum_{i+1}; u_n = sum_n.
+    exps = 1.0 / np.arange(n - 1, 0, -1, dtype=np.float64)
+    sums = np.ones((*shape, n + 1))
+    np.cumprod(rng.random((*shape, n - 1)) ** exps, axis=-1, out=sums[..., 1:n])
+    sums[..., n] = 0.0
+    return sums[..., :n] - sums[..., 1:]
+
+
+def uunifast_discard_batch(
+    n: int,
+    U_sum: float | np.ndarray,
+    k: int | None = None,
+    seed: SeedLike = None,
+    max_rounds: int = 10_000,
+    stats: UUniFastStats | None = None,
+) -> np.ndarray:
+    """UUniFast-discard for many vectors at once, with vectorized rejection. PDF §2.
+
+    Inputs: n (values per vector), U_sum (scalar, or one target per row), k (rows; taken
+    from U_sum when it is an array), seed/Generator, max_rounds, optional stats to update.
+    Outputs: (k, n) matrix; row r sums to U_sum[r] and every value is < 1.
+    Invariants: each round samples candidates for the still-rejected rows only, oversampling
+    by the inverse of the acceptance rate seen so far; rows keep their first valid candidate.
+    ValueError if some U_sum >= n (no valid vector exists); RuntimeError after max_rounds.
+    """
+    U = np.atleast_1d(np.asarray(U_sum, dtype=np.float64))
+    if k is not None and U.size == 1:
+        U = np.full(k, U[0])
+    k = U.size
+    out = np.zeros((k, max(n, 0)))
+    if n <= 0 or k == 0:
+        return out
+    if (U >= n).any():
+        raise ValueError(f"UUniFast-discard infeasible: U_sum {U.max()} >= n={n}")
+    st = stats if stats is not None else UUniFastStats()
+    rng = get_rng(seed)
+    pending = np.arange(k)
+    rate = 1.0
+    for _ in range(max_rounds):
+        per_row = int(min(64, max(1, np.ceil(1.0 / max(rate, 1e-6)))))
+        cand = _uunifast_unit(rng, (pending.size, per_row), n) * U[pending, None, None]
+        ok = cand.max(axis=-1) < 1.0
+        hit = ok.any(axis=1)
+        first = ok.argmax(axis=1)
+        out[pending[hit]] = cand[hit, first[hit]]
+        st.rounds += 1
+        st.draws += cand.shape[0] * per_row
+        st.accepted += int(hit.sum())
+        rate = max(float(ok.mean()), 1e-6)
+        pending = pending[~hit]
+        if not pending.size:
+            return out
+    raise RuntimeError(
+        f"UUniFast-discard: {pending.size} rows still rejected after {max_rounds} rounds "
+        f"(acceptance {st.acceptance_rate:.2e})"
+    )
 
 
 def uunifast_discard(
@@ -36,12 +192,9 @@ def uunifast_discard(
     """Generate n node utilizations with UUniFast discard. PDF §2.
 
     Inputs: n (number of nodes), U_sum (task utilization), seed.
-    Outputs: [u_1, ..., u_n] each < 1, sum <= U_sum; discard if any >= 1 and retry.
+    Outputs: [u_1, ..., u_n] each < 1, sum == U_sum; discard if any >= 1 and retry.
     Invariants: each u_i in (0, 1); used for overflow mode; normal <= overflow per node.
     """
-    # TODO: implement UUniFast discard (random breakdown of U_sum, reject if any >= 1)
-    # Placeholder: equal split, capped
     if n <= 0:
         return []
-    u = min(U_sum / n, 0.99)
-    return [u] * n
+    return uunifast_discard_batch(n, U_sum, seed=seed)[0].tolist()
@@ -176,6 +176,14 @@ class ExperimentPoint(BaseModel):
     result: SimulationResult | None = None
     model_config = {"extra": "allow"}
 
+    @property
+    def key(self) -> str:
+        """Point identity (sweep coordinates + seed); stable across runs and processes."""
+        return (
+            f"n{self.n_tasks}_m{self.m}_u{self.U_norm!r}_r{self.n_resources}"
+            f"_a{self.total_resource_accesses}_s{self.seed}"
+        )
+
 
 # Forward refs
 Node.model_rebuild()
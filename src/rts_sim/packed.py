@@ -0,0 +1,355 @@
+"""Array-backed task-set representation alongside the pydantic models.
+
+PDF reference: Sections 2 and 4 (DAG tasks, node WCETs, segments).
+Inputs: TaskSet (pydantic) or generator arrays.
+Outputs: PackedTaskSet with per-task, per-node, per-edge and per-segment NumPy arrays.
+Invariants: lossless round trip TaskSet -> PackedTaskSet -> TaskSet; edges use
+task-local node indices; pydantic objects are only built at I/O boundaries.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from rts_sim.models import Criticality, DAGTask, Edge, Node, Segment, TaskSet
+
+CRIT_LO = 0
+CRIT_HI = 1
+SEG_NORMAL = 0
+SEG_CRITICAL = 1
+NO_RESOURCE = -1
+
+_TASK_FIELDS = (
+    "T",
+    "D",
+    "U_normal",
+    "U_overflow",
+    "C_normal",
+    "C_overflow",
+    "L_normal",
+    "L_overflow",
+)
+
+
+def node_id(k: int, n_internal: int) -> str:
+    """Node id for local index k in a DAG with n_internal nodes: source, v1..vn, sink."""
+    if k == 0:
+        return "source"
+    if k == n_internal + 1:
+        return "sink"
+    return f"v{k}"
+
+
+def _offsets(counts: np.ndarray | list[int]) -> np.ndarray:
+    """Exclusive prefix sum with a trailing total: CSR offsets for the given counts."""
+    out = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=out[1:])
+    return out
+
+
+@dataclass(frozen=True)
+class DAGBatch:
+    """Compact adjacency for a batch of DAGs (source/sink included). PDF §2.
+
+    Inputs: per-DAG node counts, CSR-style offsets and local edge endpoints.
+    Outputs: arrays usable by vectorized passes; pydantic objects via `to_nodes_edges`.
+    Invariants: DAG d owns nodes node_offsets[d]:node_offsets[d+1] and edges
+    edge_offsets[d]:edge_offsets[d+1]; local index 0 is the source, n_nodes[d]-1 the sink;
+    every edge has src < dst and edges are sorted by (src, dst) within each DAG.
+    """
+
+    n_nodes: np.ndarray  # (n_dags,) int64, including source and sink
+    node_offsets: np.ndarray  # (n_dags + 1,) int64
+    edge_offsets: np.ndarray  # (n_dags + 1,) int64
+    src: np.ndarray  # (n_edges,) int32, local node index
+    dst: np.ndarray  # (n_edges,) int32, local node index
+
+    @property
+    def n_dags(self) -> int:
+        return int(self.n_nodes.shape[0])
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.src.shape[0])
+
+    def edge_dag(self) -> np.ndarray:
+        """DAG index of every edge."""
+        return np.repeat(np.arange(self.n_dags), np.diff(self.edge_offsets))
+
+    def global_edges(self) -> tuple[np.ndarray, np.ndarray]:
+        """Edge endpoints as indices into the batch-wide node arrays."""
+        base = np.repeat(self.node_offsets[:-1], np.diff(self.edge_offsets))
+        return base + self.src, base + self.dst
+
+    def successor_csr(self) -> tuple[np.ndarray, np.ndarray]:
+        """Batch-wide successor CSR: (indptr over all nodes, global successor indices)."""
+        gsrc, gdst = self.global_edges()
+        counts = np.bincount(gsrc, minlength=int(self.node_offsets[-1]))
+        indptr = np.zeros(counts.size + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr, gdst
+
+    def dag(self, d: int) -> tuple[int, np.ndarray, np.ndarray]:
+        """(n_nodes, src, dst) of DAG d, local indices."""
+        lo, hi = self.edge_offsets[d], self.edge_offsets[d + 1]
+        return int(self.n_nodes[d]), self.src[lo:hi], self.dst[lo:hi]
+
+    def to_nodes_edges(self, d: int) -> tuple[list[Node], list[Edge]]:
+        """Materialize DAG d as pydantic nodes/edges (same layout as the per-object path)."""
+        n, src, dst = self.dag(d)
+        ids = [node_id(k, n - 2) for k in range(n)]
+        nodes = [
+            Node(id=i, criticality=Criticality.LO, c_normal=0.0, c_overflow=0.0) for i in ids
+        ]
+        edges = [Edge(src=ids[s], dst=ids[t]) for s, t in zip(src.tolist(), dst.tolist())]
+        return nodes, edges
+
+
+@dataclass(frozen=True)
+class PackedTaskSet:
+    """Packed task set: CSR layout over tasks -> nodes -> segments and tasks -> edges.
+
+    Inputs: arrays as described per field.
+    Outputs: compact view used by generation, partitioning and scheduling.
+    Invariants: task i owns nodes node_offsets[i]:node_offsets[i+1] and edges
+    edge_offsets[i]:edge_offsets[i+1]; node k owns segments seg_offsets[k]:seg_offsets[k+1].
+    """
+
+    task_ids: tuple[str, ...]
+    # Per task (n_tasks,), float64; see DAGTask for meaning.
+    T: np.ndarray
+    D: np.ndarray
+    U_normal: np.ndarray
+    U_overflow: np.ndarray
+    C_normal: np.ndarray
+    C_overflow: np.ndarray
+    L_normal: np.ndarray
+    L_overflow: np.ndarray
+    # Per node (n_nodes,); node_offsets is (n_tasks + 1,).
+    node_offsets: np.ndarray
+    node_ids: tuple[str, ...]
+    c_normal: np.ndarray
+    c_overflow: np.ndarray
+    criticality: np.ndarray  # int8, CRIT_LO / CRIT_HI
+    # Per edge (n_edges,), task-local node indices; edge_offsets is (n_tasks + 1,).
+    edge_offsets: np.ndarray
+    edge_src: np.ndarray
+    edge_dst: np.ndarray
+    # Per segment (n_segments,); seg_offsets is (n_nodes + 1,).
+    seg_offsets: np.ndarray
+    seg_kind: np.ndarray  # int8, SEG_NORMAL / SEG_CRITICAL
+    seg_length_normal: np.ndarray
+    seg_length_overflow: np.ndarray
+    seg_resource: np.ndarray  # int32 index into resource_ids, NO_RESOURCE if none
+    resource_ids: tuple[str, ...] = ()
+
+    @property
+    def n_tasks(self) -> int:
+        return len(self.task_ids)
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.node_offsets[-1])
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.edge_offsets[-1])
+
+    @property
+    def U_sum(self) -> float:
+        """Total utilization (overflow). PDF §1."""
+        return float(self.U_overflow.sum())
+
+    def node_task(self) -> np.ndarray:
+        """Task index of every node."""
+        return np.repeat(np.arange(self.n_tasks), np.diff(self.node_offsets))
+
+    def task_index(self) -> dict[str, int]:
+        """task_id -> task index."""
+        return {tid: i for i, tid in enumerate(self.task_ids)}
+
+    def dag_batch(self) -> DAGBatch:
+        """Adjacency of all tasks as a DAGBatch (shares the edge arrays, no copy)."""
+        return DAGBatch(
+            n_nodes=np.diff(self.node_offsets),
+            node_offsets=self.node_offsets,
+            edge_offsets=self.edge_offsets,
+            src=self.edge_src,
+            dst=self.edge_dst,
+        )
+
+    @classmethod
+    def from_task_set(cls, task_set: TaskSet) -> PackedTaskSet:
+        """Pack a pydantic TaskSet. Raises ValueError on edges to unknown node ids."""
+        tasks = task_set.tasks
+        nodes = [n for t in tasks for n in t.nodes]
+        segments = [s for n in nodes for s in n.segments]
+        resource_ids = tuple(
+            sorted({s.resource_id for s in segments if s.resource_id is not None})
+        )
+        res_index = {r: q for q, r in enumerate(resource_ids)}
+        edge_src: list[int] = []
+        edge_dst: list[int] = []
+        for t in tasks:
+            local = {n.id: k for k, n in enumerate(t.nodes)}
+            try:
+                edge_src.extend(local[e.src] for e in t.edges)
+                edge_dst.extend(local[e.dst] for e in t.edges)
+            except KeyError as exc:
+                raise ValueError(f"task {t.task_id}: edge references unknown node {exc}") from None
+        task_cols = {
+            f: np.array([getattr(t, f) for t in tasks], dtype=np.float64) for f in _TASK_FIELDS
+        }
+        return cls(
+            task_ids=tuple(t.task_id for t in tasks),
+            **task_cols,
+            node_offsets=_offsets([len(t.nodes) for t in tasks]),
+            node_ids=tuple(n.id for n in nodes),
+            c_normal=np.array([n.c_normal for n in nodes], dtype=np.float64),
+            c_overflow=np.array([n.c_overflow for n in nodes], dtype=np.float64),
+            criticality=np.array(
+                [CRIT_HI if n.criticality == Criticality.HI else CRIT_LO for n in nodes],
+                dtype=np.int8,
+            ),
+            edge_offsets=_offsets([len(t.edges) for t in tasks]),
+            edge_src=np.array(edge_src, dtype=np.int32),
+            edge_dst=np.array(edge_dst, dtype=np.int32),
+            seg_offsets=_offsets([len(n.segments) for n in nodes]),
+            seg_kind=np.array(
+                [SEG_CRITICAL if s.kind == Segment.Kind.CRITICAL else SEG_NORMAL for s in segments],
+                dtype=np.int8,
+            ),
+            seg_length_normal=np.array([s.length_normal for s in segments], dtype=np.float64),
+            seg_length_overflow=np.array([s.length_overflow for s in segments], dtype=np.float64),
+            seg_resource=np.array(
+                [NO_RESOURCE if s.resource_id is None else res_index[s.resource_id] for s in segments],
+                dtype=np.int32,
+            ),
+            resource_ids=resource_ids,
+        )
+
+    @classmethod
+    def from_dag_batch(
+        cls,
+        batch: DAGBatch,
+        c_normal: np.ndarray,
+        c_overflow: np.ndarray,
+        criticality: np.ndarray,
+        task_ids: tuple[str, ...] | None = None,
+        **task_cols: np.ndarray,
+    ) -> PackedTaskSet:
+        """Build from generator output: DAG adjacency + per-node WCETs + per-task columns.
+
+        Inputs: batch, per-node arrays (batch.node_offsets layout), optional task ids
+        (default tau_0..), per-task arrays for every field in T, D, U_*, C_*, L_*.
+        Outputs: PackedTaskSet without segments; node ids follow source, v1..vn, sink.
+        """
+        missing = set(_TASK_FIELDS) - set(task_cols)
+        if missing:
+            raise ValueError(f"missing per-task columns: {sorted(missing)}")
+        n_tasks = batch.n_dags
+        node_ids = tuple(
+            node_id(k, n - 2) for n in batch.n_nodes.tolist() for k in range(n)
+        )
+        return cls(
+            task_ids=task_ids or tuple(f"tau_{i}" for i in range(n_tasks)),
+            **{f: np.asarray(task_cols[f], dtype=np.float64) for f in _TASK_FIELDS},
+            node_offsets=batch.node_offsets,
+            node_ids=node_ids,
+            c_normal=np.asarray(c_normal, dtype=np.float64),
+            c_overflow=np.asarray(c_overflow, dtype=np.float64),
+            criticality=np.asarray(criticality, dtype=np.int8),
+            edge_offsets=batch.edge_offsets,
+            edge_src=batch.src,
+            edge_dst=batch.dst,
+            seg_offsets=np.zeros(batch.node_offsets[-1] + 1, dtype=np.int64),
+            seg_kind=np.zeros(0, dtype=np.int8),
+            seg_length_normal=np.zeros(0, dtype=np.float64),
+            seg_length_overflow=np.zeros(0, dtype=np.float64),
+            seg_resource=np.zeros(0, dtype=np.int32),
+        )
+
+    def task(self, i: int) -> DAGTask:
+        """Materialize task i as a DAGTask."""
+        n_lo, n_hi = int(self.node_offsets[i]), int(self.node_offsets[i + 1])
+        e_lo, e_hi = int(self.edge_offsets[i]), int(self.edge_offsets[i + 1])
+        ids = self.node_ids[n_lo:n_hi]
+        c_norm = self.c_normal[n_lo:n_hi].tolist()
+        c_over = self.c_overflow[n_lo:n_hi].tolist()
+        crit = self.criticality[n_lo:n_hi].tolist()
+        seg_bounds = self.seg_offsets[n_lo : n_hi + 1].tolist()
+        nodes = [
+            Node(
+                id=ids[k],
+                criticality=Criticality.HI if crit[k] == CRIT_HI else Criticality.LO,
+                c_normal=c_norm[k],
+                c_overflow=c_over[k],
+                segments=self._segments(seg_bounds[k], seg_bounds[k + 1]),
+            )
+            for k in range(n_hi - n_lo)
+        ]
+        edges = [
+            Edge(src=ids[s], dst=ids[t])
+            for s, t in zip(
+                self.edge_src[e_lo:e_hi].tolist(), self.edge_dst[e_lo:e_hi].tolist()
+            )
+        ]
+        return DAGTask(
+            task_id=self.task_ids[i],
+            nodes=nodes,
+            edges=edges,
+            **{f: float(getattr(self, f)[i]) for f in _TASK_FIELDS},
+        )
+
+    def _segments(self, lo: int, hi: int) -> list[Segment]:
+        out: list[Segment] = []
+        for j in range(lo, hi):
+            r = int(self.seg_resource[j])
+            out.append(
+                Segment(
+                    kind=Segment.Kind.CRITICAL if self.seg_kind[j] == SEG_CRITICAL else Segment.Kind.NORMAL,
+                    length_normal=float(self.seg_length_normal[j]),
+                    length_overflow=float(self.seg_length_overflow[j]),
+                    resource_id=None if r == NO_RESOURCE else self.resource_ids[r],
+                )
+            )
+        return out
+
+    def to_task_set(self) -> TaskSet:
+        """Materialize all tasks as a pydantic TaskSet."""
+        return TaskSet(tasks=[self.task(i) for i in range(self.n_tasks)])
+
+    def slice_tasks(self, lo: int, hi: int) -> PackedTaskSet:
+        """Tasks lo:hi as their own PackedTaskSet (array views, offsets rebased)."""
+        n_lo, n_hi = int(self.node_offsets[lo]), int(self.node_offsets[hi])
+        e_lo, e_hi = int(self.edge_offsets[lo]), int(self.edge_offsets[hi])
+        s_lo, s_hi = int(self.seg_offsets[n_lo]), int(self.seg_offsets[n_hi])
+        return PackedTaskSet(
+            task_ids=self.task_ids[lo:hi],
+            **{f: getattr(self, f)[lo:hi] for f in _TASK_FIELDS},
+            node_offsets=self.node_offsets[lo : hi + 1] - n_lo,
+            node_ids=self.node_ids[n_lo:n_hi],
+            c_normal=self.c_normal[n_lo:n_hi],
+            c_overflow=self.c_overflow[n_lo:n_hi],
+            criticality=self.criticality[n_lo:n_hi],
+            edge_offsets=self.edge_offsets[lo : hi + 1] - e_lo,
+            edge_src=self.edge_src[e_lo:e_hi],
+            edge_dst=self.edge_dst[e_lo:e_hi],
+            seg_offsets=self.seg_offsets[n_lo : n_hi + 1] - s_lo,
+            seg_kind=self.seg_kind[s_lo:s_hi],
+            seg_length_normal=self.seg_length_normal[s_lo:s_hi],
+            seg_length_overflow=self.seg_length_overflow[s_lo:s_hi],
+            seg_resource=self.seg_resource[s_lo:s_hi],
+            resource_ids=self.resource_ids,
+        )
+
+    def with_updates(self, **arrays: object) -> PackedTaskSet:
+        """Copy with some fields replaced (arrays not listed are shared)."""
+        fields = {f: getattr(self, f) for f in self.__dataclass_fields__}
+        unknown = set(arrays) - set(fields)
+        if unknown:
+            raise ValueError(f"unknown PackedTaskSet fields: {sorted(unknown)}")
+        fields.update(arrays)
+        return PackedTaskSet(**fields)
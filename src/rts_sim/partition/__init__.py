@@ -1,10 +1,33 @@
 """Federated scheduling and grouping-by-resource partitioning. PDF §5–6."""
 
-from rts_sim.partition.federated import federated_core_allocation, wfd_placement
-from rts_sim.partition.grouping import grouping_by_most_requested_resource
+from rts_sim.partition.federated import (
+    PLACEMENT_HEURISTICS,
+    FederatedAllocation,
+    federated_allocation_batch,
+    federated_core_allocation,
+    light_task_placement,
+    light_task_placement_packed,
+    pack_decreasing,
+    wfd_placement,
+)
+from rts_sim.partition.grouping import (
+    NO_GROUP,
+    GroupAllocation,
+    group_by_resource,
+    grouping_by_most_requested_resource,
+)
 
 __all__ = [
+    "FederatedAllocation",
+    "federated_allocation_batch",
     "federated_core_allocation",
+    "PLACEMENT_HEURISTICS",
+    "pack_decreasing",
+    "light_task_placement",
+    "light_task_placement_packed",
     "wfd_placement",
+    "NO_GROUP",
+    "GroupAllocation",
+    "group_by_resource",
     "grouping_by_most_requested_resource",
 ]
@@ -2,11 +2,74 @@
 
 from __future__ import annotations
 
+import bisect
+import heapq
 import math
+from dataclasses import dataclass
+
+import numpy as np
 
 from rts_sim.models import DAGTask, TaskSet
 
 
+@dataclass
+class FederatedAllocation:
+    """Federated core allocation of a batch of task sets (see federated_allocation_batch).
+
+    Invariants: m_i >= 1 per task; heavy_cores[s] sums m_i over the heavy tasks of set s;
+    cores_used[s] = heavy_cores[s] + ceil(light utilization of s); feasible[s] iff
+    cores_used[s] <= m and no task of s has L_i >= D_i while being heavy.
+    """
+
+    m_i: np.ndarray  # (n_tasks,) int64
+    heavy: np.ndarray  # (n_tasks,) bool
+    heavy_cores: np.ndarray  # (n_sets,) int64
+    cores_used: np.ndarray  # (n_sets,) int64
+    feasible: np.ndarray  # (n_sets,) bool
+
+
+def federated_allocation_batch(
+    C: np.ndarray,
+    L: np.ndarray,
+    D: np.ndarray,
+    task_offsets: np.ndarray,
+    m_total: int | np.ndarray,
+    T: np.ndarray | None = None,
+    U: np.ndarray | None = None,
+) -> FederatedAllocation:
+    """Federated allocation and feasibility of many task sets in one call. PDF §5.
+
+    Inputs: per-task overflow C_i, L_i and deadlines D_i of all sets back to back, set
+    offsets (n_sets + 1,) (set s owns tasks task_offsets[s]:task_offsets[s+1]), m per
+    set (or one m for all), optional periods T (default D) or utilizations U (default C / T).
+    Outputs: FederatedAllocation.
+    Invariants: heavy (U_i > 1) get m_i = ceil((C_i - L_i)/(D_i - L_i)) (1 when D_i <= L_i,
+    which makes the set infeasible); light get 1 and share the cores left over, needing at
+    least ceil(sum of their U_i). No Python loop over tasks or sets.
+    """
+    C = np.asarray(C, dtype=np.float64)
+    L = np.asarray(L, dtype=np.float64)
+    D = np.asarray(D, dtype=np.float64)
+    task_offsets = np.asarray(task_offsets, dtype=np.int64)
+    n_sets = task_offsets.size - 1
+    if U is None:
+        U = C / (D if T is None else np.asarray(T, dtype=np.float64))
+    heavy = np.asarray(U) > 1.0
+    denom = D - L
+    ok = denom > 0
+    m_i = np.ones(C.size, dtype=np.int64)
+    rows = heavy & ok
+    m_i[rows] = np.maximum(1, np.ceil((C[rows] - L[rows]) / denom[rows])).astype(np.int64)
+    task_set = np.repeat(np.arange(n_sets), np.diff(task_offsets))
+    heavy_cores = np.bincount(task_set, weights=np.where(heavy, m_i, 0), minlength=n_sets).astype(np.int64)
+    light_util = np.bincount(task_set, weights=np.where(heavy, 0.0, U), minlength=n_sets)
+    # Round away float noise so that e.g. three light tasks of U = 1/3 need one core.
+    cores_used = heavy_cores + np.ceil(np.round(light_util, 9)).astype(np.int64)
+    bad = np.bincount(task_set, weights=heavy & ~ok, minlength=n_sets) > 0
+    feasible = (cores_used <= np.asarray(m_total)) & ~bad
+    return FederatedAllocation(m_i, heavy, heavy_cores, cores_used, feasible)
+
+
 def federated_core_allocation(
     task_set: TaskSet,
     m_total: int,
@@ -14,21 +77,164 @@ def federated_core_allocation(
     """Allocate cores to tasks: heavy get m_i = ceil((C_i - L_i)/(D_i - L_i)), light get 1. PDF §5.
 
     Inputs: task_set, total number of processors m.
-    Outputs: dict task_id -> m_i (cores). Infeasible if sum m_i > m.
-    Invariants: heavy (U_i > 1) get m_i cores; light get 1; sum m_i <= m for feasibility.
+    Outputs: dict task_id -> m_i (cores; 1 for a light task, which shares a core).
+    Invariants: as federated_allocation_batch: the set fits iff the heavy m_i plus
+    ceil(sum of light U_i) is at most m (not sum m_i, which counts every light task).
+    Thin wrapper over federated_allocation_batch with a single set.
+    """
+    tasks = task_set.tasks
+    alloc = federated_allocation_batch(
+        np.array([t.C_overflow for t in tasks], dtype=np.float64),
+        np.array([t.L_overflow for t in tasks], dtype=np.float64),
+        np.array([t.D for t in tasks], dtype=np.float64),
+        np.array([0, len(tasks)]),
+        m_total,
+        U=np.array([t.U for t in tasks], dtype=np.float64),
+    )
+    return dict(zip((t.task_id for t in tasks), alloc.m_i.tolist()))
+
+
+# Decreasing bin-packing heuristics for light tasks (capacity 1 per core).
+PLACEMENT_HEURISTICS = ("wfd", "ffd", "bfd", "nfd")
+
+
+def _leftmost_at_least(tree: list[float], size: int, u: float) -> int:
+    """Lowest leaf index with value >= u in a max segment tree (root 1, leaves at size)."""
+    j = 1
+    while j < size:
+        j = 2 * j if tree[2 * j] >= u else 2 * j + 1
+    return j - size
+
+
+def pack_decreasing(
+    util: np.ndarray,
+    n_cores: int,
+    heuristic: str = "wfd",
+    load0: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Place items on n_cores unit-capacity cores, largest first. PDF §5.
+
+    Inputs: utilization per item (n,), number of cores, heuristic: "wfd" worst fit (most
+    remaining capacity), "ffd" first fit (lowest core id that fits), "bfd" best fit
+    (least remaining capacity that fits), "nfd" next fit (stay on the current core, move
+    on when the item does not fit), optional initial load per core (default 0).
+    Outputs: (core per item (n,), -1 if n_cores == 0; load per core (n_cores,)).
+    Invariants: every item is placed when n_cores > 0; an item that fits nowhere goes to
+    the core with the most remaining capacity, as under WFD, so overloaded cores show up
+    in the per-core utilization check. Ties go to the lowest core id. WFD keeps a max-heap
+    of remaining capacity; the others a max segment tree over it (FFD search, fallback),
+    so WFD, FFD and NFD are O(n log m); BFD adds a sorted list (O(log m) search, O(m)
+    memmove insertion).
+    """
+    if heuristic not in PLACEMENT_HEURISTICS:
+        raise ValueError(f"unknown placement heuristic {heuristic!r}; use one of {PLACEMENT_HEURISTICS}")
+    util = np.asarray(util, dtype=np.float64)
+    if n_cores == 0:
+        return np.full(util.size, -1, dtype=np.int64), np.zeros(0)
+    core_of = [0] * util.size
+    load = [0.0] * n_cores if load0 is None else np.asarray(load0, dtype=np.float64).tolist()
+    order = np.argsort(-util, kind="stable").tolist()
+    ul = util.tolist()
+    if heuristic == "wfd":
+        heap = [(ld, c) for c, ld in enumerate(load)]  # (load, core): least loaded on top
+        heapq.heapify(heap)
+        for k in order:
+            ld, c = heap[0]
+            core_of[k] = c
+            load[c] = ld + ul[k]
+            heapq.heapreplace(heap, (load[c], c))
+        return np.asarray(core_of, dtype=np.int64), np.asarray(load)
+    room = [1.0 - ld for ld in load]
+    by_room = sorted((r, c) for c, r in enumerate(room))  # BFD: (remaining, core), sorted
+    # Max segment tree over remaining capacity: FFD search and the worst-fit fallback.
+    size = 1 << max(n_cores - 1, 0).bit_length()
+    tree = [-math.inf] * (2 * size)
+    tree[size : size + n_cores] = room
+    for j in range(size - 1, 0, -1):
+        tree[j] = max(tree[2 * j], tree[2 * j + 1])
+    current = 0
+    for k in order:
+        u = ul[k]
+        c = -1
+        if heuristic == "ffd":
+            if tree[1] >= u:
+                c = _leftmost_at_least(tree, size, u)
+        elif heuristic == "bfd":
+            pos = bisect.bisect_left(by_room, (u, -1))
+            if pos < n_cores:
+                c = by_room[pos][1]
+        else:  # nfd
+            while current < n_cores and room[current] < u:
+                current += 1
+            c = current if current < n_cores else -1
+        if c < 0:
+            c = _leftmost_at_least(tree, size, tree[1])  # most remaining capacity
+        if heuristic == "bfd":
+            del by_room[bisect.bisect_left(by_room, (room[c], c))]
+            bisect.insort(by_room, (room[c] - u, c))
+        room[c] -= u
+        load[c] += u
+        j = size + c
+        tree[j] = room[c]
+        while j > 1:
+            j >>= 1
+            tree[j] = max(tree[2 * j], tree[2 * j + 1])
+        core_of[k] = c
+    return np.asarray(core_of, dtype=np.int64), np.asarray(load)
+
+
+def light_task_placement_packed(
+    U: np.ndarray,
+    heavy: np.ndarray,
+    m_i: np.ndarray,
+    task_ids: tuple[str, ...] | list[str],
+    m_total: int,
+    heuristic: str = "wfd",
+) -> dict[int, list[str]]:
+    """Place light tasks on the cores heavy tasks leave over, from task arrays. PDF §5.
+
+    Inputs: per-task utilization (overflow) U, heavy mask and core count m_i (e.g.
+    FederatedAllocation.heavy / .m_i), task ids, m_total, heuristic (see pack_decreasing
+    / PLACEMENT_HEURISTICS).
+    Outputs: core_id -> list of task_ids assigned to that core (for light tasks); cores
+    are numbered 0 .. m_total - sum(heavy m_i) - 1 and may stay empty.
+    Invariants: heavy tasks already have exclusive cores; light tasks are taken by
+    utilization decreasing; each core lists its tasks in placement order. With no core
+    left the partition is empty and the light tasks stay unplaced.
+    """
+    heavy = np.asarray(heavy, dtype=bool)
+    remaining = max(0, m_total - int(np.asarray(m_i)[heavy].sum()))
+    partition: dict[int, list[str]] = {c: [] for c in range(remaining)}
+    if not remaining:
+        return partition
+    light = np.flatnonzero(~heavy)
+    util = np.asarray(U, dtype=np.float64)[light]
+    core_of, _ = pack_decreasing(util, remaining, heuristic)
+    for k in np.argsort(-util, kind="stable").tolist():
+        partition[int(core_of[k])].append(task_ids[light[k]])
+    return partition
+
+
+def light_task_placement(
+    task_set: TaskSet,
+    core_allocation: dict[str, int],
+    m_total: int,
+    heuristic: str = "wfd",
+) -> dict[int, list[str]]:
+    """Place light tasks on the cores heavy tasks leave over. PDF §5.
+
+    Inputs: task_set, core_allocation (task_id -> m_i), m_total, heuristic.
+    Outputs: as light_task_placement_packed, which does the work on the set's arrays.
     """
-    # TODO: for each task compute m_i; check sum <= m
-    alloc: dict[str, int] = {}
-    for t in task_set.tasks:
-        if t.is_heavy():
-            # m_i = ceil((C_i - L_i) / (D_i - L_i))
-            denom = t.D - t.L_overflow
-            num = t.C_overflow - t.L_overflow
-            m_i = max(1, math.ceil(num / denom)) if denom > 0 else 1
-        else:
-            m_i = 1
-        alloc[t.task_id] = m_i
-    return alloc
+    tasks = task_set.tasks
+    return light_task_placement_packed(
+        np.array([t.U for t in tasks], dtype=np.float64),
+        np.array([t.is_heavy() for t in tasks], dtype=bool),
+        np.array([core_allocation.get(t.task_id, 1) for t in tasks], dtype=np.int64),
+        [t.task_id for t in tasks],
+        m_total,
+        heuristic,
+    )
 
 
 def wfd_placement(
@@ -40,9 +246,7 @@ def wfd_placement(
 
     Inputs: task_set, core_allocation (task_id -> m_i), m_total.
     Outputs: core_id -> list of task_ids assigned to that core (for light tasks).
-    Invariants: heavy tasks already have exclusive cores; light tasks fill remaining.
+    Invariants: each light task, largest first, goes to the least loaded core (max-heap
+    of remaining capacity, O(n log m)); see light_task_placement.
     """
-    # TODO: sort light tasks by utilization decreasing; assign to core with least used capacity
-    used = sum(core_allocation.get(t.task_id, 1) for t in task_set.tasks)
-    remaining = max(0, m_total - used)
-    return {c: [] for c in range(remaining)}
+    return light_task_placement(task_set, core_allocation, m_total, "wfd")
@@ -2,7 +2,122 @@
 
 from __future__ import annotations
 
+import heapq
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
 from rts_sim.models import DAGTask, TaskSet
+from rts_sim.partition.federated import pack_decreasing
+from rts_sim.resources.access import AccessMatrix
+
+# Group index of tasks that access no resource ("remaining tasks", PDF §6).
+NO_GROUP = -1
+
+
+@dataclass
+class GroupAllocation:
+    """Grouping-by-resource partition of one task set onto m cores.
+
+    Invariants: group_of[i] is the resource task i accesses most, NO_GROUP without
+    accesses; order lists non-empty groups by utilization (overflow) descending;
+    group_cores[g] has ceil(util[g]) cores (at most m); task_core[i] is the single core
+    of an ungrouped task, -1 for grouped tasks; load[c] sums the utilization put on core
+    c (a group spreads its utilization evenly over its cores).
+    """
+
+    group_of: np.ndarray  # (n_tasks,) int64
+    util: np.ndarray  # (n_resources,) float64
+    order: list[int]
+    group_cores: dict[int, list[int]]
+    task_core: np.ndarray  # (n_tasks,) int64
+    load: np.ndarray  # (m,) float64
+
+    @property
+    def shared(self) -> bool:
+        """True if some core serves more than one group (not enough exclusive cores)."""
+        owner = [c for g in self.order for c in self.group_cores[g]]
+        return len(owner) != len(set(owner))
+
+    def clusters(self) -> tuple[np.ndarray, np.ndarray]:
+        """Engine clusters of the partition: (task_cluster (n_tasks,), cluster_cores).
+
+        Groups or ungrouped tasks that share a core are merged into one cluster over the
+        union of their cores (global EDF inside it), so clusters are disjoint core sets;
+        cores nobody uses are left out.
+        """
+        parent = list(range(self.load.size))
+
+        def find(c: int) -> int:
+            while parent[c] != c:
+                parent[c] = parent[parent[c]]
+                c = parent[c]
+            return c
+
+        for g in self.order:
+            first, *rest = self.group_cores[g]
+            for c in rest:
+                parent[find(c)] = find(first)
+        first_core = self.task_core.copy()
+        for i in np.flatnonzero(self.group_of != NO_GROUP):
+            first_core[i] = self.group_cores[int(self.group_of[i])][0]
+        roots = np.array([find(c) for c in range(self.load.size)], dtype=np.int64)
+        used = np.unique(roots[first_core])  # an unused core is its own, unused root
+        label = np.full(self.load.size, -1, dtype=np.int64)
+        label[used] = np.arange(used.size)
+        core_label = label[roots]
+        return core_label[first_core], np.bincount(core_label[core_label >= 0], minlength=used.size)
+
+
+def group_by_resource(
+    access: AccessMatrix,
+    U: np.ndarray,
+    m_total: int,
+) -> GroupAllocation:
+    """Group tasks by their most-requested resource and give every group cores. PDF §6.
+
+    Inputs: access matrix of the task set, utilization (overflow) per task, m.
+    Outputs: GroupAllocation.
+    Invariants: membership is one argmax over the matrix and group utilizations one
+    bincount; groups, largest first, take m_g = ceil(U_g) cores from a heap keyed by
+    remaining capacity, so untouched cores are used exclusively while there are enough
+    and otherwise the cores with most remaining capacity are shared (ties: lowest core
+    id). Ungrouped tasks go to the cores no group uses, by WFD, or to all cores by WFD on
+    top of the group load when every core is taken.
+    """
+    U = np.asarray(U, dtype=np.float64)
+    group_of = access.most_requested()
+    grouped = group_of != NO_GROUP
+    util = np.bincount(group_of[grouped], weights=U[grouped], minlength=access.n_resources)
+    nonempty = np.flatnonzero(np.bincount(group_of[grouped], minlength=access.n_resources))
+    order = nonempty[np.argsort(-util[nonempty], kind="stable")].tolist()
+
+    load = np.zeros(m_total)
+    heap = [(0.0, c) for c in range(m_total)]  # (load, core): most remaining capacity on top
+    group_cores: dict[int, list[int]] = {}
+    for g in order:
+        need = min(max(1, math.ceil(round(util[g], 9))), m_total)
+        cores = sorted(heapq.heappop(heap)[1] for _ in range(need))
+        share = util[g] / need if need else 0.0
+        for c in cores:
+            load[c] += share
+            heapq.heappush(heap, (load[c], c))
+        group_cores[g] = cores
+
+    task_core = np.full(access.n_tasks, -1, dtype=np.int64)
+    rest = np.flatnonzero(~grouped)
+    if rest.size and m_total:
+        used = {c for cs in group_cores.values() for c in cs}
+        free = [c for c in range(m_total) if c not in used]
+        if free:
+            core_of, free_load = pack_decreasing(U[rest], len(free), "wfd")
+            task_core[rest] = np.asarray(free)[core_of]
+            load[free] = free_load
+        else:
+            core_of, load = pack_decreasing(U[rest], m_total, "wfd", load0=load)
+            task_core[rest] = core_of
+    return GroupAllocation(group_of, util, order, group_cores, task_core, load)
 
 
 def grouping_by_most_requested_resource(
@@ -12,19 +127,20 @@ def grouping_by_most_requested_resource(
 ) -> list[list[str]]:
     """Group tasks by resource they access most. PDF §6.
 
-    Inputs: task_set, per-task per-resource access counts, n_resources.
-    Outputs: list of groups (each group = list of task_ids); sorted by group utilization descending.
+    Inputs: task_set, per-task per-resource access counts, n_resources (resources
+    "l1".."l<n>" come first, ties go to the lower one).
+    Outputs: list of groups (each group = list of task_ids); sorted by group utilization
+    descending, tasks without accesses last as one extra group.
     Invariants: each task in exactly one group; groups ordered by total utilization (overflow).
+    Thin wrapper over AccessMatrix.from_counts and group_by_resource's membership.
     """
-    # TODO: for each task find argmax resource; put task in that group; sort groups by U_sum
-    groups: list[list[str]] = [[] for _ in range(n_resources)]
-    for t in task_set.tasks:
-        counts = resource_request_counts.get(t.task_id, {})
-        if not counts:
-            groups[0].append(t.task_id)
-            continue
-        best = max(counts, key=counts.get)  # type: ignore
-        idx = int(best.replace("l", "")) - 1 if best.startswith("l") else 0
-        idx = max(0, min(idx, n_resources - 1))
-        groups[idx].append(t.task_id)
-    return [g for g in groups if g]
+    tasks = task_set.tasks
+    access = AccessMatrix.from_counts(
+        [t.task_id for t in tasks],
+        resource_request_counts,
+        tuple(f"l{q + 1}" for q in range(n_resources)),
+    )
+    alloc = group_by_resource(access, np.array([t.U for t in tasks], dtype=np.float64), 0)
+    groups = [[t.task_id for t, g in zip(tasks, alloc.group_of) if g == q] for q in alloc.order]
+    rest = [t.task_id for t, g in zip(tasks, alloc.group_of) if g == NO_GROUP]
+    return groups + ([rest] if rest else [])
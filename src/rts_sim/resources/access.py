@@ -0,0 +1,109 @@
+"""Task x resource access matrix, computed once per task set. PDF §3–4, §6.
+
+Inputs: a packed task set (critical segments) or per-task access counts.
+Outputs: AccessMatrix shared by grouping-by-resource, the blocking analysis and the lock
+simulator, so nobody re-walks the segments or re-parses resource ids.
+Invariants: row i = task i in packed order, column q = resource_ids[q]; dense, as
+n_resources <= 8 (a task set with r resources costs 16 * n_tasks * r bytes).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from rts_sim.packed import SEG_CRITICAL, PackedTaskSet
+
+
+@dataclass(frozen=True)
+class AccessMatrix:
+    """Per job of every task: accesses and critical-section time per resource.
+
+    Invariants: counts >= 0; cs_overflow[i, q] == 0 where counts[i, q] == 0; cs_max is
+    the longest single critical section (overflow length), 0 without accesses.
+    """
+
+    resource_ids: tuple[str, ...]
+    counts: np.ndarray  # (n_tasks, n_resources) int64
+    cs_overflow: np.ndarray  # (n_tasks, n_resources) float64, summed section lengths
+    cs_max: float = 0.0
+
+    @property
+    def n_tasks(self) -> int:
+        return self.counts.shape[0]
+
+    @property
+    def n_resources(self) -> int:
+        return self.counts.shape[1]
+
+    @property
+    def accessed(self) -> np.ndarray:
+        """(n_tasks, n_resources) bool: task uses the resource at all."""
+        return self.counts > 0
+
+    @classmethod
+    def from_coo(
+        cls,
+        task: np.ndarray,
+        resource: np.ndarray,
+        n_tasks: int,
+        resource_ids: tuple[str, ...],
+        length: np.ndarray | None = None,
+    ) -> AccessMatrix:
+        """Build from one entry per access: task index, resource index, optional length."""
+        task = np.asarray(task, dtype=np.int64)
+        resource = np.asarray(resource, dtype=np.int64)
+        shape = (n_tasks, len(resource_ids))
+        flat = task * shape[1] + resource
+        counts = np.bincount(flat, minlength=n_tasks * shape[1]).reshape(shape)
+        if length is None:
+            return cls(tuple(resource_ids), counts, np.zeros(shape))
+        length = np.asarray(length, dtype=np.float64)
+        cs = np.bincount(flat, weights=length, minlength=n_tasks * shape[1]).reshape(shape)
+        return cls(tuple(resource_ids), counts, cs, float(length.max(initial=0.0)))
+
+    @classmethod
+    def from_packed(cls, packed: PackedTaskSet) -> AccessMatrix:
+        """One pass over the critical segments of a packed task set."""
+        n_res = max(len(packed.resource_ids), int(packed.seg_resource.max(initial=-1)) + 1)
+        resource_ids = packed.resource_ids + tuple(f"r{q}" for q in range(len(packed.resource_ids), n_res))
+        crit = np.flatnonzero(packed.seg_kind == SEG_CRITICAL)
+        seg_node = np.repeat(np.arange(packed.n_nodes), np.diff(packed.seg_offsets))
+        return cls.from_coo(
+            packed.node_task()[seg_node[crit]],
+            packed.seg_resource[crit],
+            packed.n_tasks,
+            resource_ids,
+            packed.seg_length_overflow[crit],
+        )
+
+    @classmethod
+    def from_counts(
+        cls,
+        task_ids: list[str] | tuple[str, ...],
+        counts: dict[str, dict[str, int]],
+        resource_ids: tuple[str, ...] = (),
+    ) -> AccessMatrix:
+        """From task_id -> resource_id -> count; unknown resource ids get new columns."""
+        ids = list(resource_ids)
+        index = {r: q for q, r in enumerate(ids)}
+        rows, cols, vals = [], [], []
+        for i, tid in enumerate(task_ids):
+            for rid, c in counts.get(tid, {}).items():
+                if rid not in index:
+                    index[rid] = len(ids)
+                    ids.append(rid)
+                rows.append(i)
+                cols.append(index[rid])
+                vals.append(c)
+        m = np.zeros((len(task_ids), len(ids)), dtype=np.int64)
+        np.add.at(m, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), vals)
+        return cls(tuple(ids), m, np.zeros(m.shape))
+
+    def most_requested(self) -> np.ndarray:
+        """(n_tasks,) resource each task accesses most (lowest index on ties), -1 if none."""
+        if self.n_resources == 0:
+            return np.full(self.n_tasks, -1, dtype=np.int64)
+        best = self.counts.argmax(axis=1)
+        return np.where(self.counts.any(axis=1), best, -1)
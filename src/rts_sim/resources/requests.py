@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 from rts_sim.models import DAGTask, ResourceRequest, TaskSet
-from rts_sim.utils.seeds import get_rng
+from rts_sim.packed import PackedTaskSet
+from rts_sim.utils.seeds import SeedLike, get_rng
 
 
 def generate_resource_requests(
@@ -32,3 +35,30 @@ def generate_resource_requests(
             )
         )
     return requests
+
+
+def distribute_accesses_packed(
+    packed: PackedTaskSet,
+    requests: list[ResourceRequest],
+    seed: SeedLike = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Spread every resource's accesses over the nodes of a packed task set. PDF §3–4.
+
+    Inputs: packed task set, resource requests (resource q = requests[q]), seed/Generator.
+    Outputs: node -> resource-index CSR (access_offsets (n_nodes + 1,), access_resource),
+    as taken by assign_segments_packed.
+    Invariants: each access goes to a node with non-zero WCET, drawn uniformly with
+    replacement (a node may access one resource several times, one at a time); the order
+    of a node's accesses is random; no nodes with work means no accesses.
+    """
+    rng = get_rng(seed)
+    counts = np.array([r.total_access_count for r in requests], dtype=np.int64)
+    candidates = np.flatnonzero(packed.c_overflow > 0)
+    if candidates.size == 0:
+        counts[:] = 0
+    resource = rng.permutation(np.repeat(np.arange(len(requests), dtype=np.int32), counts))
+    node = rng.choice(candidates, size=resource.size) if resource.size else np.zeros(0, np.int64)
+    order = np.argsort(node, kind="stable")
+    access_offsets = np.zeros(packed.n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(node, minlength=packed.n_nodes), out=access_offsets[1:])
+    return access_offsets, resource[order]
@@ -2,8 +2,84 @@
 
 from __future__ import annotations
 
+import numpy as np
+
+from rts_sim.gen.utilization import rand_fixed_sum_batch
 from rts_sim.models import Node, Segment
-from rts_sim.utils.seeds import get_rng
+from rts_sim.packed import NO_RESOURCE, SEG_CRITICAL, SEG_NORMAL, PackedTaskSet
+from rts_sim.utils.seeds import SeedLike, get_rng
+
+
+def split_segments(
+    c_normal: np.ndarray,
+    c_overflow: np.ndarray,
+    access_offsets: np.ndarray,
+    access_resource: np.ndarray,
+    csp: np.ndarray | float,
+    seed: SeedLike = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Split every node into normal/critical segments in bulk. PDF §4.
+
+    Inputs: per-node WCETs (n,), node -> resource accesses as CSR (access_offsets (n+1,),
+    access_resource resource indices), CSP fraction per node (or scalar), seed / Generator.
+    Outputs: (seg_offsets, seg_kind, seg_length_normal, seg_length_overflow, seg_resource)
+    in the PackedTaskSet segment layout.
+    Invariants: a node with s accesses gets normal, critical, ..., critical, normal
+    (2s+1 segments); critical segments sum to csp * WCET and normal ones to the rest, each
+    split by RandFixedSum; one RandFixedSum call per distinct s covers all such nodes.
+    """
+    rng = get_rng(seed)
+    n = c_normal.shape[0]
+    s = np.diff(access_offsets)
+    csp_arr = np.broadcast_to(np.asarray(csp, dtype=np.float64), (n,))
+    n_seg = np.where(s > 0, 2 * s + 1, 1)
+    seg_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(n_seg, out=seg_offsets[1:])
+    total = int(seg_offsets[-1])
+    frac = np.ones(total)
+    kind = np.full(total, SEG_NORMAL, dtype=np.int8)
+    resource = np.full(total, NO_RESOURCE, dtype=np.int32)
+    for sv in np.unique(s[s > 0]).tolist():
+        nodes = np.flatnonzero(s == sv)
+        c = csp_arr[nodes, None]
+        crit = rand_fixed_sum_batch(sv, 1.0, nodes.size, 0.0, 1.0, seed=rng) * c
+        norm = rand_fixed_sum_batch(sv + 1, 1.0, nodes.size, 0.0, 1.0, seed=rng) * (1.0 - c)
+        base = seg_offsets[nodes, None]
+        crit_pos = base + 2 * np.arange(sv) + 1
+        frac[base + 2 * np.arange(sv + 1)] = norm
+        frac[crit_pos] = crit
+        kind[crit_pos] = SEG_CRITICAL
+        resource[crit_pos] = access_resource[access_offsets[nodes, None] + np.arange(sv)]
+    length_normal = frac * np.repeat(c_normal, n_seg)
+    length_overflow = frac * np.repeat(c_overflow, n_seg)
+    return seg_offsets, kind, length_normal, length_overflow, resource
+
+
+def assign_segments_packed(
+    packed: PackedTaskSet,
+    access_offsets: np.ndarray,
+    access_resource: np.ndarray,
+    resource_ids: tuple[str, ...],
+    csp: np.ndarray | float,
+    seed: SeedLike = None,
+) -> PackedTaskSet:
+    """Fill segments of every node of a packed task set at once. PDF §4.
+
+    Inputs: packed task set, node -> resource-index CSR over all its nodes, resource id
+    table, CSP fraction(s), seed/Generator.
+    Outputs: PackedTaskSet sharing all non-segment arrays with the input.
+    """
+    seg_offsets, kind, ln, lo, res = split_segments(
+        packed.c_normal, packed.c_overflow, access_offsets, access_resource, csp, seed
+    )
+    return packed.with_updates(
+        seg_offsets=seg_offsets,
+        seg_kind=kind,
+        seg_length_normal=ln,
+        seg_length_overflow=lo,
+        seg_resource=res,
+        resource_ids=tuple(resource_ids),
+    )
 
 
 def assign_segments_to_nodes(
@@ -18,22 +94,30 @@ def assign_segments_to_nodes(
     Outputs: new list of Node with segments filled (c_normal/c_overflow include segment lengths).
     Invariants: non-nested access; critical segment length = CSP% of node WCET; RandFixedSum for split.
     """
-    rng = get_rng(seed)
-    # TODO: for each node, build segments; critical segments use RandFixedSum for lengths
+    resource_ids = tuple(sorted({r for rs in resource_assignments.values() for r in rs}))
+    index = {r: q for q, r in enumerate(resource_ids)}
+    accesses = [resource_assignments.get(n.id, []) for n in nodes]
+    access_offsets = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum([len(a) for a in accesses], out=access_offsets[1:])
+    access_resource = np.array([index[r] for a in accesses for r in a], dtype=np.int32)
+    seg_offsets, kind, ln, lo, res = split_segments(
+        np.array([n.c_normal for n in nodes], dtype=np.float64),
+        np.array([n.c_overflow for n in nodes], dtype=np.float64),
+        access_offsets,
+        access_resource,
+        csp_fraction,
+        seed,
+    )
     out: list[Node] = []
-    for n in nodes:
-        segs: list[Segment] = []
-        # Placeholder: one normal segment
-        segs.append(
-            Segment(kind=Segment.Kind.NORMAL, length_normal=n.c_normal, length_overflow=n.c_overflow)
-        )
-        out.append(
-            Node(
-                id=n.id,
-                criticality=n.criticality,
-                c_normal=n.c_normal,
-                c_overflow=n.c_overflow,
-                segments=segs,
+    for k, n in enumerate(nodes):
+        segs = [
+            Segment(
+                kind=Segment.Kind.CRITICAL if kind[j] == SEG_CRITICAL else Segment.Kind.NORMAL,
+                length_normal=float(ln[j]),
+                length_overflow=float(lo[j]),
+                resource_id=None if res[j] == NO_RESOURCE else resource_ids[res[j]],
             )
-        )
+            for j in range(seg_offsets[k], seg_offsets[k + 1])
+        ]
+        out.append(n.model_copy(update={"segments": segs}))
     return out
@@ -1,12 +1,31 @@
 """Baseline EDF/CA-EDF and lock protocol simulation. PDF §5–6."""
 
+from rts_sim.sched.bounds import DECISION_TIERS, Verdict, analytic_verdict
 from rts_sim.sched.ca_edf import ca_edf_schedule
-from rts_sim.sched.lock import suspension_fifo_lock_hi_lo
-from rts_sim.sched.deadlock import deadlock_detect, drop_low_criticality_in_overload
+from rts_sim.sched.simulator import SimStats, Simulator, simulate
+from rts_sim.sched.lock import LockManager, LockStats, suspension_fifo_lock_hi_lo
+from rts_sim.sched.deadlock import (
+    ModeTables,
+    WaitForGraph,
+    deadlock_detect,
+    drop_low_criticality_in_overload,
+    drop_low_criticality_mask,
+)
 
 __all__ = [
+    "DECISION_TIERS",
+    "Verdict",
+    "analytic_verdict",
     "ca_edf_schedule",
+    "SimStats",
+    "Simulator",
+    "simulate",
+    "LockManager",
+    "LockStats",
     "suspension_fifo_lock_hi_lo",
+    "ModeTables",
+    "WaitForGraph",
     "deadlock_detect",
     "drop_low_criticality_in_overload",
+    "drop_low_criticality_mask",
 ]
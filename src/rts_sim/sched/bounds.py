@@ -0,0 +1,228 @@
+"""Analytical schedulability bounds: decide points without simulation. PDF §5–6.
+
+Tiers, cheapest first; the first one that is conclusive decides the point:
+1. federated: heavy tasks need more than m cores, light tasks have no core left, or a
+   mandatory critical path is longer than its deadline -> infeasible.
+2. utilization: mandatory demand exceeds the cores that serve it (all m cores, a heavy
+   task's m_i cores, one light core after WFD) -> infeasible (some job misses within
+   the first hyperperiod).
+
+Mandatory work is the normal-mode work that is never skipped: HI nodes only when LO
+nodes can be dropped (overruns switch to overflow mode), every node otherwise.
+3. response_time: blocking-aware response-time bounds hold for every task -> feasible.
+4. simulation: the bounds are inconclusive; the point needs the CA-EDF engine.
+
+The tier-3 bounds use overflow WCETs for every node (covers overruns; dropping LO work
+in overflow mode only removes work):
+- Locks are FIFO and non-nested, so a request on resource q waits for at most one
+  section of every other node that can be active meanwhile (ceil(D_j / T_j) jobs of
+  task j, as every earlier job met its deadline): the holder plus one queued request per
+  node. With HI-first queues this holds for HI requests only; a LO request can be
+  overtaken and is bounded by the critical-section demand on q in a window of D_k
+  (ceil(D_k / T_j) + 1 jobs of task j, one own job), which also caps the sum over all
+  requests of a job. Each section is inflated by the longest critical section of its
+  holder's cluster, because a holder may first wait for a core of that cluster running
+  another non-preemptive section. B_k sums the bound over the resources task k accesses.
+- Heavy task (m_i exclusive cores): R_k <= L_k + (C_k - L_k) / m_k + B_k.
+- Light task on a shared core: R_k <= C_k + B_k + sum over the other tasks j on the core
+  of (ceil(D_k / T_j) + 1) * C_j; all co-located work counts, as HI nodes go first
+  regardless of deadlines.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from rts_sim.gen.critical_path import critical_paths
+from rts_sim.packed import CRIT_HI, SEG_CRITICAL, PackedTaskSet
+from rts_sim.resources.access import AccessMatrix
+
+TIER_FEDERATED = 1
+TIER_UTILIZATION = 2
+TIER_RESPONSE_TIME = 3
+TIER_SIMULATION = 4
+DECISION_TIERS = {
+    TIER_FEDERATED: "federated",
+    TIER_UTILIZATION: "utilization",
+    TIER_RESPONSE_TIME: "response_time",
+    TIER_SIMULATION: "simulation",
+}
+
+# Slack for float comparisons of bounds against deadlines and core capacities.
+_EPS = 1e-9
+
+
+@dataclass
+class Verdict:
+    """Outcome of the analytical tiers for one task set.
+
+    Invariants: feasible is None iff tier == TIER_SIMULATION; fits is False iff the
+    allocation cannot be simulated on m cores; response_bound holds R_k / D_k per task
+    when tier 3 was evaluated, else it is empty.
+    """
+
+    tier: int
+    feasible: bool | None
+    reason: str = ""
+    fits: bool = True
+    response_bound: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    @property
+    def decided(self) -> bool:
+        return self.feasible is not None
+
+    def metrics(self) -> dict[str, float]:
+        rb = self.response_bound
+        return {
+            "decision_tier": float(self.tier),
+            "response_bound_max": float(rb.max()) if rb.size else 0.0,
+        }
+
+
+def mandatory_work(packed: PackedTaskSet, lo_droppable: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """Normal-mode (C_i, L_i) over the nodes that always execute (n_tasks,) each."""
+    if not lo_droppable:
+        return packed.C_normal, packed.L_normal
+    c = np.where(packed.criticality == CRIT_HI, packed.c_normal, 0.0)
+    C = np.bincount(packed.node_task(), weights=c, minlength=packed.n_tasks)
+    return C, critical_paths(packed.dag_batch(), c, c).L_normal
+
+
+def _window_jobs(packed: PackedTaskSet) -> np.ndarray:
+    """(n_tasks, n_tasks): jobs of task j that can overlap a window of D_k (k = row)."""
+    jobs = np.ceil(packed.D[:, None] / packed.T[None, :] - _EPS) + 1.0
+    np.fill_diagonal(jobs, 1.0)
+    return jobs
+
+
+def _critical_sections(packed: PackedTaskSet) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Node, resource and overflow length of every critical section."""
+    crit = np.flatnonzero(packed.seg_kind == SEG_CRITICAL)
+    seg_node = np.repeat(np.arange(packed.n_nodes), np.diff(packed.seg_offsets))
+    return seg_node[crit], packed.seg_resource[crit].astype(np.int64), packed.seg_length_overflow[crit]
+
+
+def blocking_bound(
+    packed: PackedTaskSet,
+    access: AccessMatrix | None = None,
+    cluster: np.ndarray | None = None,
+    hi_first: bool = True,
+) -> np.ndarray:
+    """Upper bound B_k on the time a job of task k spends waiting for locks (n_tasks,).
+
+    Inputs: packed task set, its access matrix (default: built from the packed set),
+    cluster label per task (tasks with equal labels share cores; default: one cluster),
+    whether HI waiters are served first (LockManager hi_first).
+    Outputs: per-request FIFO bound, capped by the window demand, summed over resources.
+    """
+    if access is None:
+        access = AccessMatrix.from_packed(packed)
+    if not access.counts.any():
+        return np.zeros(packed.n_tasks)
+    n_tasks, n_res = access.counts.shape
+    node_task = packed.node_task()
+    node, res, length = _critical_sections(packed)
+    sec = np.zeros((packed.n_nodes, n_res))
+    np.maximum.at(sec, (node, res), length)
+    # A holder may wait for a core of its cluster busy with another non-preemptive section.
+    task_max = np.zeros(n_tasks)
+    np.maximum.at(task_max, node_task, sec.max(axis=1, initial=0.0))
+    labels = np.zeros(n_tasks, dtype=np.int64) if cluster is None else np.unique(cluster, return_inverse=True)[1]
+    cluster_max = np.zeros(int(labels.max()) + 1)
+    np.maximum.at(cluster_max, labels, task_max)
+    inflate = cluster_max[labels]
+
+    demand = access.cs_overflow + access.counts * inflate[:, None]
+    window = _window_jobs(packed) @ demand  # (n_tasks, n_resources)
+
+    node_sec = np.where(sec > 0, sec + inflate[node_task][:, None], 0.0)
+    one_each = np.zeros((n_tasks, n_res))
+    np.add.at(one_each, node_task, node_sec)
+    concurrent = np.ceil(packed.D / packed.T - _EPS)
+    competing = concurrent @ one_each  # (n_resources,): one section per node that can be active
+    own = np.full((n_tasks, n_res), np.inf)
+    np.minimum.at(own, node_task, np.where(sec > 0, node_sec, np.inf))
+    per_request = competing[None, :] - np.where(np.isfinite(own), own, 0.0)
+
+    hi_counts = np.zeros((n_tasks, n_res))
+    np.add.at(hi_counts, (node_task[node], res), packed.criticality[node] == CRIT_HI)
+    lo_counts = access.counts - hi_counts
+    lo_wait = np.where(lo_counts > 0, window, 0.0) if hi_first else lo_counts * per_request
+    wait = np.minimum(window, hi_counts * per_request + lo_wait)
+    return (wait * access.accessed).sum(axis=1)
+
+
+def response_time_bounds(
+    packed: PackedTaskSet,
+    task_cores: np.ndarray,
+    light_core: np.ndarray,
+    access: AccessMatrix | None = None,
+    hi_first: bool = True,
+) -> np.ndarray:
+    """Response-time upper bound per task (n_tasks,). See the module docstring.
+
+    Inputs: packed task set, m_i per task, shared light core per task (-1 for tasks with
+    an exclusive cluster), optional access matrix, lock queue order.
+    """
+    cluster = np.where(light_core >= 0, light_core, -1 - np.arange(packed.n_tasks))
+    B = blocking_bound(packed, access, cluster, hi_first)
+    C, L = packed.C_overflow, packed.L_overflow
+    R = L + (C - L) / np.maximum(task_cores, 1) + B
+    light = np.flatnonzero(light_core >= 0)
+    if light.size:
+        jobs = _window_jobs(packed)[np.ix_(light, light)]
+        same = light_core[light][:, None] == light_core[light][None, :]
+        np.fill_diagonal(same, False)
+        R[light] = C[light] + B[light] + (jobs * same) @ C[light]
+    return R
+
+
+def analytic_verdict(
+    packed: PackedTaskSet,
+    m_total: int,
+    core_allocation: dict[str, int],
+    partition: dict[int, list[str]],
+    lo_droppable: bool = True,
+    access: AccessMatrix | None = None,
+    hi_first: bool = True,
+) -> Verdict:
+    """Run the analytical tiers on a federated allocation and WFD partition. PDF §5–6.
+
+    Inputs: packed task set, total cores m, task_id -> m_i (federated_core_allocation),
+    core_id -> light task ids (wfd_placement), whether the run can drop LO nodes (False
+    without overruns), optional access matrix, lock queue order (LockManager hi_first).
+    Outputs: Verdict; tier TIER_SIMULATION (feasible None) when no bound is conclusive.
+    Invariants: infeasible verdicts only use necessary conditions on mandatory work and
+    feasible verdicts only sufficient bounds on overflow-mode work, so a decided verdict
+    agrees with a simulation over at least one hyperperiod.
+    """
+    m_i = np.array([core_allocation.get(t, 1) for t in packed.task_ids], dtype=np.int64)
+    heavy = packed.U_overflow > 1.0
+    if int(m_i[heavy].sum()) > m_total:
+        return Verdict(TIER_FEDERATED, False, "heavy tasks need more than m cores", fits=False)
+    index = packed.task_index()
+    light_core = np.full(packed.n_tasks, -1, dtype=np.int64)
+    for core, tids in partition.items():
+        light_core[[index[t] for t in tids]] = core
+    if (light_core[~heavy] < 0).any():
+        return Verdict(TIER_FEDERATED, False, "no core left for light tasks", fits=False)
+    C, L = mandatory_work(packed, lo_droppable)
+    if (L > packed.D + _EPS).any():
+        return Verdict(TIER_FEDERATED, False, "critical path longer than deadline")
+
+    U = C / packed.T
+    if U.sum() > m_total + _EPS:
+        return Verdict(TIER_UTILIZATION, False, "total utilization exceeds m")
+    if (U[heavy] > m_i[heavy] + _EPS).any():
+        return Verdict(TIER_UTILIZATION, False, "heavy task utilization exceeds its cores")
+    placed = light_core >= 0
+    core_load = np.bincount(light_core[placed], weights=U[placed], minlength=max(len(partition), 1))
+    if (core_load > 1.0 + _EPS).any():
+        return Verdict(TIER_UTILIZATION, False, "light core utilization exceeds 1")
+
+    bound = response_time_bounds(packed, np.where(heavy, m_i, 1), light_core, access, hi_first) / packed.D
+    if (bound <= 1.0 + _EPS).all():
+        return Verdict(TIER_RESPONSE_TIME, True, "response-time bounds hold", response_bound=bound)
+    return Verdict(TIER_SIMULATION, None, "bounds inconclusive", response_bound=bound)
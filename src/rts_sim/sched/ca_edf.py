@@ -2,25 +2,90 @@
 
 from __future__ import annotations
 
+import numpy as np
+
 from rts_sim.models import SimulationResult, TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.resources.access import AccessMatrix
+from rts_sim.sched.simulator import Simulator, TracingSimulator
+from rts_sim.sched.trace import TraceRecorder
+from rts_sim.utils.seeds import SeedLike
+
+
+def build_clusters(
+    task_ids: tuple[str, ...],
+    core_allocation: dict[str, int],
+    partition: dict[int, list[str]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Clusters for the engine: one per partition core (light tasks), one per other task.
+
+    Inputs: task ids in packed order, task_id -> m_i, core_id -> light task ids.
+    Outputs: (task_cluster (n_tasks,), cluster_cores (n_clusters,)).
+    Invariants: a task listed in the partition shares its single core with the other
+    tasks of that core; every other task gets an exclusive cluster of m_i cores.
+    """
+    task_cluster = np.full(len(task_ids), -1, dtype=np.int64)
+    index = {tid: i for i, tid in enumerate(task_ids)}
+    cores: list[int] = []
+    for core in sorted(partition):
+        for tid in partition[core]:
+            task_cluster[index[tid]] = len(cores)
+        cores.append(1)
+    for i, tid in enumerate(task_ids):
+        if task_cluster[i] < 0:
+            task_cluster[i] = len(cores)
+            cores.append(max(1, int(core_allocation.get(tid, 1))))
+    return task_cluster, np.asarray(cores, dtype=np.int64)
 
 
 def ca_edf_schedule(
-    task_set: TaskSet,
+    task_set: TaskSet | PackedTaskSet,
     core_allocation: dict[str, int],
     partition: dict[int, list[str]],
+    horizon: float | None = None,
+    overrun_prob: float = 0.0,
+    drop_lo: bool = True,
+    seed: SeedLike = None,
+    stop_at_first_miss: bool = False,
+    lock_hi_first: bool = True,
+    deadlock_drop: bool = True,
+    access: AccessMatrix | None = None,
+    trace: TraceRecorder | None = None,
 ) -> SimulationResult:
     """Simulate CA-EDF scheduling. PDF §5–6.
 
-    Inputs: task_set, core_allocation (task_id -> m_i), partition (core_id -> task_ids).
-    Outputs: SimulationResult with feasible flag and metrics.
+    Inputs: task_set (pydantic or packed), core_allocation (task_id -> m_i), partition
+    (core_id -> light task_ids), simulation horizon, per-job overrun probability, whether
+    overflow mode drops LO nodes, seed, stop_at_first_miss (feasibility verdict only:
+    the metrics then cover the run up to the first miss), lock_hi_first (HI/LO lock
+    queues; False: one FIFO per resource), deadlock_drop (drop lock-waiting LO nodes of
+    jobs that block each other in a cycle), optional access matrix of the set, optional
+    trace recorder (sched.trace) that receives the schedule.
+    Outputs: SimulationResult; feasible iff no job missed its deadline; metrics from
+    SimStats.metrics (deadline misses, response times, mode switches, locks).
+    The horizon defaults to a bounded number of hyperperiods; overruns repeat every
+    hyperperiod, so a run stops early once the state at a hyperperiod boundary repeats.
     Invariants: mixed-criticality; overflow mode triggers HI execution times.
     """
-    # TODO: simulate EDF with criticality awareness; record schedulability and metrics
+    packed = task_set if isinstance(task_set, PackedTaskSet) else PackedTaskSet.from_task_set(task_set)
+    task_cluster, cluster_cores = build_clusters(packed.task_ids, core_allocation, partition)
+    if trace is None:
+        sim = Simulator(packed, task_cluster, cluster_cores, access)
+    else:
+        sim = TracingSimulator(packed, task_cluster, cluster_cores, access, trace)
+    stats = sim.run(
+        horizon=horizon,
+        overrun_prob=overrun_prob,
+        drop_lo=drop_lo,
+        seed=seed,
+        stop_at_first_miss=stop_at_first_miss,
+        lock_hi_first=lock_hi_first,
+        deadlock_drop=deadlock_drop,
+    )
     return SimulationResult(
         task_set_id="",
-        feasible=True,
+        feasible=stats.feasible,
         core_allocation=core_allocation,
         group_allocation={},
-        metrics={},
+        metrics=stats.metrics(),
     )
@@ -2,36 +2,212 @@
 
 from __future__ import annotations
 
-from rts_sim.models import TaskSet
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+import numpy as np
+
+from rts_sim.gen.critical_path import MODE_NORMAL, MODE_OVERFLOW
+from rts_sim.models import Criticality, TaskSet
+from rts_sim.packed import CRIT_HI, PackedTaskSet
+
+Owner = Hashable
+Resource = Hashable
+
+
+class WaitForGraph:
+    """Incremental wait-for graph over lock owners (tasks or node runs). PDF §6.
+
+    Inputs: hold / release / wait / unwait updates as they happen; optional on_deadlock
+    callback, called with the owners of every new cycle (in wait order).
+    Outputs: each update that can close a cycle returns it (or None).
+    Invariants: an owner waits for at most one resource at a time (a new wait replaces
+    the previous one), so every owner has at most one outgoing edge and the graph is
+    functional; an owner waiting for a resource it holds itself adds no edge. Owners
+    must be the units that actually block: with non-nested access a waiting node run
+    holds nothing, so a graph over runs has no cycles, while one over whole jobs would
+    report cycles between holders that always finish. A cycle check walks only the
+    chain starting at the changed owner: O(chain length) per update, independent of the
+    number of owners. The walk stops at a revisited owner, so cycles left unresolved by
+    the callback are harmless.
+    """
+
+    def __init__(self, on_deadlock: Callable[[list[Owner]], None] | None = None) -> None:
+        self.on_deadlock = on_deadlock
+        self._holder: dict[Resource, Owner] = {}
+        self._waits: dict[Owner, Resource] = {}
+        self.checks = 0
+        self.steps = 0  # chain hops over all checks
+        self.deadlocks = 0
+
+    def holder(self, res: Resource) -> Owner | None:
+        return self._holder.get(res)
+
+    def waits_for(self, owner: Owner) -> Resource | None:
+        return self._waits.get(owner)
+
+    def hold(self, owner: Owner, res: Resource) -> list[Owner] | None:
+        """`owner` now holds `res`; waiters of res now point at it."""
+        self._holder[res] = owner
+        return self._check(owner, target=res)
+
+    def release(self, res: Resource) -> None:
+        self._holder.pop(res, None)
+
+    def wait(self, owner: Owner, res: Resource) -> list[Owner] | None:
+        """`owner` blocks on `res` (replacing any earlier wait of the owner)."""
+        self._waits[owner] = res
+        return self._check(owner, target=None)
+
+    def unwait(self, owner: Owner, res: Resource) -> None:
+        """`owner` stopped waiting for `res` (granted or withdrawn)."""
+        if self._waits.get(owner) == res:
+            del self._waits[owner]
+
+    def _check(self, start: Owner, target: Resource | None) -> list[Owner] | None:
+        """Walk start -> holder(waits_for(start)) -> ...; a cycle closes when the walk
+        returns to start (target None) or meets an owner waiting for `target`."""
+        self.checks += 1
+        chain: list[Owner] = []
+        seen: set[Owner] = set()
+        x: Owner | None = start
+        while x is not None and x not in seen:
+            if target is not None and self.waits_for(x) == target and chain:
+                return self._found(chain + [x])
+            seen.add(x)
+            chain.append(x)
+            res = self.waits_for(x)
+            nxt = None if res is None else self._holder.get(res)
+            self.steps += 1
+            if nxt == x:
+                return None  # waits on a resource it holds itself
+            if nxt == start and target is None:
+                return self._found(chain)
+            x = nxt
+        return None
+
+    def _found(self, cycle: list[Owner]) -> list[Owner]:
+        self.deadlocks += 1
+        if self.on_deadlock is not None:
+            self.on_deadlock(cycle)
+        return cycle
 
 
 def deadlock_detect(
     task_set: TaskSet,
     resource_hold: dict[str, str],  # task_id -> resource_id
     resource_wait: dict[str, str],  # task_id -> resource_id
+    on_deadlock: Callable[[list[str]], None] | None = None,
 ) -> bool:
     """Detect deadlock (cycle in resource wait graph). PDF §6.
 
-    Inputs: task_set, who holds which resource, who waits for which resource.
+    Inputs: task_set, who holds which resource, who waits for which resource, optional
+    callback for every cycle found (e.g. drop_low_criticality_in_overload).
     Outputs: True if deadlock detected.
-    Invariants: non-nested; one resource per task at a time.
+    Invariants: non-nested; one resource per task at a time. Builds the graph through
+    WaitForGraph updates; simulations should keep one WaitForGraph and update it.
     """
-    # TODO: build wait graph; detect cycle
-    return False
+    g = WaitForGraph(on_deadlock)
+    for task_id, res in resource_hold.items():
+        g.hold(task_id, res)
+    for task_id, res in resource_wait.items():
+        g.wait(task_id, res)
+    return g.deadlocks > 0
 
 
 def drop_low_criticality_in_overload(
     task_set: TaskSet,
     overload_flag: bool,
+    task_ids: set[str] | None = None,
 ) -> TaskSet:
     """In overload, drop LO-criticality DAGs to recover. PDF §6.
 
-    Inputs: task_set, whether system is in overload.
+    Inputs: task_set, whether system is in overload, optional task ids to restrict the
+    drop to (e.g. the tasks of a deadlock cycle; default all).
     Outputs: possibly reduced TaskSet (only HI tasks if overload).
-    Invariants: only drop when overload; prefer HI tasks.
+    Invariants: only drop when overload; prefer HI tasks. LO nodes of affected tasks keep
+    their place in the DAG (precedence is preserved) but lose their execution and
+    resource accesses; affected tasks without any HI node are removed. Builds a new
+    TaskSet; packed sets and the simulator use ModeTables / drop_low_criticality_mask.
     """
-    # TODO: if overload, filter to HI-only tasks (e.g. by graph criticality)
     if not overload_flag:
         return task_set
-    # Placeholder: return as-is
-    return task_set
+    tasks = []
+    for t in task_set.tasks:
+        if task_ids is not None and t.task_id not in task_ids:
+            tasks.append(t)
+            continue
+        if not any(n.criticality == Criticality.HI for n in t.nodes):
+            continue
+        nodes = [
+            n
+            if n.criticality == Criticality.HI
+            else n.model_copy(update={"c_normal": 0.0, "c_overflow": 0.0, "segments": []})
+            for n in t.nodes
+        ]
+        tasks.append(t.model_copy(update={"nodes": nodes}))
+    return TaskSet(tasks=tasks)
+
+
+@dataclass(frozen=True)
+class ModeTables:
+    """Per-mode node and segment tables of a packed task set. PDF §6.
+
+    Inputs: PackedTaskSet (from_packed).
+    Outputs: node_active[mode] (node executes in that mode; the overflow row is the HI
+    mask, so LO nodes are dropped), task_active[mode] (task has an active node),
+    wcet[mode] and seg_length[mode] (execution of an overrunning HI node).
+    Invariants: arrays indexed by mode (MODE_NORMAL, MODE_OVERFLOW) on axis 0 and built
+    once; entering overflow mode and reverting are row selections (views), so a mode
+    switch neither filters nor copies the task set. The overflow rows are at least the
+    normal ones (an overflow length below the normal one never shortens execution).
+    """
+
+    node_task: np.ndarray  # (n_nodes,) int64
+    node_active: np.ndarray  # (2, n_nodes) bool
+    task_active: np.ndarray  # (2, n_tasks) bool
+    wcet: np.ndarray  # (2, n_nodes) float64
+    seg_length: np.ndarray  # (2, n_segments) float64
+
+    def __post_init__(self) -> None:
+        for a in (self.node_active, self.task_active, self.wcet, self.seg_length):
+            a.setflags(write=False)  # rows are handed out as shared views
+
+    @classmethod
+    def from_packed(cls, packed: PackedTaskSet) -> ModeTables:
+        hi = packed.criticality == CRIT_HI
+        node_task = packed.node_task()
+        task_hi = np.bincount(node_task[hi], minlength=packed.n_tasks) > 0
+        return cls(
+            node_task=node_task,
+            node_active=np.stack([np.ones(packed.n_nodes, dtype=bool), hi]),
+            task_active=np.stack([np.ones(packed.n_tasks, dtype=bool), task_hi]),
+            wcet=np.stack([packed.c_normal, np.maximum(packed.c_normal, packed.c_overflow)]),
+            seg_length=np.stack(
+                [packed.seg_length_normal, np.maximum(packed.seg_length_normal, packed.seg_length_overflow)]
+            ),
+        )
+
+
+def drop_low_criticality_mask(
+    tables: ModeTables,
+    overload_flag: bool,
+    task_mask: np.ndarray | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Active-node mask after dropping LO-criticality work in overload. PDF §6.
+
+    Inputs: mode tables of the packed set, whether the system is in overload, optional
+    (n_tasks,) bool mask restricting the drop (e.g. the tasks of a deadlock cycle),
+    optional (n_nodes,) bool buffer for the restricted mask.
+    Outputs: (n_nodes,) bool, True = node keeps executing.
+    Invariants: mask counterpart of drop_low_criticality_in_overload. Without a
+    restriction the result is a read-only row of tables.node_active (no allocation);
+    with one it is written into `out` when given.
+    """
+    if not overload_flag:
+        return tables.node_active[MODE_NORMAL]
+    if task_mask is None:
+        return tables.node_active[MODE_OVERFLOW]
+    spared = ~np.asarray(task_mask, dtype=bool)[tables.node_task]
+    return np.logical_or(tables.node_active[MODE_OVERFLOW], spared, out=out)
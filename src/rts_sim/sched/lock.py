@@ -2,17 +2,178 @@
 
 from __future__ import annotations
 
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from typing import Hashable, Iterator, Sequence
+
 from rts_sim.models import Criticality
 
 
+@dataclass
+class LockStats:
+    """Per-resource lock counters (lists indexed by resource).
+
+    Invariants: waits <= requests; acquisitions <= requests; blocking times are summed
+    from request to grant over the requests that had to wait.
+    """
+
+    requests: list[int]
+    acquisitions: list[int]
+    waits: list[int]
+    withdrawn: list[int]
+    max_queue_depth: list[int]
+    blocking_hi: list[float]
+    blocking_lo: list[float]
+
+    @classmethod
+    def zeros(cls, n: int) -> LockStats:
+        return cls(*([0] * n for _ in range(5)), [0.0] * n, [0.0] * n)
+
+    def totals(self) -> dict[str, float]:
+        """Counters summed over resources (queue depth: maximum)."""
+        return {
+            "lock_requests": float(sum(self.requests)),
+            "lock_waits": float(sum(self.waits)),
+            "lock_withdrawn": float(sum(self.withdrawn)),
+            "lock_max_queue_depth": float(max(self.max_queue_depth, default=0)),
+            "lock_blocking_hi": sum(self.blocking_hi),
+            "lock_blocking_lo": sum(self.blocking_lo),
+        }
+
+
+class _Waiter:
+    __slots__ = ("owner", "since", "hi", "active")
+
+    def __init__(self, owner: Hashable, since: float, hi: bool):
+        self.owner = owner
+        self.since = since
+        self.hi = hi
+        self.active = True
+
+
+class LockManager:
+    """FIFO lock state for every resource, with a HI and a LO queue each. PDF §6.
+
+    Inputs: number of resources; hi_first (HI waiters are served before LO waiters;
+    False gives one plain FIFO over both).
+    Outputs: request / release / withdraw; holder and waiting views; LockStats.
+    Invariants: non-nested access (an owner waits for or holds at most one resource);
+    FIFO within each queue; request, grant and release are O(1) and withdraw is O(1)
+    (lazy: withdrawn entries are skipped when they reach the queue head). A requester
+    that has to wait is suspended by the caller, which frees its core.
+    """
+
+    def __init__(self, n_resources: int, hi_first: bool = True) -> None:
+        self.n_resources = n_resources
+        self.hi_first = hi_first
+        self._holder: list[Hashable | None] = [None] * n_resources
+        self._queues: list[tuple[deque[_Waiter], deque[_Waiter]]] = [
+            (deque(), deque()) for _ in range(n_resources)
+        ]
+        self._depth = [0] * n_resources
+        self._waiting: dict[Hashable, tuple[int, _Waiter]] = {}  # owner -> (resource, entry)
+        self.stats = LockStats.zeros(n_resources)
+
+    def holder(self, res: int) -> Hashable | None:
+        return self._holder[res]
+
+    def queue_depth(self, res: int) -> int:
+        return self._depth[res]
+
+    def waiting(self, res: int) -> Iterator[Hashable]:
+        """Waiting owners in grant order."""
+        for q in self._queues[res]:
+            for w in q:
+                if w.active:
+                    yield w.owner
+
+    def is_waiting(self, owner: Hashable) -> bool:
+        return owner in self._waiting
+
+    def request(self, res: int, owner: Hashable, hi: bool, t: float) -> bool:
+        """Ask for `res` at time t; True if granted now, else the owner is queued."""
+        st = self.stats
+        st.requests[res] += 1
+        if self._holder[res] is None:
+            self._holder[res] = owner
+            st.acquisitions[res] += 1
+            return True
+        w = _Waiter(owner, t, hi)
+        # With hi_first=False everyone shares the HI deque, i.e. one FIFO.
+        self._queues[res][0 if hi or not self.hi_first else 1].append(w)
+        self._waiting[owner] = (res, w)
+        self._depth[res] += 1
+        st.waits[res] += 1
+        if self._depth[res] > st.max_queue_depth[res]:
+            st.max_queue_depth[res] = self._depth[res]
+        return False
+
+    def release(self, res: int, t: float) -> Hashable | None:
+        """Release `res`; the next waiter (HI queue first) becomes holder and is returned."""
+        hi_q, lo_q = self._queues[res]
+        for q in (hi_q, lo_q):
+            while q:
+                w = q.popleft()
+                if not w.active:
+                    continue
+                del self._waiting[w.owner]
+                self._depth[res] -= 1
+                self._holder[res] = w.owner
+                st = self.stats
+                st.acquisitions[res] += 1
+                if w.hi:
+                    st.blocking_hi[res] += t - w.since
+                else:
+                    st.blocking_lo[res] += t - w.since
+                return w.owner
+        self._holder[res] = None
+        return None
+
+    def withdraw(self, owner: Hashable) -> bool:
+        """Remove a waiting owner (e.g. a dropped LO node); False if it was not waiting."""
+        entry = self._waiting.pop(owner, None)
+        if entry is None:
+            return False
+        res, w = entry
+        w.active = False
+        self._depth[res] -= 1
+        self.stats.withdrawn[res] += 1
+        return True
+
+
 def suspension_fifo_lock_hi_lo(
-    requests: list[tuple[str, str, Criticality]],  # (task_id, resource_id, criticality)
+    requests: Sequence[tuple],  # (task_id, resource_id, criticality[, arrival, hold])
+    hi_first: bool = True,
 ) -> list[tuple[str, str, float, float]]:
     """Simulate FIFO lock with HI/LO queues per resource. PDF §6.
 
-    Inputs: list of (task_id, resource_id, criticality) request events.
-    Outputs: list of (task_id, resource_id, acquire_time, release_time) or similar.
+    Inputs: request events (task_id, resource_id, criticality) with optional arrival time
+    (default 0.0, list order breaks ties) and hold time (default 1.0).
+    Outputs: list of (task_id, resource_id, acquire_time, release_time) in grant order.
     Invariants: non-nested access; FIFO within HI and within LO; HI has priority over LO.
     """
-    # TODO: two queues per resource (HI, LO); serve HI first, then LO FIFO; suspension during wait
-    return []
+    resource_ids = sorted({r[1] for r in requests})
+    index = {rid: q for q, rid in enumerate(resource_ids)}
+    locks = LockManager(len(resource_ids), hi_first=hi_first)
+    # Events: (time, kind, request index); releases (kind 0) before arrivals (1).
+    events = [(float(r[3]) if len(r) > 3 else 0.0, 1, k) for k, r in enumerate(requests)]
+    heapq.heapify(events)
+    hold = [float(r[4]) if len(r) > 4 else 1.0 for r in requests]
+    out: list[tuple[str, str, float, float]] = []
+
+    def grant(k: int, t: float) -> None:
+        out.append((requests[k][0], requests[k][1], t, t + hold[k]))
+        heapq.heappush(events, (t + hold[k], 0, k))
+
+    while events:
+        t, kind, k = heapq.heappop(events)
+        res = index[requests[k][1]]
+        if kind == 1:
+            if locks.request(res, k, Criticality(requests[k][2]) == Criticality.HI, t):
+                grant(k, t)
+        else:
+            nxt = locks.release(res, t)
+            if nxt is not None:
+                grant(nxt, t)
+    return out
@@ -0,0 +1,814 @@
+"""Event-driven CA-EDF simulation of DAG jobs on core clusters. PDF §5–6.
+
+Inputs: PackedTaskSet, task -> cluster map, cores per cluster, horizon and overrun model.
+Outputs: SimStats (deadline misses, response times, mode switches, lock contention).
+Invariants: time advances from event to event (binary heap keyed by time, event kind,
+sequence), so cost is O(log n) per event and independent of the time resolution.
+
+Horizon: releases are synchronous, so the schedule is driven by the hyperperiod
+H = lcm(T_i). The default horizon is DEFAULT_HYPERPERIODS * H (capped at
+MAX_HORIZON_PERIODS * max T_i for awkward periods). Overruns are drawn once per
+(task, job index mod H / T_i), so the overrun pattern repeats every hyperperiod and the
+whole run is periodic in H: the state (pending work, locks, mode) is fingerprinted at
+every boundary k*H and the run stops once a fingerprint repeats, since everything after
+it repeats too. stop_at_first_miss ends the run at the first deadline miss when only a
+feasibility verdict is needed.
+
+Model:
+- Task i releases a job at 0, T_i, 2T_i, ... below the horizon; deadline = release + D_i.
+  A node becomes ready when all its predecessors finished; zero-work nodes (source,
+  sink) finish instantly.
+- Every cluster runs global EDF over its cores with criticality first: ready nodes are
+  ordered by (rank, absolute deadline), rank 0 = holds a lock, 1 = HI node, 2 = LO node.
+  Heavy tasks own a cluster of m_i cores; light tasks share single-core clusters.
+- A node executes its segments in order (a node without segments is one normal segment
+  of c_normal). Critical segments take the segment's resource first through a
+  LockManager (FIFO, HI queue before LO queue); a node that finds it busy suspends
+  (frees its core) until granted. Critical segments run non-preemptively; normal
+  segments can be preempted.
+- A job overruns with probability overrun_prob (drawn per job of the first hyperperiod,
+  then repeated with period H): its HI nodes then run every segment to
+  length_overflow instead of length_normal. The first overrun past a normal budget
+  switches the system to overflow mode; with drop_lo, LO nodes that are ready, waiting
+  for a lock or released later are skipped (counted as dropped) until every cluster is
+  idle, which switches back to normal mode.
+- Mode state is a pair of preallocated tables (ModeTables): segment lengths and the
+  active-node mask, one row per mode. A mode change only swaps which row the engine
+  reads, both ways in O(1); nothing is filtered or copied. In overflow mode an
+  overrunning HI node starts each segment with its overflow length directly, in normal
+  mode it runs the normal budget first and is extended when that is exhausted.
+- Lock ownership is mirrored per node run in an incremental WaitForGraph. Access is
+  non-nested, so a run waiting for a lock holds none and every holder runs its section
+  to the end: wait chains have length one and no cycle can form (two nodes of one job
+  holding and waiting for different resources do not block each other). A cycle would
+  be counted and, with deadlock_drop, the lock-waiting LO nodes of the jobs in it
+  dropped through drop_low_criticality_mask right after the event that closed it.
+
+Tracing: TracingSimulator overrides the engine's hook methods (core start/stop, locks,
+drops, mode changes, releases, completions) to append records to a TraceRecorder; the
+plain Simulator contains no tracing code, so untraced runs cost exactly what they did.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from fractions import Fraction
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from rts_sim.packed import CRIT_HI, SEG_CRITICAL, PackedTaskSet
+from rts_sim.resources.access import AccessMatrix
+from rts_sim.sched.deadlock import ModeTables, WaitForGraph, drop_low_criticality_mask
+from rts_sim.sched.lock import LockManager, LockStats
+from rts_sim.sched.trace import (
+    TR_DROP,
+    TR_JOB_DONE,
+    TR_LOCK_GRANT,
+    TR_LOCK_WAIT,
+    TR_MODE,
+    TR_PREEMPT,
+    TR_RELEASE,
+    TR_START,
+    TR_STOP,
+    TraceRecorder,
+)
+from rts_sim.utils.seeds import SeedLike, get_rng
+
+# Event kinds, in processing order for events at the same instant: work finishing frees
+# cores and locks before lock hand-over, mode changes, new releases and deadline checks.
+EV_SEG_END = 0
+EV_LOCK_GRANT = 1
+EV_MODE_SWITCH = 2
+EV_BOUNDARY = 3  # hyperperiod boundary: fingerprint before the releases at that instant
+EV_RELEASE = 4
+EV_DEADLINE = 5
+
+MODE_NORMAL = 0
+MODE_OVERFLOW = 1
+
+RANK_LOCKED = 0
+RANK_HI = 1
+RANK_LO = 2
+
+# Default horizon in hyperperiods, and its cap in multiples of the longest period.
+DEFAULT_HYPERPERIODS = 10
+MAX_HORIZON_PERIODS = 1000
+# Decimal places kept when fingerprinting remaining execution times (float drift).
+_FP_DIGITS = 6
+
+# Why a run ended before its horizon (SimStats.stop_reason).
+STOP_HORIZON = "horizon"
+STOP_STEADY_STATE = "steady_state"
+STOP_FIRST_MISS = "first_miss"
+
+
+def hyperperiod(periods: list[float] | np.ndarray) -> float:
+    """lcm of the periods; non-integer periods are taken as exact fractions. PDF §1."""
+    h = Fraction(1)
+    for p in periods:
+        f = Fraction(float(p)).limit_denominator(1_000_000)
+        if f <= 0:
+            raise ValueError(f"period must be > 0, got {p}")
+        h = Fraction(
+            h.numerator * f.numerator // math.gcd(h.numerator, f.numerator),
+            math.gcd(h.denominator, f.denominator),
+        )
+    return float(h)
+
+
+@dataclass
+class SimStats:
+    """Counters and response times of one simulation run.
+
+    Invariants: deadline_misses <= jobs_released; response_times holds one entry per
+    finished job, in completion order.
+    """
+
+    horizon: float = 0.0
+    hyperperiod: float = 0.0
+    end_time: float = 0.0  # time of the last processed event
+    stop_reason: str = STOP_HORIZON
+    events: int = 0
+    jobs_released: int = 0
+    jobs_completed: int = 0
+    deadline_misses: int = 0
+    first_miss_time: float = math.inf
+    response_times: list[float] = field(default_factory=list)
+    max_normalized_response: float = 0.0  # max R / D over finished jobs
+    preemptions: int = 0
+    locks: LockStats = field(default_factory=lambda: LockStats.zeros(0))
+    mode_switches: int = 0
+    dropped_nodes: int = 0
+    deadlocks: int = 0  # wait-for cycles between lock-holding runs
+    deadlock_check_steps: int = 0  # wait-for chain hops over all checks
+
+    @property
+    def feasible(self) -> bool:
+        return self.deadline_misses == 0
+
+    def metrics(self) -> dict[str, float]:
+        """Flat metric dict for SimulationResult.metrics."""
+        rt = np.asarray(self.response_times, dtype=np.float64)
+        return {
+            "horizon": self.horizon,
+            "hyperperiod": self.hyperperiod,
+            "sim_end_time": self.end_time,
+            "steady_state": 1.0 if self.stop_reason == STOP_STEADY_STATE else 0.0,
+            "events": float(self.events),
+            "jobs_released": float(self.jobs_released),
+            "jobs_completed": float(self.jobs_completed),
+            "deadline_misses": float(self.deadline_misses),
+            "miss_ratio": self.deadline_misses / self.jobs_released if self.jobs_released else 0.0,
+            "response_time_mean": float(rt.mean()) if rt.size else 0.0,
+            "response_time_max": float(rt.max()) if rt.size else 0.0,
+            "normalized_response_max": self.max_normalized_response,
+            "preemptions": float(self.preemptions),
+            **self.locks.totals(),
+            "mode_switches": float(self.mode_switches),
+            "dropped_nodes": float(self.dropped_nodes),
+            "deadlocks": float(self.deadlocks),
+            "deadlock_check_steps": float(self.deadlock_check_steps),
+        }
+
+
+class _Job:
+    __slots__ = ("task", "release", "deadline", "overrun", "waiting", "left", "done")
+
+    def __init__(self, task: int, release: float, deadline: float, overrun: bool, waiting: list[int]):
+        self.task = task
+        self.release = release
+        self.deadline = deadline
+        self.overrun = overrun
+        self.waiting = waiting  # unfinished predecessors per local node
+        self.left = len(waiting)  # unfinished nodes
+        self.done = False
+
+
+class _Run:
+    """One node of one job, from ready until finished."""
+
+    __slots__ = (
+        "job", "node", "seg", "remaining", "overran", "holding", "cluster",
+        "core", "end", "token", "dropped",
+    )
+
+    def __init__(self, job: _Job, node: int, cluster: int):
+        self.job = job
+        self.node = node  # global node index
+        self.seg = 0
+        self.remaining = 0.0
+        self.overran = False
+        self.holding = -1  # resource index held, -1 if none
+        self.cluster = cluster
+        self.core = -1  # core index while running
+        self.end = 0.0  # scheduled end of the current segment while running
+        self.token = 0  # bumped on every (re)start; stale SEG_END events are skipped
+        self.dropped = False
+
+
+class _Cluster:
+    __slots__ = ("running", "idle", "ready", "preemptible")
+
+    def __init__(self, n_cores: int):
+        self.running: list[_Run | None] = [None] * n_cores
+        self.idle = list(range(n_cores))  # min-heap: the lowest free core is used first
+        self.ready: list[tuple[int, float, int, _Run]] = []  # (rank, deadline, seq, run)
+        # Running runs outside critical sections, worst first: (-rank, -deadline, core,
+        # seq, token, run). An entry is live while run.token == token (lazy deletion).
+        self.preemptible: list[tuple[int, float, int, int, int, _Run]] = []
+
+
+class Simulator:
+    """CA-EDF discrete-event engine over a PackedTaskSet. PDF §5–6.
+
+    Inputs: packed task set, cluster index per task (n_tasks,), cores per cluster,
+    optional access matrix of the set (sizes the lock table without a segment pass).
+    Outputs: `run(...)` returns SimStats.
+    Invariants: deterministic for a fixed seed; preempted work resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        packed: PackedTaskSet,
+        task_cluster: np.ndarray,
+        cluster_cores: np.ndarray,
+        access: AccessMatrix | None = None,
+    ) -> None:
+        task_cluster = np.asarray(task_cluster, dtype=np.int64)
+        cluster_cores = np.asarray(cluster_cores, dtype=np.int64)
+        if task_cluster.shape != (packed.n_tasks,):
+            raise ValueError(f"task_cluster must have shape ({packed.n_tasks},)")
+        if packed.n_tasks and (task_cluster.min() < 0 or task_cluster.max() >= cluster_cores.size):
+            raise ValueError("task_cluster refers to an unknown cluster")
+        if (cluster_cores < 1).any():
+            raise ValueError("every cluster needs at least one core")
+        self.packed = packed
+        self.task_cluster = task_cluster.tolist()
+        self.cluster_cores = cluster_cores.tolist()
+        self.T = packed.T.tolist()
+        self.D = packed.D.tolist()
+        self.node_offsets = packed.node_offsets.tolist()
+        indptr, succ = packed.dag_batch().successor_csr()
+        self.succ_ptr = indptr.tolist()
+        self.succ = succ.tolist()
+        indeg = np.bincount(succ, minlength=packed.n_nodes)
+        self.indeg = indeg.tolist()
+        self.hi = (packed.criticality == CRIT_HI).tolist()
+        self.modes = ModeTables.from_packed(packed)
+        self._build_segments(packed)
+        if access is None:
+            access = AccessMatrix.from_packed(packed)
+        self.access = access
+        self.n_resources = access.n_resources
+
+    def _build_segments(self, packed: PackedTaskSet) -> None:
+        """Flat segment table: node v owns seg_ptr[v]:seg_ptr[v + 1].
+
+        A node without segments but with work gets one normal segment of its WCET.
+        Lengths are kept per mode (seg_len_rows[mode]); everything is built here once.
+        """
+        n_seg = np.diff(packed.seg_offsets)
+        synth = (n_seg == 0) & (packed.c_overflow > 0)
+        ptr = np.zeros(packed.n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.where(synth, 1, n_seg), out=ptr[1:])
+        # Real segment j of node v moves up by the synthetic segments of nodes before v.
+        shift = np.cumsum(synth) - synth
+        dest = np.arange(packed.seg_kind.size) + np.repeat(shift, n_seg)
+        at = ptr[:-1][synth]
+        critical = np.zeros(ptr[-1], dtype=bool)
+        critical[dest] = packed.seg_kind == SEG_CRITICAL
+        res = np.full(ptr[-1], -1, dtype=np.int64)
+        res[dest] = packed.seg_resource
+        length = np.zeros((2, ptr[-1]))
+        length[:, dest] = self.modes.seg_length
+        length[:, at] = self.modes.wcet[:, synth]
+        self.seg_ptr = ptr.tolist()
+        self.seg_critical = critical.tolist()
+        self.seg_res = res.tolist()
+        self.seg_len_rows = (length[MODE_NORMAL].tolist(), length[MODE_OVERFLOW].tolist())
+        self.node_active_rows = tuple(row.tolist() for row in self.modes.node_active)
+
+    def default_horizon(self, n_hyperperiods: int = DEFAULT_HYPERPERIODS) -> float:
+        if not self.T:
+            return 0.0
+        return min(n_hyperperiods * hyperperiod(self.T), MAX_HORIZON_PERIODS * max(self.T))
+
+    # -- event queue ---------------------------------------------------------------
+
+    def _push(self, t: float, kind: int, payload: object, token: int = 0) -> None:
+        self._seq += 1
+        heapq.heappush(self._events, (t, kind, self._seq, payload, token))
+
+    # -- main loop -----------------------------------------------------------------
+
+    def run(
+        self,
+        horizon: float | None = None,
+        overrun_prob: float = 0.0,
+        drop_lo: bool = True,
+        seed: SeedLike = None,
+        stop_at_first_miss: bool = False,
+        steady_state: bool = True,
+        lock_hi_first: bool = True,
+        deadlock_drop: bool = True,
+    ) -> SimStats:
+        """Simulate releases in [0, horizon) until every released job finished.
+
+        Inputs: horizon (default DEFAULT_HYPERPERIODS hyperperiods), probability that a
+        job overruns its normal budgets, whether overflow mode drops LO nodes, seed,
+        stop_at_first_miss, steady_state (stop at a repeated hyperperiod-boundary state),
+        lock_hi_first (HI lock waiters before LO; False: one FIFO per resource),
+        deadlock_drop (drop lock-waiting LO nodes of jobs in a wait-for cycle).
+        Outputs: SimStats; stop_reason tells whether the horizon was reached.
+        Invariants: the feasibility verdict equals the one of the full-horizon run.
+        """
+        self.horizon = self.default_horizon() if horizon is None else float(horizon)
+        self.overrun_prob = overrun_prob
+        self.drop_lo = drop_lo
+        self.rng = get_rng(seed)
+        H = hyperperiod(self.T) if self.T else 0.0
+        self._overruns = self._draw_overruns(H)
+        self._jobs_released = [0] * len(self.T)
+        self.stats = SimStats(horizon=self.horizon, hyperperiod=H)
+        self._set_mode(MODE_NORMAL)
+        self.clusters = [_Cluster(k) for k in self.cluster_cores]
+        self.locks = LockManager(self.n_resources, hi_first=lock_hi_first)
+        self.stats.locks = self.locks.stats
+        self.deadlock_drop = deadlock_drop
+        self._cycles: list[list[_Run]] = []
+        self.waits = WaitForGraph(on_deadlock=self._cycles.append)
+        self.active = 0  # runs started and not finished
+        self._events: list[tuple[float, int, int, object, int]] = []
+        self._seq = 0
+        for i in range(len(self.T)):
+            if self.horizon > 0:
+                self._push(0.0, EV_RELEASE, i)
+        watch = steady_state and 0 < H < self.horizon
+        if watch:
+            self._push(H, EV_BOUNDARY, None)
+        seen: set[tuple] = set()
+
+        events = self._events
+        st = self.stats
+        dirty: set[int] = set()
+        while events:
+            t, kind, _, payload, token = heapq.heappop(events)
+            st.end_time = t
+            if kind == EV_SEG_END:
+                run = payload
+                if token != run.token:  # preempted since this event was scheduled
+                    continue
+                st.events += 1
+                self._segment_end(run, t, dirty)
+            elif kind == EV_RELEASE:
+                st.events += 1
+                self._release(payload, t, dirty)
+            elif kind == EV_LOCK_GRANT:
+                st.events += 1
+                self._grant(payload, t, dirty)
+            elif kind == EV_MODE_SWITCH:
+                st.events += 1
+                self._switch_to_overflow(t, dirty)
+            elif kind == EV_BOUNDARY:
+                fp = self._fingerprint(t)
+                if fp in seen:
+                    st.stop_reason = STOP_STEADY_STATE
+                    break
+                seen.add(fp)
+                if t + H < self.horizon:
+                    self._push(t + H, EV_BOUNDARY, None)
+            else:  # EV_DEADLINE
+                st.events += 1
+                job = payload
+                if not job.done:
+                    st.deadline_misses += 1
+                    st.first_miss_time = min(st.first_miss_time, t)
+                    if stop_at_first_miss:
+                        st.stop_reason = STOP_FIRST_MISS
+                        break
+            if self._cycles:
+                self._resolve_deadlocks(t, dirty)
+            if dirty and (not events or events[0][0] > t):
+                # Dispatch once per instant, after every event at time t is applied.
+                for c in sorted(dirty):
+                    self._dispatch(c, t)
+                dirty.clear()
+            if self.active == 0 and self.mode == MODE_OVERFLOW:
+                self._set_mode(MODE_NORMAL)
+        st.deadlocks = self.waits.deadlocks
+        st.deadlock_check_steps = self.waits.steps
+        return st
+
+    def _draw_overruns(self, H: float) -> list[list[bool]]:
+        """Overrun flag per task and job index modulo the task's jobs per hyperperiod.
+
+        Only the jobs released below the horizon are drawn, task after task, so the
+        pattern depends on the seed alone and repeats every hyperperiod.
+        """
+        out: list[list[bool]] = []
+        for T in self.T:
+            per_h = max(1, round(H / T)) if H > 0 else 1
+            n = max(1, min(per_h, math.ceil(self.horizon / T)))
+            out.append((self.rng.random(n) < self.overrun_prob).tolist() if self.overrun_prob > 0 else [False] * n)
+        return out
+
+    def _fingerprint(self, t: float) -> tuple:
+        """Canonical state at boundary t, with times taken relative to t.
+
+        Covers everything that shapes the future of a deterministic run: mode, every
+        unfinished job (task, release offset, predecessor counters), every unfinished
+        node with its progress and place (core, ready order, lock queue), lock holders
+        and free cores. Completed work and stale events do not matter.
+        """
+        runs: list[_Run] = []
+        for cl in self.clusters:
+            runs.extend(r for r in cl.running if r is not None)
+            runs.extend(e[3] for e in cl.ready if not e[3].dropped)
+        for res in range(self.n_resources):
+            runs.extend(self.locks.waiting(res))
+        jobs = sorted({id(r.job): r.job for r in runs}.values(), key=lambda j: (j.task, j.release))
+        job_ix = {id(j): k for k, j in enumerate(jobs)}
+        run_ix = {id(r): k for k, r in enumerate(sorted(runs, key=lambda r: (job_ix[id(r.job)], r.node)))}
+
+        def run_state(r: _Run) -> tuple:
+            remaining = r.end - t if r.core >= 0 else r.remaining
+            return (job_ix[id(r.job)], r.node, r.seg, round(remaining, _FP_DIGITS), r.overran, r.holding)
+
+        clusters = tuple(
+            (
+                tuple(None if r is None else run_ix[id(r)] for r in cl.running),
+                tuple(sorted(cl.idle)),
+                tuple(run_ix[id(e[3])] for e in sorted(cl.ready) if not e[3].dropped),
+            )
+            for cl in self.clusters
+        )
+        return (
+            self.mode,
+            tuple((j.task, round(j.release - t, _FP_DIGITS), j.overrun, tuple(j.waiting)) for j in jobs),
+            tuple(run_state(r) for r in sorted(runs, key=lambda r: run_ix[id(r)])),
+            clusters,
+            tuple(
+                (
+                    None if self.locks.holder(q) is None else run_ix[id(self.locks.holder(q))],
+                    tuple(run_ix[id(r)] for r in self.locks.waiting(q)),
+                )
+                for q in range(self.n_resources)
+            ),
+        )
+
+    # -- jobs and nodes ------------------------------------------------------------
+
+    def _release(self, i: int, t: float, dirty: set[int]) -> None:
+        nxt = t + self.T[i]
+        if nxt < self.horizon:
+            self._push(nxt, EV_RELEASE, i)
+        lo, hi = self.node_offsets[i], self.node_offsets[i + 1]
+        k = self._jobs_released[i]
+        self._jobs_released[i] = k + 1
+        pattern = self._overruns[i]
+        overrun = pattern[k % len(pattern)]
+        job = _Job(i, t, t + self.D[i], overrun, self.indeg[lo:hi])
+        self.stats.jobs_released += 1
+        self._push(job.deadline, EV_DEADLINE, job)
+        # Roots first: starting one (e.g. the zero-work source) updates job.waiting.
+        for k in [k for k, w in enumerate(job.waiting) if w == 0]:
+            self._start_node(job, lo + k, t, dirty)
+
+    def _start_node(self, job: _Job, v: int, t: float, dirty: set[int]) -> None:
+        has_work = self.seg_ptr[v] < self.seg_ptr[v + 1]
+        if not has_work or not self.node_active[v]:
+            if has_work:
+                self.stats.dropped_nodes += 1
+            self._finish_node(job, v, t, dirty)
+            return
+        run = _Run(job, v, self.task_cluster[job.task])
+        self.active += 1
+        self._enter_segment(run, t, dirty)
+
+    def _load_segment(self, run: _Run) -> int:
+        """Set the execution of segment run.seg from the current mode's lengths; its index."""
+        j = self.seg_ptr[run.node] + run.seg
+        if run.job.overrun and self.hi[run.node]:
+            run.remaining = self.seg_len[j]
+            run.overran = self.mode == MODE_OVERFLOW
+        else:
+            run.remaining = self.seg_len_rows[MODE_NORMAL][j]
+            run.overran = False
+        return j
+
+    def _enter_segment(self, run: _Run, t: float, dirty: set[int]) -> None:
+        """Start segment run.seg of a run that is not on a core; queue it or make it wait."""
+        j = self._load_segment(run)
+        if self.seg_critical[j] and not self._acquire(run, self.seg_res[j], t):
+            return
+        self._make_ready(run, dirty)
+
+    def _make_ready(self, run: _Run, dirty: set[int]) -> None:
+        if run.holding >= 0:
+            rank = RANK_LOCKED
+        else:
+            rank = RANK_HI if self.hi[run.node] else RANK_LO
+        self._seq += 1
+        heapq.heappush(self.clusters[run.cluster].ready, (rank, run.job.deadline, self._seq, run))
+        dirty.add(run.cluster)
+
+    def _segment_end(self, run: _Run, t: float, dirty: set[int]) -> None:
+        j = self.seg_ptr[run.node] + run.seg
+        ln, lo = self.seg_len_rows[MODE_NORMAL][j], self.seg_len_rows[MODE_OVERFLOW][j]
+        if run.job.overrun and self.hi[run.node] and not run.overran and lo > ln:
+            # Normal budget exhausted: keep the core and run the overflow extra.
+            run.overran = True
+            run.remaining = lo - ln
+            if self.mode == MODE_NORMAL:
+                self._push(t, EV_MODE_SWITCH, None)
+            self._start_on_core(run, run.core, t)
+            return
+        if run.holding >= 0:
+            self._release_lock(run, t)
+        run.seg += 1
+        if j + 1 == self.seg_ptr[run.node + 1]:
+            self._free_core(run)
+            dirty.add(run.cluster)
+            self.active -= 1
+            self._finish_node(run.job, run.node, t, dirty)
+            return
+        j = self._load_segment(run)
+        critical = self.seg_critical[j]
+        if critical and not self._acquire(run, self.seg_res[j], t):
+            self._free_core(run)  # suspend until the lock is granted
+            dirty.add(run.cluster)
+            return
+        self._start_on_core(run, run.core, t)
+        if not critical:
+            dirty.add(run.cluster)  # a normal segment may now be preempted by the ready head
+
+    def _finish_node(self, job: _Job, v: int, t: float, dirty: set[int]) -> None:
+        base = self.node_offsets[job.task]
+        job.left -= 1
+        if job.left:
+            # Successors may finish (and recurse) right away, so decide completion before.
+            for s in self.succ[self.succ_ptr[v] : self.succ_ptr[v + 1]]:
+                job.waiting[s - base] -= 1
+                if job.waiting[s - base] == 0:
+                    self._start_node(job, s, t, dirty)
+        else:
+            job.done = True
+            st = self.stats
+            st.jobs_completed += 1
+            r = t - job.release
+            st.response_times.append(r)
+            st.max_normalized_response = max(st.max_normalized_response, r / self.D[job.task])
+
+    # -- cores ---------------------------------------------------------------------
+
+    def _start_on_core(self, run: _Run, core: int, t: float) -> None:
+        cl = self.clusters[run.cluster]
+        cl.running[core] = run
+        run.core = core
+        run.end = t + run.remaining
+        run.token += 1
+        self._push(run.end, EV_SEG_END, run, run.token)
+        if run.holding < 0:  # critical sections are non-preemptive
+            heap = cl.preemptible
+            if len(heap) > 2 * len(cl.running) + 16:
+                # Drop the stale entries buried below the top; amortized O(1) per start.
+                heap[:] = [e for e in heap if e[5].token == e[4]]
+                heapq.heapify(heap)
+            rank = RANK_HI if self.hi[run.node] else RANK_LO
+            self._seq += 1
+            heapq.heappush(heap, (-rank, -run.job.deadline, core, self._seq, run.token, run))
+
+    def _free_core(self, run: _Run) -> None:
+        cl = self.clusters[run.cluster]
+        cl.running[run.core] = None
+        heapq.heappush(cl.idle, run.core)
+        run.core = -1
+        run.token += 1
+
+    def _dispatch(self, c: int, t: float) -> None:
+        """Fill idle cores from the ready heap, then preempt while the head outranks a core.
+
+        The preemption victim is the top of the cluster's preemptible heap (worst rank,
+        then latest deadline, then lowest core), so each check is O(log m), not a scan.
+        """
+        cl = self.clusters[c]
+        ready = cl.ready
+        while ready:
+            key = ready[0]
+            run = key[3]
+            if run.dropped:
+                heapq.heappop(ready)
+                continue
+            if cl.idle:
+                heapq.heappop(ready)
+                self._start_on_core(run, heapq.heappop(cl.idle), t)
+                continue
+            preemptible = cl.preemptible
+            while preemptible and preemptible[0][5].token != preemptible[0][4]:
+                heapq.heappop(preemptible)  # stale: the run stopped or restarted since
+            if not preemptible:
+                return
+            top = preemptible[0]
+            if (key[0], key[1]) >= (-top[0], -top[1]):
+                return
+            heapq.heappop(preemptible)
+            victim = top[5]
+            heapq.heappop(ready)
+            core = victim.core
+            victim.remaining = victim.end - t
+            victim.core = -1
+            victim.token += 1
+            self.stats.preemptions += 1
+            self._make_ready(victim, set())
+            self._start_on_core(run, core, t)
+
+    # -- locks ---------------------------------------------------------------------
+
+    def _acquire(self, run: _Run, res: int, t: float) -> bool:
+        if self.locks.request(res, run, self.hi[run.node], t):
+            run.holding = res
+            self.waits.hold(run, res)
+            return True
+        self.waits.wait(run, res)
+        return False
+
+    def _release_lock(self, run: _Run, t: float) -> None:
+        res = run.holding
+        nxt = self.locks.release(res, t)
+        self.waits.release(res)
+        if nxt is not None:
+            nxt.holding = res  # reserved; handed over by EV_LOCK_GRANT
+            self.waits.unwait(nxt, res)
+            self.waits.hold(nxt, res)
+            self._push(t, EV_LOCK_GRANT, nxt)
+        run.holding = -1
+
+    def _grant(self, run: _Run, t: float, dirty: set[int]) -> None:
+        self._make_ready(run, dirty)
+
+    # -- modes ---------------------------------------------------------------------
+
+    def _set_mode(self, mode: int) -> None:
+        """Point the engine at the preallocated rows of `mode`: O(1), no reallocation."""
+        self.mode = mode
+        self.seg_len = self.seg_len_rows[mode]
+        self.node_active = self.node_active_rows[mode if self.drop_lo else MODE_NORMAL]
+
+    def _switch_to_overflow(self, t: float, dirty: set[int]) -> None:
+        if self.mode == MODE_OVERFLOW:
+            return
+        self._set_mode(MODE_OVERFLOW)
+        self.stats.mode_switches += 1
+        if not self.drop_lo:
+            return
+        # Nodes released from now on are filtered by the active mask; drop the LO nodes
+        # already started that have not entered a critical section: queued or lock-waiting.
+        dropped: list[_Run] = []
+        for c, cl in enumerate(self.clusters):
+            for _, _, _, run in cl.ready:
+                if not run.dropped and not self.hi[run.node] and run.holding < 0:
+                    dropped.append(run)
+            for run in cl.running:
+                if run is not None and not self.hi[run.node] and run.holding < 0:
+                    dropped.append(run)
+        for res in range(self.n_resources):
+            dropped.extend(r for r in self.locks.waiting(res) if not self.hi[r.node])
+        for run in dropped:
+            self._drop_run(run, t, dirty)
+
+    def _resolve_deadlocks(self, t: float, dirty: set[int]) -> None:
+        """Handle the wait-for cycles closed by the events at t (drop_low_criticality_in_overload)."""
+        cycles, self._cycles[:] = list(self._cycles), []
+        if not self.deadlock_drop:
+            return
+        jobs = {id(run.job) for cycle in cycles for run in cycle}
+        task_mask = np.zeros(len(self.T), dtype=bool)
+        task_mask[[run.job.task for cycle in cycles for run in cycle]] = True
+        keep = drop_low_criticality_mask(self.modes, True, task_mask)
+        victims = [
+            r
+            for res in range(self.n_resources)
+            for r in self.locks.waiting(res)
+            if id(r.job) in jobs and not keep[r.node]
+        ]
+        for run in victims:
+            self._drop_run(run, t, dirty)
+
+    def _drop_run(self, run: _Run, t: float, dirty: set[int]) -> None:
+        if run.dropped:
+            return
+        run.dropped = True
+        if self.locks.withdraw(run):
+            self.waits.unwait(run, self.seg_res[self.seg_ptr[run.node] + run.seg])
+        if run.core >= 0:
+            self._free_core(run)
+            dirty.add(run.cluster)
+        self.stats.dropped_nodes += 1
+        self.active -= 1
+        self._finish_node(run.job, run.node, t, dirty)
+
+
+class TracingSimulator(Simulator):
+    """Simulator that records its schedule into a TraceRecorder. PDF §5–6.
+
+    Inputs: as Simulator, plus the recorder (default: a ring of TraceRecorder's default
+    capacity).
+    Outputs: run(...) as Simulator; records in self.trace.
+    Invariants: overrides only call the engine's own methods around a record, so the
+    schedule and SimStats equal those of an untraced run. Record times are the time of
+    the event being processed.
+    """
+
+    def __init__(
+        self,
+        packed: PackedTaskSet,
+        task_cluster: np.ndarray,
+        cluster_cores: np.ndarray,
+        access: AccessMatrix | None = None,
+        trace: TraceRecorder | None = None,
+    ) -> None:
+        super().__init__(packed, task_cluster, cluster_cores, access)
+        self.trace = TraceRecorder() if trace is None else trace
+
+    def _put(self, kind: int, run: _Run, core: int = -1, resource: int = -1) -> None:
+        self.trace.record(
+            self.stats.end_time, kind, run.cluster, core, run.job.task, run.node, run.job.release, resource
+        )
+
+    def _release(self, i: int, t: float, dirty: set[int]) -> None:
+        self.trace.record(t, TR_RELEASE, self.task_cluster[i], task=i, release=t)
+        super()._release(i, t, dirty)
+
+    def _finish_node(self, job: _Job, v: int, t: float, dirty: set[int]) -> None:
+        last = job.left == 1  # successors recurse into this method before it returns
+        super()._finish_node(job, v, t, dirty)
+        if last:
+            self.trace.record(t, TR_JOB_DONE, self.task_cluster[job.task], task=job.task, release=job.release)
+
+    def _start_on_core(self, run: _Run, core: int, t: float) -> None:
+        prev = self.clusters[run.cluster].running[core]
+        if prev is not run:
+            if prev is not None:  # _dispatch leaves the preempted run in the slot
+                self._put(TR_PREEMPT, prev, core)
+            self._put(TR_START, run, core)
+        super()._start_on_core(run, core, t)
+
+    def _free_core(self, run: _Run) -> None:
+        self._put(TR_STOP, run, run.core)
+        super()._free_core(run)
+
+    def _acquire(self, run: _Run, res: int, t: float) -> bool:
+        ok = super()._acquire(run, res, t)
+        self._put(TR_LOCK_GRANT if ok else TR_LOCK_WAIT, run, run.core, res)
+        return ok
+
+    def _grant(self, run: _Run, t: float, dirty: set[int]) -> None:
+        self._put(TR_LOCK_GRANT, run, run.core, run.holding)
+        super()._grant(run, t, dirty)
+
+    def _drop_run(self, run: _Run, t: float, dirty: set[int]) -> None:
+        if not run.dropped:
+            self._put(TR_DROP, run, run.core)
+        super()._drop_run(run, t, dirty)
+
+    def _set_mode(self, mode: int) -> None:
+        super()._set_mode(mode)
+        self.trace.record(self.stats.end_time, TR_MODE, resource=mode)
+
+
+def simulate(
+    packed: PackedTaskSet,
+    task_cluster: np.ndarray,
+    cluster_cores: np.ndarray,
+    horizon: float | None = None,
+    overrun_prob: float = 0.0,
+    drop_lo: bool = True,
+    seed: SeedLike = None,
+    stop_at_first_miss: bool = False,
+    steady_state: bool = True,
+    lock_hi_first: bool = True,
+    deadlock_drop: bool = True,
+    trace: TraceRecorder | None = None,
+    access: AccessMatrix | None = None,
+) -> SimStats:
+    """Run the CA-EDF engine once; see Simulator.run for the parameters.
+
+    With a trace recorder the run is a TracingSimulator writing into it; an access
+    matrix of the set is reused instead of rebuilt.
+    """
+    if trace is None:
+        sim = Simulator(packed, task_cluster, cluster_cores, access)
+    else:
+        sim = TracingSimulator(packed, task_cluster, cluster_cores, access, trace=trace)
+    return sim.run(
+        horizon=horizon,
+        overrun_prob=overrun_prob,
+        drop_lo=drop_lo,
+        seed=seed,
+        stop_at_first_miss=stop_at_first_miss,
+        steady_state=steady_state,
+        lock_hi_first=lock_hi_first,
+        deadlock_drop=deadlock_drop,
+    )
@@ -0,0 +1,196 @@
+"""Compact binary schedule trace of CA-EDF runs and its Gantt reader. PDF §5–6.
+
+Layout: fixed-width little-endian records (TRACE_DTYPE, 37 bytes) appended to a
+preallocated structured array of `capacity` records. Without a path the array is a ring
+buffer that keeps the newest records (older ones are counted in `dropped`); with a path
+every full chunk is appended to the file, which starts with TRACE_MAGIC, and close()
+writes the rest. read_trace loads a file, gantt turns records into per-core bars.
+Invariants: records are in simulation order; `release` and `task` identify the job,
+`node` is the global node index; fields that do not apply are -1.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+TRACE_MAGIC = b"RTSTRACE1\n"
+
+TR_START = 0  # run put on a core (dispatch, resume after preemption or lock grant)
+TR_STOP = 1  # run left its core: node finished, suspended on a lock, or dropped
+TR_PREEMPT = 2  # run pushed off its core by a higher-ranked ready run
+TR_LOCK_WAIT = 3  # run suspended waiting for `resource`
+TR_LOCK_GRANT = 4  # run holds `resource` (at once, or handed over by the releaser)
+TR_DROP = 5  # LO run dropped (overflow mode or deadlock resolution)
+TR_MODE = 6  # system mode changed; the new mode is in `resource`
+TR_RELEASE = 7  # job released
+TR_JOB_DONE = 8  # last node of the job finished
+
+TRACE_KINDS = {
+    TR_START: "start",
+    TR_STOP: "stop",
+    TR_PREEMPT: "preempt",
+    TR_LOCK_WAIT: "lock_wait",
+    TR_LOCK_GRANT: "lock_grant",
+    TR_DROP: "drop",
+    TR_MODE: "mode",
+    TR_RELEASE: "release",
+    TR_JOB_DONE: "job_done",
+}
+
+TRACE_DTYPE = np.dtype(
+    [
+        ("time", "<f8"),
+        ("release", "<f8"),
+        ("kind", "u1"),
+        ("cluster", "<i4"),
+        ("core", "<i4"),
+        ("task", "<i4"),
+        ("node", "<i4"),
+        ("resource", "<i4"),
+    ]
+)
+
+# One bar per stretch a run spends on a core; end_kind is TR_STOP or TR_PREEMPT (-1:
+# still running when the trace ends).
+GANTT_DTYPE = np.dtype(
+    [
+        ("start", "<f8"),
+        ("end", "<f8"),
+        ("task", "<i4"),
+        ("node", "<i4"),
+        ("release", "<f8"),
+        ("end_kind", "i1"),
+    ]
+)
+
+
+class TraceRecorder:
+    """Appends trace records to a preallocated chunk. PDF §5–6.
+
+    Inputs: capacity (records per chunk), optional path (flush full chunks there;
+    otherwise keep the newest `capacity` records in a ring).
+    Outputs: records() in simulation order; total / dropped counters.
+    Invariants: record() writes one array slot and never allocates; the file is opened
+    on construction and closed by close() (or the context manager).
+    """
+
+    def __init__(self, capacity: int = 1 << 16, path: Path | str | None = None) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        self.capacity = capacity
+        self.path = None if path is None else Path(path)
+        self._buf = np.empty(capacity, dtype=TRACE_DTYPE)
+        self._n = 0  # filled slots of the current chunk
+        self._wrapped = False
+        self.total = 0
+        self._file = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "wb")
+            self._file.write(TRACE_MAGIC)
+
+    @property
+    def dropped(self) -> int:
+        """Records overwritten by the ring (always 0 when writing to a file)."""
+        return 0 if self.path is not None else max(0, self.total - self.capacity)
+
+    def record(
+        self,
+        t: float,
+        kind: int,
+        cluster: int = -1,
+        core: int = -1,
+        task: int = -1,
+        node: int = -1,
+        release: float = -1.0,
+        resource: int = -1,
+    ) -> None:
+        self._buf[self._n] = (t, release, kind, cluster, core, task, node, resource)
+        self._n += 1
+        self.total += 1
+        if self._n == self.capacity:
+            if self._file is not None:
+                self._buf.tofile(self._file)
+            else:
+                self._wrapped = True
+            self._n = 0
+
+    def flush(self) -> None:
+        """Write the partial chunk of a file-backed recorder."""
+        if self._file is not None and self._n:
+            self._buf[: self._n].tofile(self._file)
+            self._n = 0
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> TraceRecorder:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def records(self) -> np.ndarray:
+        """All kept records, oldest first (a copy; reads the file when file-backed)."""
+        if self.path is not None:
+            self.flush()
+            return read_trace(self.path)
+        if self._wrapped:
+            return np.concatenate([self._buf[self._n :], self._buf[: self._n]])
+        return self._buf[: self._n].copy()
+
+
+def read_trace(path: Path | str) -> np.ndarray:
+    """Records of a trace file written by TraceRecorder. ValueError on a foreign file."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        if f.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a schedule trace")
+        data = f.read()
+    whole = len(data) // TRACE_DTYPE.itemsize * TRACE_DTYPE.itemsize  # drop a torn tail
+    return np.frombuffer(data[:whole], dtype=TRACE_DTYPE).copy()
+
+
+def gantt(records: np.ndarray) -> dict[tuple[int, int], np.ndarray]:
+    """Per-core Gantt bars from trace records.
+
+    Inputs: records (TRACE_DTYPE) in simulation order.
+    Outputs: (cluster, core) -> GANTT_DTYPE bars ordered by start.
+    Invariants: a START of the run already on the core (next segment) extends its bar;
+    bars still open at the end of the trace end at the last record time (end_kind -1).
+    A stop whose start fell out of a ring buffer yields no bar.
+    """
+    open_bars: dict[tuple[int, int], tuple[float, int, int, float]] = {}
+    bars: dict[tuple[int, int], list[tuple]] = {}
+    for t, release, kind, cluster, core, task, node in zip(
+        records["time"].tolist(),
+        records["release"].tolist(),
+        records["kind"].tolist(),
+        records["cluster"].tolist(),
+        records["core"].tolist(),
+        records["task"].tolist(),
+        records["node"].tolist(),
+    ):
+        if kind not in (TR_START, TR_STOP, TR_PREEMPT):
+            continue
+        key = (cluster, core)
+        cur = open_bars.get(key)
+        if kind == TR_START:
+            if cur is not None and cur[1:] == (task, node, release):
+                continue
+            if cur is not None:
+                bars.setdefault(key, []).append((cur[0], t, *cur[1:], TR_STOP))
+            open_bars[key] = (t, task, node, release)
+        elif cur is not None:
+            bars.setdefault(key, []).append((cur[0], t, *cur[1:], kind))
+            del open_bars[key]
+    last = float(records["time"][-1]) if records.size else 0.0
+    for key, cur in open_bars.items():
+        bars.setdefault(key, []).append((cur[0], last, *cur[1:], -1))
+    return {key: np.array(sorted(b), dtype=GANTT_DTYPE) for key, b in sorted(bars.items())}
@@ -0,0 +1,36 @@
+"""On-disk storage: task-set files, the generated task-set cache, results log. PDF §2, §5–6."""
+
+from rts_sim.store.cache import TaskSetCache, cache_from_config, cache_key
+from rts_sim.store.checkpoint import ConfigMismatchError, ResultsLog, config_hash, iter_results, load_results
+from rts_sim.store.results import ResultsStore, ResultsStoreWriter
+from rts_sim.store.tasksets import (
+    BinaryTaskSetReader,
+    BinaryTaskSetWriter,
+    JsonlTaskSetReader,
+    JsonlTaskSetWriter,
+    load_task_set,
+    open_task_set_reader,
+    open_task_set_writer,
+    write_task_sets,
+)
+
+__all__ = [
+    "BinaryTaskSetReader",
+    "BinaryTaskSetWriter",
+    "ConfigMismatchError",
+    "JsonlTaskSetReader",
+    "JsonlTaskSetWriter",
+    "ResultsLog",
+    "ResultsStore",
+    "ResultsStoreWriter",
+    "TaskSetCache",
+    "cache_from_config",
+    "config_hash",
+    "cache_key",
+    "iter_results",
+    "load_results",
+    "load_task_set",
+    "open_task_set_reader",
+    "open_task_set_writer",
+    "write_task_sets",
+]
@@ -0,0 +1,156 @@
+"""Content-addressed on-disk cache of generated task sets. PDF §1–4.
+
+Entries are `.rtsb` files named by a SHA-256 over the canonical JSON of the config
+sections that shape generation (gen, system, resources), the seed, the generator
+version and any per-point parameters. Repeated runs that only change partitioning or
+scheduling options therefore reuse every task set. Total size is bounded with LRU
+eviction (least recently read or written entry goes first).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+from rts_sim.config import Config
+from rts_sim.packed import PackedTaskSet
+from rts_sim.store.tasksets import BinaryTaskSetReader, BinaryTaskSetWriter
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".rtsb"
+
+
+def cache_key(config: Config, seed: int, version: str, **params: Any) -> str:
+    """Hex digest identifying a generated task set.
+
+    Inputs: config (only gen, system, resources are hashed), seed, generator version,
+    extra per-point parameters (must be JSON-serializable).
+    Outputs: 64-char SHA-256 hex string.
+    Invariants: independent of dict ordering and of non-generation config sections.
+    """
+    payload = {
+        "gen": config.gen.model_dump(mode="json"),
+        "system": config.system.model_dump(mode="json"),
+        "resources": config.resources.model_dump(mode="json"),
+        "seed": seed,
+        "version": version,
+        "params": params,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class TaskSetCache:
+    """Size-bounded LRU cache of PackedTaskSets under one directory.
+
+    Inputs: root directory, max_bytes budget.
+    Outputs: get / put / get_or_create by key; hit and miss counters.
+    Invariants: entries are written atomically (temp file + rename); total size of the
+    entries this process knows about stays <= max_bytes after every put. Entries removed
+    by another process are treated as misses.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        # key -> size in bytes, least recently used first.
+        self._lru: OrderedDict[str, int] = OrderedDict()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rebuild the LRU order from the files on disk (e.g. after other processes wrote)."""
+        entries = []
+        for path in self.root.glob(f"*/*{_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, path.stem, st.st_size))
+        self._lru = OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{_SUFFIX}"
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(self._lru.values())
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str) -> PackedTaskSet | None:
+        path = self._path(key)
+        try:
+            with BinaryTaskSetReader(path) as reader:
+                packed = reader.chunk(0, copy=True) if reader.n_chunks else None
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            packed = None
+        if packed is None:
+            self.misses += 1
+            self._lru.pop(key, None)
+            return None
+        self.hits += 1
+        self._lru[key] = path.stat().st_size
+        self._lru.move_to_end(key)
+        return packed
+
+    def put(self, key: str, packed: PackedTaskSet) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with BinaryTaskSetWriter(tmp) as writer:
+            writer.write_packed(packed)
+        os.replace(tmp, path)
+        self._lru[key] = path.stat().st_size
+        self._lru.move_to_end(key)
+        self.evict()
+
+    def get_or_create(self, key: str, factory: Callable[[], PackedTaskSet]) -> PackedTaskSet:
+        packed = self.get(key)
+        if packed is None:
+            packed = factory()
+            self.put(key, packed)
+        return packed
+
+    def evict(self) -> int:
+        """Drop least recently used entries until within budget; return entries removed."""
+        removed = 0
+        total = self.size_bytes
+        while total > self.max_bytes and len(self._lru) > 1:
+            key, size = self._lru.popitem(last=False)
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            logger.debug("task-set cache: evicted %d entries (%d bytes kept)", removed, total)
+        return removed
+
+    def clear(self) -> None:
+        for key in list(self._lru):
+            self._path(key).unlink(missing_ok=True)
+        self._lru.clear()
+
+
+def cache_from_config(config: Config, output_dir: Path | None = None) -> TaskSetCache | None:
+    """Cache configured by `config.cache` (None when disabled); default dir is output_dir/cache."""
+    c = config.cache
+    if not c.enabled:
+        return None
+    root = c.directory if c.directory is not None else Path(output_dir or config.output_dir) / "cache"
+    return TaskSetCache(root, max_bytes=int(c.max_mb * 1024 * 1024))
@@ -0,0 +1,197 @@
+"""Durable, append-only log of finished experiment points. PDF §5–6.
+
+Layout: a header line recording the hash of the config that produced the results
+(config_hash), then one ExperimentPoint JSON document per line (`.jsonl`). Every append
+is flushed and fsync'ed, so a crash loses at most the point being written; a torn last
+line is dropped when the log is reopened. Points are identified by
+`ExperimentPoint.key`; when a key appears twice the later line wins. The key covers only
+sweep coordinates and seed, so a log is resumed only under the config it was written
+with.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from rts_sim.config import Config
+from rts_sim.models import ExperimentPoint
+
+logger = logging.getLogger(__name__)
+
+RESULTS_LOG_NAME = "points.jsonl"
+LOG_FORMAT = "rts_sim.results"
+LOG_VERSION = 1
+# Config sections that change a point's result (sweep grid, executor, cache and paths do not).
+RESULT_CONFIG_SECTIONS = ("gen", "system", "resources", "partition", "sched")
+
+
+class ConfigMismatchError(ValueError):
+    """A results log is resumed under a config other than the one that wrote it."""
+
+
+def config_hash(config: Config, version: str) -> str:
+    """Hex digest of everything besides the point itself that determines its result.
+
+    Inputs: config (RESULT_CONFIG_SECTIONS are hashed), generator version.
+    Outputs: 64-char SHA-256 hex string.
+    """
+    payload = {name: getattr(config, name).model_dump(mode="json") for name in RESULT_CONFIG_SECTIONS}
+    payload["version"] = version
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _header(line: bytes) -> dict | None:
+    """Parsed header line, or None when `line` is not one (e.g. a torn write)."""
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        doc = json.loads(line)
+    except ValueError:
+        return None
+    return doc if isinstance(doc, dict) and doc.get("format") == LOG_FORMAT else None
+
+
+def _iter_lines(path: Path) -> Iterator[tuple[ExperimentPoint | dict, int]]:
+    """The header (if any), then the point on every complete line, each with the byte
+    offset after it; stops at the first torn or unreadable line."""
+    with open(path, "rb") as f:
+        first = f.readline()
+        header = _header(first)
+        end = 0
+        if header is not None:
+            end = len(first)
+            yield header, end
+        else:
+            f.seek(0)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            try:
+                point = ExperimentPoint.model_validate_json(line)
+            except ValueError:
+                return
+            end += len(line)
+            yield point, end
+
+
+def _scan(path: Path) -> tuple[dict[str, int], int, dict | None]:
+    """Key -> index of its last point line, the byte offset after the last complete line
+    and the header (None for a log without one). Points are parsed one at a time and
+    not kept."""
+    last: dict[str, int] = {}
+    end = 0
+    header = None
+    for k, (item, end) in enumerate(_iter_lines(path)):
+        if isinstance(item, dict):
+            header = item
+        else:
+            last[item.key] = k
+    if end < path.stat().st_size:
+        logger.warning("results log %s: dropping torn tail after byte %d", path, end)
+    return last, end, header
+
+
+class ResultsLog:
+    """Append-only checkpoint of ExperimentPoints with results.
+
+    Inputs: path; resume=False starts a new log, resume=True keeps finished points;
+    config_hash of the run (config_hash()), written to the header of a new log.
+    Outputs: `done` (keys of the finished points) for resumed runs; `append` / `extend`
+    to record more; iter_results(path) reads the points back.
+    Invariants: every point passed to append is on disk (fsync) when append returns; the
+    log keeps keys only, never the points themselves.
+    Resuming a log whose header records another config_hash (or none) raises
+    ConfigMismatchError instead of reusing results computed under a different config.
+    """
+
+    def __init__(self, path: Path, resume: bool = False, config_hash: str | None = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.config_hash = config_hash
+        self.done: set[str] = set()
+        header, end = None, 0
+        if resume and self.path.exists():
+            last, end, header = _scan(self.path)
+            self.done = set(last)
+        if header is None and end == 0:
+            # New log (or nothing usable in the old one).
+            self.done = set()
+            self._f = open(self.path, "wb")
+            line = {"format": LOG_FORMAT, "version": LOG_VERSION, "config_hash": config_hash}
+            self._write([json.dumps(line) + "\n"])
+            return
+        logged = header.get("config_hash") if header is not None else None
+        if config_hash is not None and logged != config_hash:
+            raise ConfigMismatchError(
+                f"results log {self.path} was written under config {str(logged)[:12]}, this run has "
+                f"{config_hash[:12]}; rerun without resume or use another results_dir"
+            )
+        self._f = open(self.path, "r+b")
+        self._f.truncate(end)
+        self._f.seek(end)
+
+    def __contains__(self, point: ExperimentPoint) -> bool:
+        return point.key in self.done
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    def append(self, point: ExperimentPoint) -> None:
+        self.extend([point])
+
+    def extend(self, points: Iterable[ExperimentPoint]) -> None:
+        """Write points and fsync once for the batch."""
+        lines = []
+        for p in points:
+            lines.append(json.dumps(p.model_dump(mode="json"), separators=(",", ":")) + "\n")
+            self.done.add(p.key)
+        self._write(lines)
+
+    def _write(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        self._f.write("".join(lines).encode("utf-8"))
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self) -> ResultsLog:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def iter_results(path: Path) -> Iterator[ExperimentPoint]:
+    """Stream the points of a results log: the last line of every key, in file order.
+
+    Two passes over the file; only the key -> line index map is held in memory.
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    last = set(_scan(path)[0].values())
+    for k, (item, _) in enumerate(_iter_lines(path)):
+        if k in last:
+            yield item
+
+
+def load_results(path: Path) -> list[ExperimentPoint]:
+    """All points recorded in a results log (later duplicates win), in first-seen order."""
+    path = Path(path)
+    if not path.exists():
+        return []
+    done: dict[str, ExperimentPoint] = {}
+    for item, _ in _iter_lines(path):
+        if not isinstance(item, dict):
+            done[item.key] = item
+    return list(done.values())
@@ -0,0 +1,348 @@
+"""Columnar on-disk store of experiment points. PDF §5–6.
+
+Layout (`.rcol`):
+    file header  : MAGIC (8 bytes) + uint32 version + uint32 reserved
+    chunk*       : uint64 header_len + JSON header (padded to 8 bytes) + column data
+Each chunk holds up to chunk_size points as one typed array per column: the sweep
+dimensions and seed (POINT_COLUMNS), `has_result`, `feasible` and one float64 column per
+metric, named METRIC_PREFIX + metric name (NaN where a point lacks the metric). The
+chunk header lists the point keys, task-set ids and allocations (needed only to rebuild
+ExperimentPoints) and, per column, dtype and offset in the data block (8-byte aligned).
+A chunk is written with one append-mode write under an exclusive file lock, so several
+processes can append to one store. Readers mmap the file, parse chunk headers only and
+read just the columns a query touches; a torn trailing chunk is ignored.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import operator
+import os
+import struct
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from rts_sim.models import ExperimentPoint, SimulationResult
+
+try:  # POSIX: serialize appends from several processes
+    import fcntl
+except ImportError:  # pragma: no cover - single-writer use only
+    fcntl = None
+
+MAGIC = b"RTSRES\x00\x00"
+VERSION = 1
+RESULTS_STORE_NAME = "points.rcol"
+METRIC_PREFIX = "metrics."
+
+POINT_COLUMNS = {
+    "n_tasks": np.int64,
+    "m": np.int64,
+    "U_norm": np.float64,
+    "n_resources": np.int64,
+    "total_resource_accesses": np.int64,
+    "seed": np.int64,
+}
+
+_FILE_HEADER = struct.Struct("<8sII")
+_CHUNK_LEN = struct.Struct("<Q")
+
+# Predicate operators: (column, op, value) triples, all ANDed.
+_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": np.isin,
+}
+
+Predicate = Sequence[tuple[str, str, Any]]
+
+
+def _pad8(n: int) -> int:
+    return (-n) % 8
+
+
+def _fill_value(dtype: np.dtype) -> Any:
+    """Value of a column in chunks that do not have it."""
+    if dtype.kind == "f":
+        return np.nan
+    if dtype.kind == "b":
+        return False
+    return -1
+
+
+def _encode_chunk(points: Sequence[ExperimentPoint]) -> bytes:
+    cols: dict[str, np.ndarray] = {
+        name: np.array([getattr(p, name) for p in points], dtype=dtype) for name, dtype in POINT_COLUMNS.items()
+    }
+    cols["has_result"] = np.array([p.result is not None for p in points], dtype=bool)
+    cols["feasible"] = np.array([p.result is not None and p.result.feasible for p in points], dtype=bool)
+    names: dict[str, None] = {}
+    for p in points:
+        if p.result is not None:
+            names.update(dict.fromkeys(p.result.metrics))
+    for name in names:
+        cols[METRIC_PREFIX + name] = np.array(
+            [np.nan if p.result is None else p.result.metrics.get(name, np.nan) for p in points], dtype=np.float64
+        )
+    layout, offset = [], 0
+    for name, arr in cols.items():
+        layout.append({"name": name, "dtype": arr.dtype.newbyteorder("<").str, "offset": offset})
+        offset += arr.nbytes + _pad8(arr.nbytes)
+    header = {
+        "n_points": len(points),
+        "keys": [p.key for p in points],
+        "task_set_ids": [None if p.result is None else p.result.task_set_id for p in points],
+        "allocations": [
+            None if p.result is None else [p.result.core_allocation, p.result.group_allocation] for p in points
+        ],
+        "columns": layout,
+        "data_len": offset,
+    }
+    raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    raw += b" " * _pad8(_CHUNK_LEN.size + len(raw))
+    parts = [_CHUNK_LEN.pack(len(raw)), raw]
+    for arr in cols.values():
+        parts.append(arr.astype(arr.dtype.newbyteorder("<"), copy=False).tobytes())
+        parts.append(b"\0" * _pad8(arr.nbytes))
+    return b"".join(parts)
+
+
+class ResultsStoreWriter:
+    """Append experiment points to a `.rcol` store in columnar chunks. PDF §5–6.
+
+    Inputs: path, chunk_size (points buffered per chunk), append flag.
+    Outputs: file on disk; `append` / `extend` buffer points, `flush` writes them.
+    Invariants: a chunk reaches the file in one locked append, so concurrent writers
+    (e.g. sweep workers) never interleave bytes; appending to an existing store first
+    drops an incomplete trailing chunk.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = 1024, append: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = max(1, chunk_size)
+        self.n_points = 0
+        self._pending: list[ExperimentPoint] = []
+        if append and self.path.exists() and self.path.stat().st_size > 0:
+            _check_file_header(self.path)
+            with open(self.path, "r+b") as f, _locked(f):
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = _scan_chunks(mm)[2]
+                f.truncate(end)
+        else:
+            with open(self.path, "wb") as f:
+                f.write(_FILE_HEADER.pack(MAGIC, VERSION, 0))
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+
+    def append(self, point: ExperimentPoint) -> None:
+        self._pending.append(point)
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def extend(self, points: Iterable[ExperimentPoint]) -> None:
+        for p in points:
+            self.append(p)
+
+    def flush(self) -> None:
+        """Write the buffered points as one chunk."""
+        if not self._pending:
+            return
+        data = _encode_chunk(self._pending)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            os.write(self._fd, data)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self.n_points += len(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            self.flush()
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> ResultsStoreWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class _locked:
+    """Exclusive flock on an open file for the duration of a with block."""
+
+    def __init__(self, f: Any) -> None:
+        self.f = f
+
+    def __enter__(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_EX)
+
+    def __exit__(self, *exc: object) -> None:
+        if fcntl is not None:
+            fcntl.flock(self.f.fileno(), fcntl.LOCK_UN)
+
+
+def _check_file_header(path: Path) -> None:
+    with open(path, "rb") as f:
+        head = f.read(_FILE_HEADER.size)
+    if len(head) < _FILE_HEADER.size:
+        raise ValueError(f"{path}: not a results store (too short)")
+    magic, version, _ = _FILE_HEADER.unpack(head)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: unsupported results store (magic={magic!r}, version={version})")
+
+
+def _scan_chunks(buf: mmap.mmap | bytes) -> tuple[list[dict[str, Any]], list[int], int]:
+    """Parse chunk headers: (headers, data start per chunk, end of the last complete chunk)."""
+    headers: list[dict[str, Any]] = []
+    data_pos: list[int] = []
+    pos = _FILE_HEADER.size
+    size = len(buf)
+    while pos + _CHUNK_LEN.size <= size:
+        (hlen,) = _CHUNK_LEN.unpack_from(buf, pos)
+        start = pos + _CHUNK_LEN.size
+        if start + hlen > size:
+            break
+        try:
+            header = json.loads(bytes(buf[start : start + hlen]))
+        except ValueError:
+            break
+        if start + hlen + header["data_len"] > size:
+            break
+        headers.append(header)
+        data_pos.append(start + hlen)
+        pos = start + hlen + header["data_len"]
+    return headers, data_pos, pos
+
+
+class ResultsStore:
+    """Memory-mapped reader of a `.rcol` store with column projection and predicates.
+
+    Inputs: path.
+    Outputs: iter_chunks / read return {column: array} for the requested columns of
+    the points matching `where` ((column, op, value) triples, ANDed; ops ==, !=, <, <=,
+    >, >=, in); points() rebuilds ExperimentPoints.
+    Invariants: only chunk headers are parsed on open; a query touches the mmap pages of
+    the columns it projects or filters on and nothing else. Columns a chunk lacks read
+    as NaN (float), False (bool) or -1 (int).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        _check_file_header(self.path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._headers, self._data_pos, _ = _scan_chunks(self._mm)
+        self._dtypes: dict[str, np.dtype] = {}
+        for h in self._headers:
+            for c in h["columns"]:
+                self._dtypes.setdefault(c["name"], np.dtype(c["dtype"]))
+        self._layout = [{c["name"]: c for c in h["columns"]} for h in self._headers]
+
+    def __len__(self) -> int:
+        return sum(h["n_points"] for h in self._headers)
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._headers)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return tuple(self._dtypes)
+
+    @property
+    def metric_names(self) -> tuple[str, ...]:
+        n = len(METRIC_PREFIX)
+        return tuple(c[n:] for c in self._dtypes if c.startswith(METRIC_PREFIX))
+
+    def column(self, i: int, name: str) -> np.ndarray:
+        """Column `name` of chunk i: a read-only view into the map when the chunk has it."""
+        if name not in self._dtypes:
+            raise KeyError(f"{self.path}: no column {name!r}")
+        n = self._headers[i]["n_points"]
+        c = self._layout[i].get(name)
+        if c is None:
+            dtype = self._dtypes[name]
+            return np.full(n, _fill_value(dtype), dtype=dtype)
+        return np.frombuffer(self._mm, dtype=np.dtype(c["dtype"]), count=n, offset=self._data_pos[i] + c["offset"])
+
+    def _mask(self, i: int, where: Predicate | None) -> np.ndarray | None:
+        mask = None
+        for name, op, value in where or ():
+            if op not in _OPS:
+                raise ValueError(f"unknown operator {op!r}; choose from {tuple(_OPS)}")
+            m = _OPS[op](self.column(i, name), value)
+            mask = m if mask is None else mask & m
+        return mask
+
+    def iter_chunks(
+        self, columns: Sequence[str] | None = None, where: Predicate | None = None
+    ) -> Iterator[dict[str, np.ndarray]]:
+        """Per chunk, {column: array} of the matching points (views without `where`)."""
+        names = self.columns if columns is None else tuple(columns)
+        for i in range(self.n_chunks):
+            mask = self._mask(i, where)
+            if mask is not None and not mask.any():
+                continue
+            cols = {name: self.column(i, name) for name in names}
+            yield cols if mask is None else {name: arr[mask] for name, arr in cols.items()}
+
+    def read(self, columns: Sequence[str] | None = None, where: Predicate | None = None) -> dict[str, np.ndarray]:
+        """Requested columns of all matching points, concatenated over chunks."""
+        names = self.columns if columns is None else tuple(columns)
+        parts = list(self.iter_chunks(names, where))
+        return {
+            name: np.concatenate([p[name] for p in parts]) if parts else np.empty(0, dtype=self._dtypes[name])
+            for name in names
+        }
+
+    def keys(self) -> list[str]:
+        return [k for h in self._headers for k in h["keys"]]
+
+    def points(self, where: Predicate | None = None) -> Iterator[ExperimentPoint]:
+        """Matching points as ExperimentPoints (metrics a point lacks stay absent)."""
+        n = len(METRIC_PREFIX)
+        for i, h in enumerate(self._headers):
+            mask = self._mask(i, where)
+            cols = {name: self.column(i, name) for name in self._layout[i]}
+            rows = range(h["n_points"]) if mask is None else np.flatnonzero(mask).tolist()
+            for j in rows:
+                point = ExperimentPoint(**{name: cols[name][j].item() for name in POINT_COLUMNS})
+                if cols["has_result"][j]:
+                    core, group = h["allocations"][j]
+                    point.result = SimulationResult(
+                        task_set_id=h["task_set_ids"][j],
+                        feasible=bool(cols["feasible"][j]),
+                        core_allocation=core,
+                        group_allocation=group,
+                        metrics={
+                            name[n:]: float(arr[j])
+                            for name, arr in cols.items()
+                            if name.startswith(METRIC_PREFIX) and not np.isnan(arr[j])
+                        },
+                    )
+                yield point
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            # Views handed out by column() still reference the map; GC releases it.
+            pass
+        self._file.close()
+
+    def __enter__(self) -> ResultsStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
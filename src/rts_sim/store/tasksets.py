@@ -0,0 +1,446 @@
+"""Streaming on-disk task-set formats: chunked binary arrays and JSONL. PDF §2.
+
+Binary layout (`.rtsb`):
+    file header  : MAGIC (8 bytes) + uint32 version + uint32 reserved
+    chunk*       : uint64 header_len + JSON header (padded to 8 bytes) + array data
+The chunk header lists task/node/resource ids, user metadata and, for each
+PackedTaskSet array, its dtype, length and offset in the data block (8-byte aligned).
+Chunks are appended as tasks are produced; readers mmap the file, index chunk
+headers only, and return zero-copy array views on demand. A truncated trailing chunk
+(e.g. from an interrupted run) is ignored.
+
+JSONL layout (`.jsonl`): one DAGTask JSON document per line; a packed task set (e.g.
+one set of a corpus) is preceded by a header line {"meta": ..., "n_tasks": k}, so
+readers see the same chunks and metadata as in the binary format. Whole-set loads
+(`to_task_set`) refuse files holding several sets.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import struct
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+
+import numpy as np
+
+from rts_sim.models import DAGTask, TaskSet
+from rts_sim.packed import PackedTaskSet
+
+MAGIC = b"RTSTSET\x00"
+VERSION = 1
+BINARY_SUFFIX = ".rtsb"
+JSONL_SUFFIX = ".jsonl"
+
+_FILE_HEADER = struct.Struct("<8sII")
+_CHUNK_LEN = struct.Struct("<Q")
+_STR_FIELDS = ("task_ids", "node_ids", "resource_ids")
+_ARRAY_FIELDS = tuple(f.name for f in fields(PackedTaskSet) if f.name not in _STR_FIELDS)
+# JSONL set header lines start with this prefix; task lines never do.
+_JSONL_HEADER = b'{"meta":'
+
+
+def _pad8(n: int) -> int:
+    return (-n) % 8
+
+
+class BinaryTaskSetWriter:
+    """Append tasks to a `.rtsb` file in chunks. PDF §2.
+
+    Inputs: path, chunk_size (tasks buffered before a chunk is written), append flag.
+    Outputs: file on disk; `write_task` buffers pydantic tasks, `write_packed` writes a
+    packed task set as one chunk immediately.
+    Invariants: every flushed chunk is complete on disk before the next one starts;
+    appending first truncates an incomplete trailing chunk.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = 256, append: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = max(1, chunk_size)
+        self.n_tasks = 0
+        self._pending: list[DAGTask] = []
+        exists = append and self.path.exists() and self.path.stat().st_size > 0
+        if exists:
+            _check_file_header(self.path)
+            # Drop a torn trailing chunk so appended chunks stay readable.
+            self._f: BinaryIO = open(self.path, "r+b")
+            with mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                _, _, end = _scan_chunks(mm)
+            self._f.truncate(end)
+            self._f.seek(end)
+        else:
+            self._f = open(self.path, "wb")
+            self._f.write(_FILE_HEADER.pack(MAGIC, VERSION, 0))
+
+    def write_task(self, task: DAGTask) -> None:
+        self._pending.append(task)
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def write_packed(self, packed: PackedTaskSet, meta: dict[str, Any] | None = None) -> None:
+        """Write a packed task set as one chunk (pending tasks are flushed first)."""
+        self.flush()
+        self._write_chunk(packed, meta or {})
+
+    def flush(self) -> None:
+        if self._pending:
+            packed = PackedTaskSet.from_task_set(TaskSet(tasks=self._pending))
+            self._pending = []
+            self._write_chunk(packed, {})
+        self._f.flush()
+
+    def _write_chunk(self, packed: PackedTaskSet, meta: dict[str, Any]) -> None:
+        arrays = []
+        offset = 0
+        for name in _ARRAY_FIELDS:
+            arr = np.ascontiguousarray(getattr(packed, name))
+            arrays.append((name, arr, offset))
+            offset += arr.nbytes + _pad8(arr.nbytes)
+        header = {
+            "n_tasks": packed.n_tasks,
+            "meta": meta,
+            **{name: list(getattr(packed, name)) for name in _STR_FIELDS},
+            "arrays": [
+                {"name": n, "dtype": a.dtype.newbyteorder("<").str, "length": a.size, "offset": o}
+                for n, a, o in arrays
+            ],
+            "data_len": offset,
+        }
+        raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        raw += b" " * _pad8(_CHUNK_LEN.size + len(raw))
+        self._f.write(_CHUNK_LEN.pack(len(raw)))
+        self._f.write(raw)
+        for _, arr, _ in arrays:
+            self._f.write(arr.astype(arr.dtype.newbyteorder("<"), copy=False).tobytes())
+            self._f.write(b"\0" * _pad8(arr.nbytes))
+        self.n_tasks += packed.n_tasks
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self.flush()
+            self._f.close()
+
+    def __enter__(self) -> BinaryTaskSetWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _check_single_set(metas: list[dict[str, Any]], path: Path) -> None:
+    """ValueError if the chunks belong to more than one task set (meta "set")."""
+    sets = {m["set"] for m in metas if "set" in m}
+    if len(sets) > 1:
+        raise ValueError(f"{path} holds {len(sets)} task sets; read them one by one with chunk(i) / iter_chunks()")
+
+
+def _check_file_header(path: Path) -> None:
+    with open(path, "rb") as f:
+        head = f.read(_FILE_HEADER.size)
+    if len(head) < _FILE_HEADER.size:
+        raise ValueError(f"{path}: not a task-set file (too short)")
+    magic, version, _ = _FILE_HEADER.unpack(head)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: unsupported task-set file (magic={magic!r}, version={version})")
+
+
+def _scan_chunks(buf: mmap.mmap | bytes) -> tuple[list[dict[str, Any]], list[int], int]:
+    """Parse chunk headers: (headers, data start per chunk, end of the last complete chunk)."""
+    headers: list[dict[str, Any]] = []
+    data_pos: list[int] = []
+    pos = _FILE_HEADER.size
+    size = len(buf)
+    while pos + _CHUNK_LEN.size <= size:
+        (hlen,) = _CHUNK_LEN.unpack_from(buf, pos)
+        start = pos + _CHUNK_LEN.size
+        if start + hlen > size:
+            break
+        try:
+            header = json.loads(bytes(buf[start : start + hlen]))
+        except ValueError:
+            break
+        if start + hlen + header["data_len"] > size:
+            break
+        headers.append(header)
+        data_pos.append(start + hlen)
+        pos = start + hlen + header["data_len"]
+    return headers, data_pos, pos
+
+
+class BinaryTaskSetReader:
+    """Lazy, memory-mapped reader for `.rtsb` files. PDF §2.
+
+    Inputs: path.
+    Outputs: chunk/task access without loading the whole file: `chunk(i)` returns a
+    PackedTaskSet of mmap views, `task(i)` a single DAGTask, `__iter__` streams tasks.
+    Invariants: only chunk headers are parsed when the reader opens.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        _check_file_header(self.path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._headers, self._data_pos, _ = _scan_chunks(self._mm)
+        self._task_offsets = np.concatenate(
+            [[0], np.cumsum([h["n_tasks"] for h in self._headers], dtype=np.int64)]
+        ).tolist()
+
+    def __len__(self) -> int:
+        return self._task_offsets[-1]
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._headers)
+
+    def chunk_meta(self, i: int) -> dict[str, Any]:
+        return self._headers[i]["meta"]
+
+    def chunk(self, i: int, copy: bool = False) -> PackedTaskSet:
+        """Chunk i as a PackedTaskSet; views into the map unless copy=True."""
+        header = self._headers[i]
+        base = self._data_pos[i]
+        arrays = {
+            a["name"]: np.frombuffer(
+                self._mm, dtype=np.dtype(a["dtype"]), count=a["length"], offset=base + a["offset"]
+            )
+            for a in header["arrays"]
+        }
+        if copy:
+            arrays = {name: arr.copy() for name, arr in arrays.items()}
+        strs = {name: tuple(header[name]) for name in _STR_FIELDS}
+        return PackedTaskSet(**strs, **arrays)
+
+    def iter_chunks(self) -> Iterator[PackedTaskSet]:
+        for i in range(self.n_chunks):
+            yield self.chunk(i)
+
+    def task(self, i: int) -> DAGTask:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        c = bisect.bisect_right(self._task_offsets, i) - 1
+        return self.chunk(c).task(i - self._task_offsets[c])
+
+    def __iter__(self) -> Iterator[DAGTask]:
+        for packed in self.iter_chunks():
+            for j in range(packed.n_tasks):
+                yield packed.task(j)
+
+    def to_task_set(self) -> TaskSet:
+        _check_single_set([h["meta"] for h in self._headers], self.path)
+        return TaskSet(tasks=list(self))
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            # Views handed out by chunk() still reference the map; GC releases it.
+            pass
+        self._file.close()
+
+    def __enter__(self) -> BinaryTaskSetReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class JsonlTaskSetWriter:
+    """Append DAGTask JSON lines as tasks are produced. PDF §2.
+
+    Inputs: path, append flag.
+    Outputs: file on disk; `write_task` writes one task line, `write_packed` writes a set
+    header line ({"meta": ..., "n_tasks": k}) followed by the set's k task lines.
+    """
+
+    def __init__(self, path: Path, append: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.n_tasks = 0
+        self._f = open(self.path, "a" if append else "w", encoding="utf-8")
+
+    def write_task(self, task: DAGTask) -> None:
+        self._f.write(task.model_dump_json())
+        self._f.write("\n")
+        self.n_tasks += 1
+
+    def write_packed(self, packed: PackedTaskSet, meta: dict[str, Any] | None = None) -> None:
+        """Write a packed task set as one chunk: its header line, then its tasks."""
+        header = {"meta": meta or {}, "n_tasks": packed.n_tasks}
+        self._f.write(json.dumps(header, separators=(",", ":")))
+        self._f.write("\n")
+        for j in range(packed.n_tasks):
+            self.write_task(packed.task(j))
+        self._f.flush()
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self) -> JsonlTaskSetWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class JsonlTaskSetReader:
+    """Lazy JSONL reader: line offsets found via mmap, tasks parsed on access. PDF §2.
+
+    Inputs: path, chunk_size (grouping of tasks written one by one).
+    Outputs: the same access as BinaryTaskSetReader: `chunk(i)` / `chunk_meta(i)` /
+    `iter_chunks()` per chunk, `task(i)` and `__iter__` per task.
+    Invariants: a set header starts a chunk of its n_tasks lines (a set cut short by an
+    interrupted write is ignored); task lines outside a set form chunks of chunk_size.
+    Only set header lines are parsed when the reader opens.
+    """
+
+    def __init__(self, path: Path, chunk_size: int = 256) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._starts: list[int] = []
+        self._chunk_offsets = [0]
+        self._metas: list[dict[str, Any]] = []
+        chunk_size = max(1, chunk_size)
+        expected = 0  # task lines the open set still lacks
+        pos = 0
+        while self._mm is not None and pos < size:
+            end = self._mm.find(b"\n", pos)
+            end = size if end < 0 else end
+            if end > pos:
+                if self._mm[pos : pos + len(_JSONL_HEADER)] == _JSONL_HEADER:
+                    if expected:
+                        self._drop_open_chunk()  # a set cut short, then appended to
+                    self._end_chunk()
+                    header = json.loads(self._mm[pos:end])
+                    self._metas.append(header["meta"])
+                    expected = header["n_tasks"]
+                    if not expected:
+                        self._end_chunk()
+                else:
+                    if not expected:
+                        # A loose task line: add it to the open chunk of loose lines.
+                        if self._chunk_open() and len(self._starts) - self._chunk_offsets[-1] == chunk_size:
+                            self._end_chunk()
+                        if not self._chunk_open():
+                            self._metas.append({})
+                    self._starts.append(pos)
+                    if expected:
+                        expected -= 1
+                        if not expected:
+                            self._end_chunk()
+            pos = end + 1
+        if expected:
+            self._drop_open_chunk()
+        self._end_chunk()
+        self._size = size
+
+    def _chunk_open(self) -> bool:
+        return len(self._metas) == len(self._chunk_offsets)
+
+    def _end_chunk(self) -> None:
+        if self._chunk_open():
+            self._chunk_offsets.append(len(self._starts))
+
+    def _drop_open_chunk(self) -> None:
+        del self._starts[self._chunk_offsets[-1] :]
+        self._metas.pop()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @property
+    def n_chunks(self) -> int:
+        return len(self._metas)
+
+    def chunk_meta(self, i: int) -> dict[str, Any]:
+        return self._metas[i]
+
+    def chunk(self, i: int) -> PackedTaskSet:
+        tasks = [self.task(j) for j in range(self._chunk_offsets[i], self._chunk_offsets[i + 1])]
+        return PackedTaskSet.from_task_set(TaskSet(tasks=tasks))
+
+    def iter_chunks(self) -> Iterator[PackedTaskSet]:
+        for i in range(self.n_chunks):
+            yield self.chunk(i)
+
+    def task(self, i: int) -> DAGTask:
+        start = self._starts[i]
+        end = self._mm.find(b"\n", start)
+        return DAGTask.model_validate_json(self._mm[start : self._size if end < 0 else end])
+
+    def __iter__(self) -> Iterator[DAGTask]:
+        for i in range(len(self)):
+            yield self.task(i)
+
+    def to_task_set(self) -> TaskSet:
+        _check_single_set(self._metas, self.path)
+        return TaskSet(tasks=list(self))
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> JsonlTaskSetReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def open_task_set_writer(
+    path: Path, chunk_size: int = 256, append: bool = False
+) -> BinaryTaskSetWriter | JsonlTaskSetWriter:
+    """Streaming writer chosen by suffix (`.rtsb` binary, `.jsonl` JSON lines)."""
+    path = Path(path)
+    if path.suffix == BINARY_SUFFIX:
+        return BinaryTaskSetWriter(path, chunk_size=chunk_size, append=append)
+    if path.suffix == JSONL_SUFFIX:
+        return JsonlTaskSetWriter(path, append=append)
+    raise ValueError(f"no streaming task-set format for suffix {path.suffix!r}")
+
+
+def open_task_set_reader(path: Path) -> BinaryTaskSetReader | JsonlTaskSetReader:
+    """Lazy reader chosen by suffix (`.rtsb` binary, `.jsonl` JSON lines)."""
+    path = Path(path)
+    if path.suffix == BINARY_SUFFIX:
+        return BinaryTaskSetReader(path)
+    if path.suffix == JSONL_SUFFIX:
+        return JsonlTaskSetReader(path)
+    raise ValueError(f"no streaming task-set format for suffix {path.suffix!r}")
+
+
+def is_streaming_path(path: Path) -> bool:
+    return Path(path).suffix in (BINARY_SUFFIX, JSONL_SUFFIX)
+
+
+def write_task_sets(
+    packed_sets: Iterable[PackedTaskSet],
+    path: Path,
+    chunk_size: int = 256,
+) -> int:
+    """Stream packed task sets to `path` (one chunk per set); return tasks written."""
+    with open_task_set_writer(path, chunk_size=chunk_size) as w:
+        for j, packed in enumerate(packed_sets):
+            w.write_packed(packed, meta={"set": j})
+        w.flush()
+        return w.n_tasks
+
+
+def load_task_set(path: Path) -> TaskSet:
+    """Load a whole task set from `.json`, `.jsonl` or `.rtsb`."""
+    path = Path(path)
+    if path.suffix == ".json":
+        return TaskSet.model_validate_json(path.read_bytes())
+    with open_task_set_reader(path) as r:
+        return r.to_task_set()
@@ -1,6 +1,7 @@
-"""Utilities: random seeds, logging, types."""
+"""Utilities: random seeds, logging, worker counts, types."""
 
 from rts_sim.utils.logging import setup_logging
-from rts_sim.utils.seeds import get_rng, set_global_seed
+from rts_sim.utils.seeds import RngStreams, get_rng, rng_stream, set_global_seed
+from rts_sim.utils.workers import resolve_workers
 
-__all__ = ["setup_logging", "get_rng", "set_global_seed"]
+__all__ = ["setup_logging", "get_rng", "set_global_seed", "rng_stream", "RngStreams", "resolve_workers"]
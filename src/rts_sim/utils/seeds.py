@@ -1,35 +1,105 @@
 """Random seed handling for reproducibility.
 
 PDF reference: Section 2 (task generation), Section 4 (resource allocation).
-Inputs: optional seed (int).
-Outputs: numpy/random RNG or seed set.
-Invariants: same seed yields same task set and resource distribution.
+Inputs: optional seed (int), stream path (names / indices).
+Outputs: independent numpy Generators.
+Invariants: same seed yields same task set and resource distribution; no global RNG
+state is touched, so streams can be consumed concurrently and in any order.
+
+Streams are addressed by a path below the root seed, e.g.
+`rng_stream(cfg.seed, "point", 17, "gen")`. Each path maps to its own
+`numpy.random.SeedSequence` (root entropy + spawn_key), so a stream's output depends
+only on (seed, path), never on which other streams were drawn first.
 """
 
-import random
-from typing import Any
+from __future__ import annotations
+
+import zlib
+from typing import Union
+
+import numpy as np
 
-# TODO: use numpy.random.default_rng(seed) when implementing gen/resources
+SeedLike = Union[int, np.random.SeedSequence, np.random.Generator, None]
+PathKey = Union[int, str]
 
 _seed: int | None = None
 
 
 def set_global_seed(seed: int) -> None:
-    """Set global random seed for reproducibility. PDF §2, §4."""
+    """Set the default seed used by get_rng(None). PDF §2, §4."""
     global _seed
     _seed = seed
-    random.seed(seed)
-    # TODO: numpy.random.seed(seed) if using numpy
 
 
-def get_rng(seed: int | None = None) -> Any:
-    """Return a RNG instance. If seed is None, use global seed. PDF §2, §4.
+def get_rng(seed: SeedLike = None) -> np.random.Generator:
+    """Return a numpy Generator. If seed is None, use the default seed. PDF §2, §4.
+
+    Inputs: int seed, SeedSequence, an existing Generator (returned as-is) or None.
+    Outputs: numpy Generator; a fresh one per call unless a Generator was passed.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed if seed is not None else _seed)
+
+
+def _key(part: PathKey) -> int:
+    """Stable non-negative integer for a path component (names hashed with CRC32)."""
+    if isinstance(part, str):
+        return zlib.crc32(part.encode("utf-8"))
+    if part < 0:
+        raise ValueError(f"stream path index must be >= 0, got {part}")
+    return int(part)
+
+
+def stream_seed(seed: int, *path: PathKey) -> np.random.SeedSequence:
+    """SeedSequence of the stream at `path` below root `seed`."""
+    return np.random.SeedSequence(entropy=seed, spawn_key=tuple(_key(p) for p in path))
+
+
+def rng_stream(seed: int, *path: PathKey) -> np.random.Generator:
+    """Generator of the stream at `path` below root `seed`."""
+    return np.random.default_rng(stream_seed(seed, *path))
+
 
-    Inputs: optional seed.
-    Outputs: random number generator (currently stdlib random).
+class RngStreams:
+    """Addressable tree of independent RNG streams below one root seed.
+
+    Inputs: root seed (e.g. Config.seed) and an optional path prefix.
+    Outputs: child nodes (`child`) and Generators (`rng`) for any sub-path.
+    Invariants: picklable and immutable; rng(*p) is bit-identical across threads,
+    processes and call orders for the same (seed, prefix + p).
     """
-    s = seed if seed is not None else _seed
-    if s is not None:
-        random.seed(s)
-    return random
-    # TODO: return np.random.default_rng(s) for RandFixedSum / UUniFast
+
+    __slots__ = ("seed", "path")
+
+    def __init__(self, seed: int, path: tuple[PathKey, ...] = ()) -> None:
+        self.seed = int(seed)
+        self.path = tuple(path)
+
+    def child(self, *path: PathKey) -> RngStreams:
+        return RngStreams(self.seed, self.path + path)
+
+    def spawn(self, n: int) -> list[RngStreams]:
+        """n indexed children (e.g. one per task or per sweep point)."""
+        return [self.child(i) for i in range(n)]
+
+    def seed_sequence(self, *path: PathKey) -> np.random.SeedSequence:
+        return stream_seed(self.seed, *self.path, *path)
+
+    def rng(self, *path: PathKey) -> np.random.Generator:
+        return rng_stream(self.seed, *self.path, *path)
+
+    def __repr__(self) -> str:
+        return f"RngStreams(seed={self.seed}, path={self.path!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, RngStreams) and (self.seed, self.path) == (other.seed, other.path)
+
+    def __hash__(self) -> int:
+        return hash((self.seed, self.path))
+
+    def __getstate__(self) -> tuple[int, tuple[PathKey, ...]]:
+        return self.seed, self.path
+
+    def __setstate__(self, state: tuple[int, tuple[PathKey, ...]]) -> None:
+        self.seed, self.path = state
@@ -0,0 +1,13 @@
+"""Process-pool sizing shared by the sweep executor and the plot renderer.
+
+Inputs: a requested worker count.
+Outputs: the number of processes to start.
+Invariants: no side effects.
+"""
+
+import os
+
+
+def resolve_workers(workers: int) -> int:
+    """Worker count; 0 means one per CPU."""
+    return workers if workers > 0 else os.cpu_count() or 1
@@ -0,0 +1,66 @@
+"""Builders for small hand-built task sets shared by the scheduling tests."""
+
+import numpy as np
+
+from rts_sim.models import Criticality, DAGTask, Edge, Node, Segment, TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.sched.simulator import SimStats, simulate
+
+HI, LO = Criticality.HI, Criticality.LO
+
+
+def make_task(tid: str, T: float, nodes: list[Node], edges: list[tuple[str, str]] | None = None) -> DAGTask:
+    """DAG source -> nodes -> sink; by default every node is between source and sink."""
+    src = Node(id=f"{tid}_src", c_normal=0, c_overflow=0)
+    snk = Node(id=f"{tid}_snk", c_normal=0, c_overflow=0)
+    if edges is None:
+        edges = [(src.id, n.id) for n in nodes] + [(n.id, snk.id) for n in nodes]
+    return DAGTask(
+        task_id=tid,
+        nodes=[src, *nodes, snk],
+        edges=[Edge(src=a, dst=b) for a, b in edges],
+        T=T,
+        D=T,
+        U_normal=0,
+        U_overflow=0,
+        C_normal=0,
+        C_overflow=0,
+        L_normal=0,
+        L_overflow=0,
+    )
+
+
+def make_node(nid: str, c: float, crit: Criticality = LO, c_over: float | None = None, segs=None) -> Node:
+    return Node(id=nid, criticality=crit, c_normal=c, c_overflow=c if c_over is None else c_over, segments=segs or [])
+
+
+def segment(critical: bool, length: float, res: str | None = None) -> Segment:
+    kind = Segment.Kind.CRITICAL if critical else Segment.Kind.NORMAL
+    return Segment(kind=kind, length_normal=length, length_overflow=length, resource_id=res)
+
+
+def timed_task(tid: str, T: float, nodes: list[Node]) -> DAGTask:
+    """Parallel nodes between source and sink, with C, L and U filled in."""
+    t = make_task(tid, T, nodes)
+    C_n, C_o = sum(n.c_normal for n in nodes), sum(n.c_overflow for n in nodes)
+    L_n, L_o = max(n.c_normal for n in nodes), max(n.c_overflow for n in nodes)
+    return t.model_copy(
+        update=dict(C_normal=C_n, C_overflow=C_o, L_normal=L_n, L_overflow=L_o, U_normal=C_n / T, U_overflow=C_o / T)
+    )
+
+
+def cross_lock_tasks() -> list[DAGTask]:
+    """Job a holds r0 and waits for r1 while job b holds r1 and waits for r0."""
+
+    def task(tid: str, mine: str, other: str) -> DAGTask:
+        holder = make_node(f"{tid}1", 5, HI, segs=[segment(True, 5, mine)])
+        waiter = make_node(f"{tid}2", 6, LO, segs=[segment(False, 1), segment(True, 5, other)])
+        return make_task(tid, 40, [holder, waiter])
+
+    return [task("a", "r0", "r1"), task("b", "r1", "r0")]
+
+
+def run_tasks(tasks: list[DAGTask], clusters: list[int], cores: list[int], horizon: float, **kw) -> SimStats:
+    """Simulate hand-built tasks with an explicit task -> cluster map and cluster sizes."""
+    packed = PackedTaskSet.from_task_set(TaskSet(tasks=tasks))
+    return simulate(packed, np.array(clusters), np.array(cores), horizon=horizon, **kw)
@@ -0,0 +1,95 @@
+"""Streaming group-by aggregation tests."""
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from rts_sim.analysis.aggregate import GROUP_KEYS, StreamingAggregator, Welford, aggregate_results, wilson_interval
+from rts_sim.models import ExperimentPoint, SimulationResult
+
+
+def _point(m: int, U: float, feasible: bool, **metrics: float) -> ExperimentPoint:
+    return ExperimentPoint(
+        n_tasks=5,
+        m=m,
+        U_norm=U,
+        n_resources=2,
+        total_resource_accesses=4,
+        result=SimulationResult(feasible=feasible, metrics=metrics),
+    )
+
+
+def test_welford_matches_numpy_and_merges() -> None:
+    x = np.random.default_rng(0).normal(3.0, 2.0, 101)
+    acc, left, right = Welford(), Welford(), Welford()
+    for v in x:
+        acc.add(v)
+    for v in x[:40]:
+        left.add(v)
+    for v in x[40:]:
+        right.add(v)
+    left.merge(right)
+    for w in (acc, left):
+        assert w.n == 101
+        assert w.mean == pytest.approx(x.mean()) and w.variance == pytest.approx(x.var(ddof=1))
+
+
+def test_groups_and_overall_summary() -> None:
+    points = [
+        _point(2, 0.5, True, events=10.0),
+        _point(2, 0.5, False, events=20.0),
+        _point(4, 0.5, True, events=4.0, mode_switches=1.0),
+        _point(2, 0.7, True),
+    ]
+    agg = StreamingAggregator(by=("m",)).update(iter(points))
+    assert list(agg.groups) == [(2,), (4,)]
+    rows = agg.rows()
+    assert rows[0]["m"] == 2 and rows[0]["n_points"] == 3 and rows[0]["feasibility_ratio"] == pytest.approx(2 / 3)
+    assert rows[0]["events_mean"] == 15.0 and rows[0]["events_n"] == 2
+    assert rows[0]["events_std"] == pytest.approx(np.std([10, 20], ddof=1))
+    assert rows[0]["events_ci"] == pytest.approx(1.959964 * rows[0]["events_std"] / np.sqrt(2), rel=1e-5)
+    assert "mode_switches_mean" not in rows[0] and rows[1]["mode_switches_mean"] == 1.0
+    total = agg.total().summary()
+    assert total["n_points"] == 4 and total["feasibility_ratio"] == 0.75 and total["events_n"] == 3
+    assert total == aggregate_results(points)
+    assert aggregate_results([]) == {}
+
+
+def test_memory_is_per_group() -> None:
+    agg = StreamingAggregator(by=("m", "U_norm"), metrics=("events",))
+    for k in range(1000):
+        agg.add(_point(2 + k % 2, 0.5, k % 3 == 0, events=float(k), other=1.0))
+    assert len(agg.groups) == 2
+    assert all(list(g.metrics) == ["events"] for g in agg.groups.values())
+    assert agg.total().n_points == 1000
+
+
+def test_wilson_interval() -> None:
+    assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+    low, high = wilson_interval(10, 10, 1.96)
+    assert high == pytest.approx(1.0) and 0.7 < low < 0.75
+    low, high = wilson_interval(5, 10, 1.96)
+    assert low == pytest.approx(1 - high)
+
+
+def test_invalid_grouping() -> None:
+    with pytest.raises(ValueError):
+        StreamingAggregator(by=("seed",))
+    with pytest.raises(ValueError):
+        StreamingAggregator(by=("m",)).merge(StreamingAggregator(by=()))
+
+
+def test_write_csv_and_json(tmp_path) -> None:
+    points = [_point(2, 0.5, True, events=1.0), _point(4, 0.5, False, events=3.0, misses=1.0)]
+    out = aggregate_results(points, tmp_path / "agg.csv", by=GROUP_KEYS)
+    assert out["n_points"] == 2
+    with open(tmp_path / "agg.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0])[: len(GROUP_KEYS) + 1] == [*GROUP_KEYS, "n_points"]
+    assert [r["m"] for r in rows] == ["2", "4"] and rows[0]["misses_mean"] == ""
+    agg = StreamingAggregator(by=("m",)).update(points)
+    doc = json.loads(agg.write(tmp_path / "agg.json").read_text(encoding="utf-8"))
+    assert doc["group_by"] == ["m"] and doc["confidence"] == 0.95
+    assert [g["feasibility_ratio"] for g in doc["groups"]] == [1.0, 0.0]
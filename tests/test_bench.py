@@ -0,0 +1,62 @@
+"""Benchmark suite tests."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from rts_sim.bench.suite import (
+    BENCHMARKS,
+    BenchParams,
+    BenchResult,
+    compare,
+    load_results,
+    param_grid,
+    run_benchmarks,
+    time_call,
+    write_results,
+)
+
+SMALL = BenchParams(n_tasks=3, nodes_per_task=4, m=4, total_resource_accesses=6, n_resources=2)
+
+
+def test_every_benchmark_runs() -> None:
+    seen = []
+    results = run_benchmarks([SMALL], repeat=1, min_time=0.0, progress=seen.append)
+    assert [r.name for r in results] == list(BENCHMARKS) and seen == results
+    assert all(r.best_s > 0 and r.mean_s >= r.best_s and r.number >= 1 for r in results)
+    with pytest.raises(KeyError):
+        run_benchmarks([SMALL], ["nope"])
+
+
+def test_param_grid_and_keys() -> None:
+    grid = param_grid([5, 10], [20], [4, 8], [40])
+    assert [(p.n_tasks, p.m) for p in grid] == [(5, 4), (5, 8), (10, 4), (10, 8)]
+    assert BenchResult("wfd", grid[0], 1.0, 1.0, 1, 1).key == "wfd[n=5,v=20,m=4,a=40]"
+
+
+def test_time_call_calibrates_number() -> None:
+    calls = []
+    best, mean, number = time_call(lambda: calls.append(1), repeat=3, min_time=0.001)
+    assert number > 1 and len(calls) >= 3 * number
+    assert 0 < best <= mean
+
+
+def test_baseline_round_trip_and_regressions(tmp_path: Path) -> None:
+    base = [BenchResult("wfd", SMALL, 1.0, 1.0, 1, 1), BenchResult("grouping", SMALL, 2.0, 2.0, 1, 1)]
+    path = write_results(tmp_path / "base.json", base)
+    baseline = load_results(path)
+    assert baseline == {r.key: r.best_s for r in base}
+    now = [
+        BenchResult("wfd", SMALL, 1.2, 1.2, 1, 1),
+        BenchResult("grouping", SMALL, 2.6, 2.6, 1, 1),
+        BenchResult("federated", SMALL, 9.0, 9.0, 1, 1),
+    ]
+    out = compare(now, baseline, threshold=0.25)
+    assert [(c.key, c.regressed) for c in out] == [(base[0].key, False), (base[1].key, True)]
+    assert out[1].ratio == pytest.approx(1.3)
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    doc["version"] = -1
+    path.write_text(json.dumps(doc), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_results(path)
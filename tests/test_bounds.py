@@ -0,0 +1,101 @@
+"""Analytical schedulability tiers and WFD placement tests."""
+
+import numpy as np
+import pytest
+
+from rts_sim.models import Criticality, Segment, TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.partition.federated import federated_core_allocation, wfd_placement
+from rts_sim.sched.bounds import (
+    TIER_FEDERATED,
+    TIER_RESPONSE_TIME,
+    TIER_SIMULATION,
+    TIER_UTILIZATION,
+    analytic_verdict,
+    blocking_bound,
+)
+from rts_sim.sched.ca_edf import ca_edf_schedule
+from tests.helpers import make_node, timed_task
+
+HI, LO = Criticality.HI, Criticality.LO
+
+
+def _verdict(tasks, m: int, lo_droppable: bool = True):
+    ts = TaskSet(tasks=tasks)
+    alloc = federated_core_allocation(ts, m)
+    part = wfd_placement(ts, alloc, m)
+    return analytic_verdict(PackedTaskSet.from_task_set(ts), m, alloc, part, lo_droppable), alloc, part
+
+
+def _crit(length: float, res: str = "r") -> list[Segment]:
+    return [Segment(kind=Segment.Kind.CRITICAL, length_normal=length, length_overflow=length, resource_id=res)]
+
+
+def test_wfd_least_loaded_core_first() -> None:
+    ts = TaskSet(tasks=[timed_task(f"t{k}", 10, [make_node("a", c)]) for k, c in enumerate([5, 4, 3, 2])])
+    part = wfd_placement(ts, federated_core_allocation(ts, 2), 2)
+    assert part == {0: ["t0", "t3"], 1: ["t1", "t2"]}
+
+
+def test_heavy_tasks_beyond_m_are_rejected_by_federated_tier() -> None:
+    heavy = timed_task("h", 10, [make_node(f"n{k}", 5, HI) for k in range(4)])  # C=20, L=5 -> m_i = 3
+    v, alloc, _ = _verdict([heavy], 2)
+    assert alloc == {"h": 3}
+    assert (v.tier, v.feasible, v.fits) == (TIER_FEDERATED, False, False)
+    v, _, _ = _verdict([heavy], 3)
+    assert (v.tier, v.feasible) == (TIER_RESPONSE_TIME, True)
+
+
+def test_light_core_overload_counts_mandatory_work_only() -> None:
+    hi = [timed_task(f"t{k}", 10, [make_node("a", 6, HI)]) for k in range(2)]
+    v, _, _ = _verdict(hi, 1)
+    assert (v.tier, v.feasible) == (TIER_UTILIZATION, False)
+    assert _verdict(hi, 2)[0].tier == TIER_RESPONSE_TIME
+    lo = [timed_task(f"t{k}", 10, [make_node("a", 6, LO)]) for k in range(2)]
+    assert _verdict(lo, 1, lo_droppable=False)[0].tier == TIER_UTILIZATION
+    # LO work may be dropped in overflow mode, so only the simulation can tell.
+    assert _verdict(lo, 1)[0].tier == TIER_SIMULATION
+
+
+@pytest.mark.parametrize("T", [10, 20])
+def test_blocking_bound_across_cores(T: float) -> None:
+    tasks = [timed_task(f"t{k}", T, [make_node("a", 4, HI, segs=_crit(2))]) for k in range(2)]
+    packed = PackedTaskSet.from_task_set(TaskSet(tasks=tasks))
+    # A HI request waits for one section of the other node, inflated by the longest section.
+    assert np.allclose(blocking_bound(packed), [4, 4])
+    v, alloc, part = _verdict(tasks, 2)
+    assert v.tier == TIER_RESPONSE_TIME and v.response_bound.max() == pytest.approx(8 / T)
+    sim = ca_edf_schedule(packed, alloc, part, overrun_prob=0.5, seed=1)
+    assert sim.feasible
+
+
+def test_lo_requests_fall_back_to_the_window_demand() -> None:
+    """HI-first queues let HI requests overtake a LO one, so it gets the window bound."""
+    crits = [LO, HI, HI]
+    tasks = [timed_task(f"t{k}", 20, [make_node("a", 4, crit, segs=_crit(2))]) for k, crit in enumerate(crits)]
+    packed = PackedTaskSet.from_task_set(TaskSet(tasks=tasks))
+    cores = np.arange(3)
+    # Window: own job 4 + two jobs of each other task 2 * 2 * 4; one FIFO: two nodes ahead.
+    assert blocking_bound(packed, cluster=cores).tolist() == [20, 8, 8]
+    assert blocking_bound(packed, cluster=cores, hi_first=False).tolist() == [8, 8, 8]
+
+
+def test_clearly_light_points_are_decided_by_response_times() -> None:
+    """Light tasks contending for one lock on their own cores never reach the simulation."""
+    tasks = [timed_task(f"t{k}", 20, [make_node("a", 3, HI, segs=_crit(2))]) for k in range(4)]
+    v, alloc, part = _verdict(tasks, 4)
+    assert (v.tier, v.feasible) == (TIER_RESPONSE_TIME, True)
+    assert v.response_bound.max() == pytest.approx(15 / 20)  # C 3 + three sections of 2 + 2
+    packed = PackedTaskSet.from_task_set(TaskSet(tasks=tasks))
+    assert ca_edf_schedule(packed, alloc, part, overrun_prob=0.5, seed=2).feasible
+
+
+def test_decided_points_agree_with_simulation() -> None:
+    light = [
+        timed_task(f"t{k}", 40 * (k + 1), [make_node("a", 2, HI), make_node("b", 1, LO, segs=_crit(1))]) for k in range(3)
+    ]
+    v, alloc, part = _verdict(light, 2)
+    assert v.feasible
+    packed = PackedTaskSet.from_task_set(TaskSet(tasks=light))
+    for seed in range(5):
+        assert ca_edf_schedule(packed, alloc, part, overrun_prob=0.5, seed=seed).feasible
@@ -0,0 +1,66 @@
+"""Task-set cache tests (keys, hits, LRU eviction, runner integration)."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from rts_sim.config import Config
+from rts_sim.experiments.runner import run_all
+from rts_sim.gen.dag import cached_packed_task_set, generate_packed_task_sets, task_set_key
+from rts_sim.store.cache import TaskSetCache, cache_from_config
+from rts_sim.store.results import ResultsStore
+
+
+def test_key_covers_generation_inputs_only(config: Config) -> None:
+    """Seed and gen/system/resources change the key; partition/sched options do not."""
+    base = task_set_key(config, 1)
+    assert base == task_set_key(config.model_copy(deep=True), 1)
+    assert base != task_set_key(config, 2)
+    other = config.model_copy(deep=True)
+    other.gen.erdos_renyi_p = 0.5
+    assert base != task_set_key(other, 1)
+    other = config.model_copy(deep=True)
+    other.sched.use_ca_edf = not config.sched.use_ca_edf
+    assert base == task_set_key(other, 1)
+
+
+def test_hit_is_identical_to_regenerating(config: Config, tmp_path: Path) -> None:
+    cache = TaskSetCache(tmp_path / "cache", max_bytes=1 << 30)
+    key, first = cached_packed_task_set(config, cache, seed=5)
+    assert (cache.hits, cache.misses) == (0, 1) and key in cache
+    _, again = cached_packed_task_set(config, cache, seed=5)
+    assert (cache.hits, cache.misses) == (1, 1)
+    fresh = generate_packed_task_sets(config, seed=5)[0]
+    assert again.to_task_set() == first.to_task_set() == fresh.to_task_set()
+    assert np.array_equal(again.c_overflow, fresh.c_overflow)
+    # A new instance finds entries written by an earlier one.
+    reopened = TaskSetCache(tmp_path / "cache", max_bytes=1 << 30)
+    assert len(reopened) == 1 and reopened.get(key) is not None
+
+
+def test_lru_eviction(config: Config, tmp_path: Path) -> None:
+    """Over budget, the least recently used entry goes first."""
+    cache = TaskSetCache(tmp_path, max_bytes=1 << 30)
+    keys = [cached_packed_task_set(config, cache, seed=s)[0] for s in range(3)]
+    size = cache.size_bytes
+    cache.get(keys[0])
+    cache.max_bytes = size - 1
+    assert cache.evict() == 1
+    assert keys[1] not in cache and keys[0] in cache and keys[2] in cache
+    os.remove(cache._path(keys[2]))
+    assert cache.get(keys[2]) is None and len(cache) == 1
+
+
+def test_run_all_uses_cache(config: Config, tmp_path: Path) -> None:
+    """A second sweep over the same generation config hits the cache for every point."""
+    config.results_dir = tmp_path / "results"
+    with ResultsStore(run_all(config, output_dir=tmp_path)) as store:
+        first = {p.key: p.result.task_set_id for p in store.points()}
+    cache = cache_from_config(config, tmp_path)
+    assert cache is not None and len(cache) == len(first)
+    with ResultsStore(run_all(config, output_dir=tmp_path)) as store:
+        second = {p.key: p.result.task_set_id for p in store.points()}
+    assert first == second and all(first.values())
+    config.cache.enabled = False
+    assert cache_from_config(config, tmp_path) is None
@@ -0,0 +1,60 @@
+"""Critical path engine tests."""
+
+import numpy as np
+import pytest
+
+from rts_sim.gen.critical_path import critical_path_length, critical_paths, topological_levels
+from rts_sim.gen.erdos_renyi import erdos_renyi_dag_batch
+from rts_sim.models import Edge, Node
+from rts_sim.packed import DAGBatch
+
+
+def _longest_path(n: int, src: np.ndarray, dst: np.ndarray, w: np.ndarray) -> float:
+    """Reference DP relying on src < dst (generator order is topological)."""
+    finish = w.copy()
+    for s, d in sorted(zip(src.tolist(), dst.tolist())):
+        finish[d] = max(finish[d], finish[s] + w[d])
+    return float(finish.max())
+
+
+def test_batch_matches_reference() -> None:
+    """Batched L_i and C_i match a per-DAG DP in both modes."""
+    batch = erdos_renyi_dag_batch(40, 5, 15, 0.3, seed=2)
+    rng = np.random.default_rng(0)
+    w_over = rng.random(batch.node_offsets[-1])
+    w_norm = 0.5 * w_over
+    cp = critical_paths(batch, w_norm, w_over)
+    for d in range(batch.n_dags):
+        n, src, dst = batch.dag(d)
+        lo, hi = batch.node_offsets[d], batch.node_offsets[d + 1]
+        assert cp.L_overflow[d] == pytest.approx(_longest_path(n, src, dst, w_over[lo:hi]))
+        assert cp.L_normal[d] == pytest.approx(_longest_path(n, src, dst, w_norm[lo:hi]))
+        assert cp.C_overflow[d] == pytest.approx(w_over[lo:hi].sum())
+    # Windows: every node fits between its earliest start and latest finish.
+    assert np.all(cp.earliest_start + np.vstack([w_norm, w_over]) <= cp.latest_finish + 1e-9)
+
+
+def test_deadline_windows_and_levels() -> None:
+    """Chain a -> b -> c: levels 0,1,2; latest finish measured back from D."""
+    batch = DAGBatch(
+        n_nodes=np.array([3]),
+        node_offsets=np.array([0, 3]),
+        edge_offsets=np.array([0, 2]),
+        src=np.array([1, 0]),
+        dst=np.array([2, 1]),
+    )
+    w = np.array([1.0, 2.0, 3.0])
+    cp = critical_paths(batch, w, 2 * w, deadline=np.array([10.0]))
+    assert topological_levels(batch).tolist() == [0, 1, 2]
+    assert cp.L_normal[0] == 6.0 and cp.L_overflow[0] == 12.0
+    assert cp.earliest_start[0].tolist() == [0.0, 1.0, 3.0]
+    assert cp.latest_finish[0].tolist() == [5.0, 7.0, 10.0]
+
+
+def test_cycle_rejected_and_wrapper() -> None:
+    """Cycles raise; the pydantic wrapper returns the longest path."""
+    nodes = [Node(id=x, c_normal=0, c_overflow=0) for x in "abc"]
+    lengths = {"a": 1.0, "b": 5.0, "c": 2.0}
+    assert critical_path_length(nodes, [Edge(src="a", dst="b"), Edge(src="a", dst="c")], lengths) == 6.0
+    with pytest.raises(ValueError, match="cycle"):
+        critical_path_length(nodes, [Edge(src="a", dst="b"), Edge(src="b", dst="a")], lengths)
@@ -0,0 +1,116 @@
+"""Incremental wait-for graph and deadlock handling tests."""
+
+import numpy as np
+import pytest
+
+from rts_sim.models import Criticality, TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.sched.deadlock import (
+    ModeTables,
+    WaitForGraph,
+    deadlock_detect,
+    drop_low_criticality_in_overload,
+    drop_low_criticality_mask,
+)
+from tests.helpers import cross_lock_tasks, make_node, make_task, run_tasks, segment
+
+HI, LO = Criticality.HI, Criticality.LO
+
+
+def test_cycle_closed_by_wait() -> None:
+    found: list[list[str]] = []
+    g = WaitForGraph(on_deadlock=found.append)
+    g.hold("a", "r1")
+    g.hold("b", "r2")
+    g.hold("c", "r3")
+    assert g.wait("a", "r2") is None and g.wait("b", "r3") is None
+    assert g.wait("c", "r1") == ["c", "a", "b"]
+    assert found == [["c", "a", "b"]] and g.deadlocks == 1
+
+
+def test_cycle_closed_by_hold() -> None:
+    g = WaitForGraph()
+    g.hold("a", "r1")
+    g.wait("b", "r1")
+    g.wait("a", "r2")  # r2 is free: no edge yet
+    assert g.hold("b", "r2") == ["b", "a"]
+
+
+def test_self_wait_and_unwait() -> None:
+    g = WaitForGraph()
+    g.hold("a", "r1")
+    assert g.wait("a", "r1") is None  # re-requested by its holder
+    g.hold("b", "r2")
+    g.wait("b", "r1")
+    g.wait("b", "r3")  # one outgoing edge per owner: replaces b -> a
+    assert g.waits_for("b") == "r3"
+    g.unwait("b", "r1")  # stale wait: the current edge stays
+    assert g.waits_for("b") == "r3"
+    g.unwait("b", "r3")
+    g.unwait("a", "r1")
+    assert g.waits_for("b") is None and g.wait("a", "r2") is None
+    assert g.wait("b", "r1") == ["b", "a"]
+
+
+def test_check_cost_follows_the_chain() -> None:
+    """A long chain: each new wait at its head costs O(1), not O(owners)."""
+    g = WaitForGraph()
+    n = 10_000
+    for k in range(n):
+        g.hold(k, f"r{k}")
+    steps = g.steps
+    for k in range(n - 1, 0, -1):
+        g.wait(k, f"r{k - 1}")  # k -> k-1 -> ... : owner k-1 is not waiting yet
+    assert g.steps - steps <= 2 * n and g.deadlocks == 0
+    assert g.wait(0, f"r{n - 1}") == [0, *range(n - 1, 0, -1)]
+
+
+def test_deadlock_detect_dicts_and_callback() -> None:
+    hold = {"t1": "l1", "t2": "l2"}
+    assert not deadlock_detect(TaskSet(tasks=[]), hold, {"t1": "l2"})
+    cycles: list[list[str]] = []
+    assert deadlock_detect(TaskSet(tasks=[]), hold, {"t1": "l2", "t2": "l1"}, on_deadlock=cycles.append)
+    assert cycles == [["t2", "t1"]]
+
+
+def test_drop_low_criticality_in_overload() -> None:
+    lo_only = make_task("lo", 10, [make_node("x", 1)])
+    mixed = make_task("mixed", 10, [make_node("h", 1, HI), make_node("l", 2, LO, segs=[segment(True, 2, "r")])])
+    ts = TaskSet(tasks=[lo_only, mixed])
+    assert drop_low_criticality_in_overload(ts, False) is ts
+    out = drop_low_criticality_in_overload(ts, True)
+    assert [t.task_id for t in out.tasks] == ["mixed"]
+    l = next(n for n in out.tasks[0].nodes if n.id == "l")
+    assert l.c_normal == 0 and l.segments == []
+    only = drop_low_criticality_in_overload(ts, True, task_ids={"mixed"})
+    assert [t.task_id for t in only.tasks] == ["lo", "mixed"]
+
+
+def test_drop_low_criticality_mask_is_a_view() -> None:
+    lo_only = make_task("lo", 10, [make_node("x", 1)])
+    mixed = make_task(
+        "mixed", 10, [make_node("h", 1, HI, c_over=3), make_node("l", 2, LO, segs=[segment(True, 2, "r")])]
+    )
+    packed = PackedTaskSet.from_task_set(TaskSet(tasks=[lo_only, mixed]))
+    tables = ModeTables.from_packed(packed)
+    assert tables.task_active.tolist() == [[True, True], [False, True]]
+    assert drop_low_criticality_mask(tables, False).base is tables.node_active
+    overload = drop_low_criticality_mask(tables, True)
+    assert overload.base is tables.node_active and not overload.flags.writeable
+    kept = [packed.node_ids[v] for v in np.flatnonzero(overload)]
+    assert kept == ["h"]  # same nodes as drop_low_criticality_in_overload keeps executing
+    out = np.zeros(packed.n_nodes, dtype=bool)
+    only = drop_low_criticality_mask(tables, True, np.array([False, True]), out=out)
+    assert only is out and sorted(packed.node_ids[v] for v in np.flatnonzero(only)) == ["h", "lo_snk", "lo_src", "x"]
+    assert tables.wcet[1].tolist() == np.maximum(packed.c_normal, packed.c_overflow).tolist()
+
+
+@pytest.mark.parametrize("drop", [True, False])
+def test_cross_locking_jobs_do_not_deadlock(drop: bool) -> None:
+    """Each job holds one lock and waits for the other's: the holders are node runs that
+    finish their sections, so nothing blocks for good and no cycle is reported."""
+    st = run_tasks(cross_lock_tasks(), [0, 1], [2, 2], horizon=40, deadlock_drop=drop)
+    assert st.deadlocks == 0 and st.dropped_nodes == 0
+    assert st.feasible and st.jobs_completed == 2
+    assert st.metrics()["deadlock_check_steps"] > 0
+    assert st.response_times == [10, 10]  # each waiter gets the other lock at 5
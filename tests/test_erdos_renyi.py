@@ -0,0 +1,48 @@
+"""Erdős–Rényi DAG generation tests (per-object and batch)."""
+
+import numpy as np
+
+from rts_sim.gen.erdos_renyi import erdos_renyi_dag_batch, erdos_renyi_dag_with_source_sink
+
+
+def _single_root_and_leaf(n: int, src: np.ndarray, dst: np.ndarray) -> None:
+    indeg = np.bincount(dst, minlength=n)
+    outdeg = np.bincount(src, minlength=n)
+    assert np.flatnonzero(indeg == 0).tolist() == [0]
+    assert np.flatnonzero(outdeg == 0).tolist() == [n - 1]
+    assert np.all(src < dst)
+
+
+def test_per_object_source_sink() -> None:
+    """Per-object DAG has source first, sink last, and is reproducible from its seed."""
+    nodes, edges = erdos_renyi_dag_with_source_sink(20, 0.1, seed=3)
+    assert len(nodes) == 22
+    assert nodes[0].id == "source" and nodes[-1].id == "sink"
+    index = {n.id: k for k, n in enumerate(nodes)}
+    src = np.array([index[e.src] for e in edges])
+    dst = np.array([index[e.dst] for e in edges])
+    _single_root_and_leaf(len(nodes), src, dst)
+    assert erdos_renyi_dag_with_source_sink(20, 0.1, seed=3) == (nodes, edges)
+
+
+def test_batch_structure() -> None:
+    """Every DAG in a batch has a single root/leaf and sorted local edges."""
+    batch = erdos_renyi_dag_batch(200, 20, 50, 0.1, seed=1)
+    assert batch.n_dags == 200
+    assert np.all((batch.n_nodes >= 22) & (batch.n_nodes <= 52))
+    for d in range(batch.n_dags):
+        n, src, dst = batch.dag(d)
+        _single_root_and_leaf(n, src, dst)
+        key = src.astype(np.int64) * n + dst
+        assert np.all(np.diff(key) > 0)
+
+
+def test_batch_reproducible() -> None:
+    """Same seed gives the same batch; DAGs materialize as pydantic objects."""
+    a = erdos_renyi_dag_batch(50, 5, 10, 0.3, seed=7)
+    b = erdos_renyi_dag_batch(50, 5, 10, 0.3, seed=7)
+    assert np.array_equal(a.src, b.src) and np.array_equal(a.edge_offsets, b.edge_offsets)
+    nodes, edges = a.to_nodes_edges(4)
+    assert len(nodes) == a.n_nodes[4] and len(edges) == np.diff(a.edge_offsets)[4]
+    indptr, succ = a.successor_csr()
+    assert indptr[-1] == a.n_edges and succ.size == a.n_edges
@@ -0,0 +1,118 @@
+"""Federated core allocation (batched array API, dict wrapper) and light-task packing."""
+
+
+import numpy as np
+import pytest
+
+from rts_sim.config import Config
+from rts_sim.gen.dag import generate_packed_task_sets
+from rts_sim.models import TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.partition.federated import (
+    PLACEMENT_HEURISTICS,
+    federated_allocation_batch,
+    federated_core_allocation,
+    light_task_placement,
+    light_task_placement_packed,
+    pack_decreasing,
+)
+from tests.helpers import make_node, timed_task
+
+
+def test_formula_and_feasibility_mask() -> None:
+    # Set 0: heavy (C=30, L=10, D=20 -> m_i=2) + two light (U 0.5 + 0.6 -> 2 cores).
+    # Set 1: heavy with D <= L is infeasible regardless of m.
+    C = np.array([30.0, 10.0, 12.0, 30.0])
+    L = np.array([10.0, 5.0, 5.0, 25.0])
+    D = np.array([20.0, 20.0, 20.0, 20.0])
+    alloc = federated_allocation_batch(C, L, D, [0, 3, 4], m_total=np.array([4, 64]))
+    assert alloc.m_i.tolist() == [2, 1, 1, 1]
+    assert alloc.heavy.tolist() == [True, False, False, True]
+    assert alloc.heavy_cores.tolist() == [2, 1] and alloc.cores_used.tolist() == [4, 1]
+    assert alloc.feasible.tolist() == [True, False]
+    assert federated_allocation_batch(C, L, D, [0, 3, 4], 3).feasible.tolist() == [False, False]
+
+
+def test_empty_sets() -> None:
+    alloc = federated_allocation_batch(np.zeros(0), np.zeros(0), np.zeros(0), [0, 0], 2)
+    assert alloc.cores_used.tolist() == [0] and alloc.feasible.tolist() == [True]
+
+
+def test_wrapper_matches_batch(config: Config) -> None:
+    config.gen.nodes_per_task_min, config.gen.nodes_per_task_max = 5, 10
+    sets = generate_packed_task_sets(config, k=5, seed=3, n_tasks=6, U_sum=12.0)
+    for packed in sets:
+        expected = federated_allocation_batch(
+            packed.C_overflow, packed.L_overflow, packed.D, [0, packed.n_tasks], 16, U=packed.U_overflow
+        )
+        alloc = federated_core_allocation(packed.to_task_set(), 16)
+        assert list(alloc.values()) == expected.m_i.tolist()
+        assert list(alloc) == list(packed.task_ids)
+
+
+def test_million_tasks_in_one_call() -> None:
+    """One batched call equals the per-set call; its runtime is tracked by `rts-sim bench -b federated`."""
+    rng = np.random.default_rng(0)
+    n_sets, per_set = 100_000, 10
+    D = rng.choice([2000.0, 4000.0, 6000.0], n_sets * per_set)
+    L = rng.uniform(0.05, 0.5, D.size) * D
+    C = L + rng.uniform(0, 4, D.size) * D
+    offsets = np.arange(0, D.size + 1, per_set)
+    alloc = federated_allocation_batch(C, L, D, offsets, 32)
+    k = 12345
+    lo, hi = offsets[k], offsets[k + 1]
+    one = federated_allocation_batch(C[lo:hi], L[lo:hi], D[lo:hi], [0, per_set], 32)
+    assert alloc.cores_used[k] == one.cores_used[0] and alloc.feasible[k] == one.feasible[0]
+
+
+@pytest.mark.parametrize(
+    "heuristic, cores",
+    [
+        ("wfd", [0, 1, 1, 0]),  # least loaded core
+        ("ffd", [0, 1, 1, 0]),  # lowest core that fits
+        ("bfd", [0, 1, 1, 1]),  # fullest core that fits
+        ("nfd", [0, 1, 1, 1]),  # never goes back
+    ],
+)
+def test_heuristics_on_known_input(heuristic: str, cores: list[int]) -> None:
+    util = np.array([0.04, 0.7, 0.35, 0.6])
+    core_of, load = pack_decreasing(util, 2, heuristic)
+    assert core_of[np.argsort(-util)].tolist() == cores
+    assert load.sum() == pytest.approx(util.sum())
+
+
+@pytest.mark.parametrize("heuristic", PLACEMENT_HEURISTICS)
+def test_items_that_fit_nowhere_go_to_the_emptiest_core(heuristic: str) -> None:
+    core_of, load = pack_decreasing(np.full(9, 0.9), 2, heuristic)
+    assert set(core_of.tolist()) == {0, 1} and sorted(load.round(6).tolist()) == [3.6, 4.5]
+    assert pack_decreasing(np.ones(3), 0, heuristic)[0].tolist() == [-1, -1, -1]
+
+
+def test_heap_wfd_matches_scan() -> None:
+    util = np.random.default_rng(1).uniform(0, 0.3, 2000)
+    _, load = pack_decreasing(util, 37, "wfd")
+    ref = [0.0] * 37
+    for u in sorted(util.tolist(), reverse=True):
+        c = min(range(37), key=ref.__getitem__)
+        ref[c] += u
+    assert load.tolist() == ref
+
+
+def test_light_task_placement_uses_leftover_cores() -> None:
+    heavy = timed_task("h", 10, [make_node(f"n{k}", 5) for k in range(4)])  # U=2, m_i=3
+    light = [timed_task(f"l{k}", 10, [make_node("a", c)]) for k, c in enumerate([6, 5, 4])]
+    ts = TaskSet(tasks=[heavy, *light])
+    alloc = federated_core_allocation(ts, 5)
+    assert light_task_placement(ts, alloc, 5, "ffd") == {0: ["l0", "l2"], 1: ["l1"]}
+    assert light_task_placement(ts, alloc, 3) == {}
+    with pytest.raises(ValueError, match="heuristic"):
+        light_task_placement(ts, alloc, 5, "xfd")
+    # The packed entry point places the same tasks from arrays alone.
+    packed = PackedTaskSet.from_task_set(ts)
+    fed = federated_allocation_batch(
+        packed.C_overflow, packed.L_overflow, packed.D, [0, packed.n_tasks], 5, U=packed.U_overflow
+    )
+    for heuristic in PLACEMENT_HEURISTICS:
+        assert light_task_placement_packed(
+            packed.U_overflow, fed.heavy, fed.m_i, packed.task_ids, 5, heuristic
+        ) == light_task_placement(ts, alloc, 5, heuristic)
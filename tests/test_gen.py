@@ -0,0 +1,49 @@
+"""Task-set generation and segment splitting tests."""
+
+import numpy as np
+import pytest
+
+from rts_sim.config import Config
+from rts_sim.gen.dag import generate_dag_task_set, generate_packed_task_sets
+from rts_sim.models import Node, Segment
+from rts_sim.resources.segments import assign_segments_to_nodes
+
+
+def test_generate_task_set(config: Config) -> None:
+    """Generated tasks have D = T, periods from config, and L <= C in both modes."""
+    ts = generate_dag_task_set(config, seed=1)
+    assert len(ts.tasks) == config.gen.n_tasks
+    for t in ts.tasks:
+        assert t.D == t.T and t.T in config.gen.period_values
+        assert 0 < t.L_normal <= t.C_normal + 1e-9 and t.L_overflow <= t.C_overflow + 1e-9
+        assert t.C_normal <= t.C_overflow
+        assert t.nodes[0].c_overflow == 0.0 and t.nodes[-1].c_overflow == 0.0
+    assert generate_dag_task_set(config, seed=1) == ts
+
+
+def test_generate_many_sets(config: Config) -> None:
+    """k task sets in one call, each with the requested utilization."""
+    sets = generate_packed_task_sets(config, k=4, seed=2, n_tasks=6, U_sum=3.0)
+    assert len(sets) == 4
+    for p in sets:
+        assert p.n_tasks == 6
+        assert p.U_sum == pytest.approx(3.0)
+        assert p.task_ids[0] == "tau_0"
+        assert np.all(p.L_overflow <= p.C_overflow + 1e-9)
+        assert p.to_task_set().tasks[0].task_id == "tau_0"
+
+
+def test_assign_segments_csp() -> None:
+    """Critical segments sum to CSP * WCET, interleaved with normal segments."""
+    nodes = [
+        Node(id="a", c_normal=8.0, c_overflow=10.0),
+        Node(id="b", c_normal=4.0, c_overflow=5.0),
+    ]
+    out = assign_segments_to_nodes(nodes, {"a": ["l1", "l2"]}, csp_fraction=0.3, seed=0)
+    kinds = [s.kind for s in out[0].segments]
+    assert kinds == [Segment.Kind.NORMAL, Segment.Kind.CRITICAL] * 2 + [Segment.Kind.NORMAL]
+    crit = [s for s in out[0].segments if s.kind == Segment.Kind.CRITICAL]
+    assert [s.resource_id for s in crit] == ["l1", "l2"]
+    assert sum(s.length_overflow for s in crit) == pytest.approx(3.0)
+    assert sum(s.length_normal for s in out[0].segments) == pytest.approx(8.0)
+    assert len(out[1].segments) == 1 and out[1].segments[0].length_overflow == 5.0
@@ -0,0 +1,80 @@
+"""Access matrix and grouping-by-most-requested-resource tests."""
+
+import numpy as np
+import pytest
+
+from rts_sim.models import Criticality, Segment, TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.partition.grouping import NO_GROUP, group_by_resource, grouping_by_most_requested_resource
+from rts_sim.resources.access import AccessMatrix
+from rts_sim.sched.bounds import blocking_bound
+from tests.helpers import make_node, timed_task
+
+HI = Criticality.HI
+
+
+def _segs(*accesses: tuple[str, float]) -> list[Segment]:
+    out = [Segment(kind=Segment.Kind.NORMAL, length_normal=1, length_overflow=1)]
+    for res, length in accesses:
+        out.append(Segment(kind=Segment.Kind.CRITICAL, length_normal=length, length_overflow=length, resource_id=res))
+        out.append(Segment(kind=Segment.Kind.NORMAL, length_normal=1, length_overflow=1))
+    return out
+
+
+def test_matrix_from_packed() -> None:
+    x = make_node("x", 5, HI, segs=_segs(("l1", 1), ("l2", 2)))
+    a = timed_task("a", 10, [x, make_node("y", 3, segs=_segs(("l1", 0.5)))])
+    b = timed_task("b", 10, [make_node("z", 2)])
+    access = AccessMatrix.from_packed(PackedTaskSet.from_task_set(TaskSet(tasks=[a, b])))
+    assert access.resource_ids == ("l1", "l2")
+    assert access.counts.tolist() == [[2, 1], [0, 0]]
+    assert access.cs_overflow.tolist() == [[1.5, 2.0], [0.0, 0.0]] and access.cs_max == 2.0
+    assert access.most_requested().tolist() == [0, NO_GROUP]
+
+
+def test_argmax_ties_and_unknown_ids() -> None:
+    access = AccessMatrix.from_counts(["a", "b", "c"], {"a": {"l2": 3, "l1": 3}, "b": {"lock_x": 1}}, ("l1", "l2"))
+    assert access.resource_ids == ("l1", "l2", "lock_x")
+    assert access.most_requested().tolist() == [0, 2, NO_GROUP]
+
+
+def test_groups_get_exclusive_cores_then_share_the_emptiest() -> None:
+    # Group l1: U 1.5 -> 2 cores, group l2: U 0.8 -> 1 core, task "c" has no accesses.
+    access = AccessMatrix.from_counts(["a", "b", "c", "d"], {"a": {"l1": 2}, "b": {"l2": 1}, "d": {"l1": 1}}, ("l1", "l2"))
+    U = np.array([1.0, 0.8, 0.3, 0.5])
+    ga = group_by_resource(access, U, 4)
+    assert ga.order == [0, 1] and ga.util.tolist() == [1.5, 0.8]
+    assert ga.group_cores == {0: [0, 1], 1: [2]} and not ga.shared
+    assert ga.task_core.tolist() == [-1, -1, 3, -1]
+    assert ga.load.tolist() == pytest.approx([0.75, 0.75, 0.8, 0.3])
+    # Two cores: l1 takes both, l2 shares the one with most remaining capacity (core 0 on ties).
+    ga = group_by_resource(access, U, 2)
+    assert ga.group_cores == {0: [0, 1], 1: [0]} and ga.shared
+    assert ga.task_core.tolist() == [-1, -1, 1, -1]
+
+
+def test_clusters_merge_groups_that_share_cores() -> None:
+    access = AccessMatrix.from_counts(
+        ["a", "b", "c", "d", "e"], {"a": {"l1": 2}, "b": {"l2": 1}, "c": {"l1": 1}, "d": {"l3": 1}}, ("l1", "l2", "l3")
+    )
+    U = np.array([0.9, 0.5, 0.6, 0.3, 0.2])
+    # Enough cores: l1 gets two, l2 and l3 one each, the ungrouped task e shares l3's core.
+    task_cluster, cluster_cores = group_by_resource(access, U, 4).clusters()
+    assert task_cluster.tolist() == [0, 1, 0, 2, 2] and cluster_cores.tolist() == [2, 1, 1]
+    # Two cores: every group shares a core with l1's, so all tasks end up in one cluster.
+    task_cluster, cluster_cores = group_by_resource(access, U, 2).clusters()
+    assert task_cluster.tolist() == [0] * 5 and cluster_cores.tolist() == [2]
+
+
+def test_dict_wrapper_orders_groups_by_utilization() -> None:
+    tasks = [timed_task(t, 10, [make_node("n", c)]) for t, c in [("a", 2), ("b", 9), ("c", 4), ("d", 1)]]
+    counts = {"a": {"l1": 2, "l2": 1}, "b": {"l2": 5}, "c": {"l1": 1}}
+    groups = grouping_by_most_requested_resource(TaskSet(tasks=tasks), counts, 2)
+    assert groups == [["b"], ["a", "c"], ["d"]]
+
+
+def test_blocking_bound_reuses_matrix() -> None:
+    tasks = [timed_task(f"t{k}", 20, [make_node("a", 4, HI, segs=_segs(("r", 2)))]) for k in range(3)]
+    packed = PackedTaskSet.from_task_set(TaskSet(tasks=tasks))
+    access = AccessMatrix.from_packed(packed)
+    assert np.array_equal(blocking_bound(packed, access), blocking_bound(packed))
@@ -0,0 +1,64 @@
+"""Packed (array-backed) task-set tests."""
+
+import numpy as np
+import pytest
+
+from rts_sim.gen.erdos_renyi import erdos_renyi_dag_batch
+from rts_sim.models import Criticality, DAGTask, Edge, Node, Segment, TaskSet
+from rts_sim.packed import CRIT_HI, PackedTaskSet
+
+
+def _task_set() -> TaskSet:
+    seg = [
+        Segment(kind=Segment.Kind.NORMAL, length_normal=1.0, length_overflow=2.0),
+        Segment(kind=Segment.Kind.CRITICAL, length_normal=0.5, length_overflow=1.0, resource_id="l2"),
+        Segment(kind=Segment.Kind.NORMAL, length_normal=1.5, length_overflow=2.0),
+    ]
+    a = DAGTask(
+        task_id="a",
+        nodes=[
+            Node(id="source", c_normal=0, c_overflow=0),
+            Node(id="x", criticality=Criticality.HI, c_normal=3.0, c_overflow=5.0, segments=seg),
+            Node(id="sink", c_normal=0, c_overflow=0),
+        ],
+        edges=[Edge(src="source", dst="x"), Edge(src="x", dst="sink")],
+        T=100, D=100, U_normal=0.03, U_overflow=0.05, C_normal=3, C_overflow=5, L_normal=3, L_overflow=5,
+    )
+    b = DAGTask(
+        task_id="b",
+        nodes=[Node(id="only", c_normal=1.0, c_overflow=1.0)],
+        T=10, D=10, U_normal=0.1, U_overflow=0.1, C_normal=1, C_overflow=1, L_normal=1, L_overflow=1,
+    )
+    return TaskSet(tasks=[a, b])
+
+
+def test_round_trip_lossless() -> None:
+    """TaskSet -> PackedTaskSet -> TaskSet is the identity."""
+    ts = _task_set()
+    packed = PackedTaskSet.from_task_set(ts)
+    assert packed.n_tasks == 2 and packed.n_nodes == 4 and packed.n_edges == 2
+    assert packed.resource_ids == ("l2",)
+    assert packed.criticality[1] == CRIT_HI
+    assert packed.node_task().tolist() == [0, 0, 0, 1]
+    assert packed.to_task_set() == ts
+    assert packed.U_sum == pytest.approx(ts.U_sum)
+
+
+def test_unknown_edge_node_rejected() -> None:
+    """Edges must reference nodes of the same task."""
+    ts = _task_set()
+    ts.tasks[1].edges.append(Edge(src="only", dst="ghost"))
+    with pytest.raises(ValueError, match="ghost"):
+        PackedTaskSet.from_task_set(ts)
+
+
+def test_from_dag_batch() -> None:
+    """Generator arrays pack directly and share the batch adjacency."""
+    batch = erdos_renyi_dag_batch(3, 4, 6, 0.5, seed=0)
+    n = batch.node_offsets[-1]
+    cols = {f: np.ones(3) for f in ("T", "D", "U_normal", "U_overflow", "C_normal", "C_overflow", "L_normal", "L_overflow")}
+    packed = PackedTaskSet.from_dag_batch(batch, np.zeros(n), np.zeros(n), np.zeros(n), **cols)
+    assert packed.dag_batch().src is batch.src
+    ts = packed.to_task_set()
+    assert [t.task_id for t in ts.tasks] == ["tau_0", "tau_1", "tau_2"]
+    assert PackedTaskSet.from_task_set(ts).to_task_set() == ts
@@ -0,0 +1,115 @@
+"""Incremental plot rendering tests."""
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from rts_sim.analysis import plots
+from rts_sim.analysis.plots import (
+    FIGURES,
+    PLOT_MANIFEST,
+    PLOT_RENDERED,
+    PLOT_SKIPPED,
+    PLOT_UNAVAILABLE,
+    FigureSpec,
+    figure_summaries,
+    plot_results,
+)
+from rts_sim.models import ExperimentPoint, SimulationResult
+from rts_sim.store.results import ResultsStore, ResultsStoreWriter
+
+
+def _point(k: int, group_feasible: float = 1.0) -> ExperimentPoint:
+    return ExperimentPoint(
+        n_tasks=5,
+        m=2 + 2 * (k % 2),
+        U_norm=0.3 + 0.2 * (k % 3),
+        n_resources=2 + k % 2,
+        total_resource_accesses=4,
+        seed=k,
+        result=SimulationResult(feasible=k % 4 != 0, metrics={"group_feasible": group_feasible, "events": float(k)}),
+    )
+
+
+def _fake_render(spec: FigureSpec, rows: list[dict[str, float]], path: Path) -> None:
+    """Module-level (picklable) renderer: records what it was given."""
+    path.write_text(json.dumps({"name": spec.name, "rows": len(rows)}), encoding="utf-8")
+
+
+def _failing_render(spec: FigureSpec, rows: list[dict[str, float]], path: Path) -> None:
+    """Renders every figure but the grouping one."""
+    if spec.name == "federated_vs_grouping":
+        raise RuntimeError("cannot draw")
+    _fake_render(spec, rows, path)
+
+
+def test_summaries_written_and_unchanged_figures_skipped(tmp_path: Path) -> None:
+    points = [_point(k) for k in range(12)]
+    status = plot_results(points, tmp_path, renderer=_fake_render)
+    assert status == {f.name: PLOT_RENDERED for f in FIGURES}
+    with open(tmp_path / "schedulability_vs_U_norm.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert {(r["U_norm"], r["m"]) for r in rows} == {(str(p.U_norm), str(p.m)) for p in points}
+    assert json.loads((tmp_path / "federated_vs_grouping.png").read_text(encoding="utf-8"))["rows"] == 3
+    assert set(json.loads((tmp_path / PLOT_MANIFEST).read_text(encoding="utf-8"))) == {f.name for f in FIGURES}
+
+    assert set(plot_results(points, tmp_path, renderer=_fake_render).values()) == {PLOT_SKIPPED}
+    assert set(plot_results(points, tmp_path, renderer=_fake_render, force=True).values()) == {PLOT_RENDERED}
+    # Only the grouping figure reads group_feasible.
+    status = plot_results([_point(k, group_feasible=0.0) for k in range(12)], tmp_path, renderer=_fake_render)
+    assert status.pop("federated_vs_grouping") == PLOT_RENDERED
+    assert set(status.values()) == {PLOT_SKIPPED}
+    (tmp_path / "schedulability_vs_n_resources.png").unlink()
+    assert plot_results(points, tmp_path, renderer=_fake_render)["schedulability_vs_n_resources"] == PLOT_RENDERED
+
+
+def test_parallel_rendering(tmp_path: Path) -> None:
+    points = [_point(k) for k in range(12)]
+    status = plot_results(points, tmp_path / "par", workers=2, renderer=_fake_render)
+    plot_results(points, tmp_path / "ser", workers=1, renderer=_fake_render)
+    assert status == {f.name: PLOT_RENDERED for f in FIGURES}
+    for f in FIGURES:
+        assert (tmp_path / "par" / f"{f.name}.png").read_bytes() == (tmp_path / "ser" / f"{f.name}.png").read_bytes()
+    assert (tmp_path / "par" / PLOT_MANIFEST).read_bytes() == (tmp_path / "ser" / PLOT_MANIFEST).read_bytes()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_figure_keeps_the_rendered_ones(tmp_path: Path, workers: int) -> None:
+    points = [_point(k) for k in range(12)]
+    with pytest.raises(RuntimeError, match="cannot draw"):
+        plot_results(points, tmp_path, workers=workers, renderer=_failing_render)
+    manifest = json.loads((tmp_path / PLOT_MANIFEST).read_text(encoding="utf-8"))
+    assert set(manifest) == {f.name for f in FIGURES} - {"federated_vs_grouping"}
+    status = plot_results(points, tmp_path, workers=workers, renderer=_fake_render)
+    assert status.pop("federated_vs_grouping") == PLOT_RENDERED
+    assert set(status.values()) == {PLOT_SKIPPED}
+
+
+def test_without_matplotlib_only_summaries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(plots.importlib.util, "find_spec", lambda name: None)
+    status = plot_results([_point(k) for k in range(6)], tmp_path)
+    assert set(status.values()) == {PLOT_UNAVAILABLE}
+    assert json.loads((tmp_path / PLOT_MANIFEST).read_text(encoding="utf-8")) == {}
+    assert all((tmp_path / f"{f.name}.csv").exists() for f in FIGURES)
+    assert not any((tmp_path / f"{f.name}.png").exists() for f in FIGURES)
+
+
+def test_store_and_points_give_the_same_summaries(tmp_path: Path) -> None:
+    points = [_point(k, group_feasible=float(k % 2)) for k in range(20)]
+    path = tmp_path / "r.rcol"
+    with ResultsStoreWriter(path, chunk_size=6) as w:
+        w.extend(points)
+    from_points = figure_summaries(points)
+    with ResultsStore(path) as store:
+        scans = []
+        iter_chunks = store.iter_chunks
+        store.iter_chunks = lambda *a, **kw: scans.append(a) or iter_chunks(*a, **kw)
+        from_store = figure_summaries(store)
+    assert len(scans) == 1  # one pass over the store serves every figure
+    assert list(from_store) == [f.name for f in FIGURES]
+    for name, rows in from_points.items():
+        assert [r.keys() for r in from_store[name]] == [r.keys() for r in rows]
+        for a, b in zip(from_store[name], rows):
+            assert a == pytest.approx(b)
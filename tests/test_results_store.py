@@ -0,0 +1,124 @@
+"""Columnar results store tests."""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from rts_sim.analysis.aggregate import GROUP_KEYS, StreamingAggregator, aggregate_results
+from rts_sim.models import ExperimentPoint, SimulationResult
+from rts_sim.store.results import METRIC_PREFIX, ResultsStore, ResultsStoreWriter
+
+
+def _point(k: int) -> ExperimentPoint:
+    metrics = {"events": float(k), "decision_tier": 4.0 if k % 2 else 1.0}
+    if k % 3 == 0:
+        metrics["mode_switches"] = 1.0
+    return ExperimentPoint(
+        n_tasks=5,
+        m=2 + 2 * (k % 2),
+        U_norm=0.3 + 0.2 * (k % 3 == 1),
+        n_resources=2,
+        total_resource_accesses=4,
+        seed=k,
+        result=SimulationResult(
+            task_set_id=f"ts{k}", feasible=k % 4 != 0, core_allocation={"t0": 1}, metrics=metrics
+        ),
+    )
+
+
+def _write(path: Path, points: list[ExperimentPoint], chunk_size: int = 4, append: bool = False) -> None:
+    with ResultsStoreWriter(path, chunk_size=chunk_size, append=append) as w:
+        w.extend(points)
+
+
+def test_round_trip_and_metric_columns(tmp_path: Path) -> None:
+    points = [_point(k) for k in range(10)] + [ExperimentPoint(n_tasks=5, m=2, U_norm=0.3, n_resources=2, total_resource_accesses=4)]
+    path = tmp_path / "r.rcol"
+    _write(path, points)
+    with ResultsStore(path) as store:
+        assert len(store) == 11 and store.n_chunks == 3
+        assert set(store.metric_names) == {"events", "decision_tier", "mode_switches"}
+        assert [p.model_dump() for p in store.points()] == [p.model_dump() for p in points]
+        assert store.keys() == [p.key for p in points]
+
+
+def test_projection_and_predicates(tmp_path: Path) -> None:
+    points = [_point(k) for k in range(12)]
+    path = tmp_path / "r.rcol"
+    _write(path, points[:4], chunk_size=4)
+    _write(path, points[4:], chunk_size=5, append=True)
+    with ResultsStore(path) as store:
+        cols = store.read(["seed", METRIC_PREFIX + "events"], where=[("m", "==", 4), ("feasible", "==", True)])
+        assert list(cols) == ["seed", METRIC_PREFIX + "events"]
+        expect = [p.seed for p in points if p.m == 4 and p.result.feasible]
+        assert cols["seed"].tolist() == expect and cols[METRIC_PREFIX + "events"].tolist() == expect
+        ms = store.read([METRIC_PREFIX + "mode_switches"], where=[("seed", "in", [0, 1, 3])])
+        assert np.isnan(ms[METRIC_PREFIX + "mode_switches"]).tolist() == [False, True, False]
+        assert [p.seed for p in store.points(where=[("U_norm", ">", 0.4)])] == [1, 4, 7, 10]
+        assert store.read(["seed"], where=[("m", "<", 0)])["seed"].size == 0
+        with pytest.raises(ValueError):
+            store.read(["seed"], where=[("m", "~", 1)])
+        with pytest.raises(KeyError):
+            store.read(["nope"])
+
+
+def test_torn_tail_is_ignored_and_truncated_on_append(tmp_path: Path) -> None:
+    path = tmp_path / "r.rcol"
+    _write(path, [_point(k) for k in range(4)])
+    size = path.stat().st_size
+    _write(path, [_point(k) for k in range(4, 8)], append=True)
+    with open(path, "r+b") as f:
+        f.truncate(size + 40)
+    with ResultsStore(path) as store:
+        assert len(store) == 4
+    _write(path, [_point(9)], append=True)
+    with ResultsStore(path) as store:
+        assert [p.seed for p in store.points()] == [0, 1, 2, 3, 9]
+    (tmp_path / "x.rcol").write_bytes(b"garbage")
+    with pytest.raises(ValueError):
+        ResultsStore(tmp_path / "x.rcol")
+
+
+def _append_from_worker(args: tuple[str, int]) -> None:
+    path, k = args
+    with ResultsStoreWriter(Path(path), chunk_size=3, append=True) as w:
+        w.extend(_point(10 * k + j) for j in range(7))
+
+
+def test_concurrent_appends_from_processes(tmp_path: Path) -> None:
+    path = tmp_path / "r.rcol"
+    _write(path, [])
+    with ProcessPoolExecutor(3) as pool:
+        list(pool.map(_append_from_worker, [(str(path), k) for k in range(6)]))
+    with ResultsStore(path) as store:
+        assert sorted(store.read(["seed"])["seed"].tolist()) == sorted(10 * k + j for k in range(6) for j in range(7))
+
+
+def test_aggregate_reads_store_columns(tmp_path: Path) -> None:
+    points = [_point(k) for k in range(30)]
+    path = tmp_path / "r.rcol"
+    _write(path, points, chunk_size=7)
+    from_points = StreamingAggregator(by=("m", "U_norm")).update(points).rows()
+    with ResultsStore(path) as store:
+        from_store = StreamingAggregator(by=("m", "U_norm")).update_store(store).rows()
+        assert aggregate_results(store, tmp_path / "agg.csv", by=GROUP_KEYS)["n_points"] == 30
+    assert [r.keys() for r in from_store] == [r.keys() for r in from_points]
+    for a, b in zip(from_store, from_points):
+        assert a == pytest.approx(b)
+
+
+def test_stage_times_are_not_aggregated_by_default(tmp_path: Path) -> None:
+    """Wall times vary between runs, so only an explicit metric list summarizes them."""
+    points = [_point(k) for k in range(6)]
+    for p in points:
+        p.result.metrics["time_total"] = 0.1
+    path = tmp_path / "r.rcol"
+    _write(path, points)
+    with ResultsStore(path) as store:
+        for agg in (StreamingAggregator(by=()).update(points), StreamingAggregator(by=()).update_store(store)):
+            summary = agg.total().summary()
+            assert "events_mean" in summary and "time_total_mean" not in summary
+        timed = StreamingAggregator(by=(), metrics=("time_total",)).update_store(store)
+        assert timed.total().summary()["time_total_mean"] == pytest.approx(0.1)
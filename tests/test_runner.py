@@ -0,0 +1,241 @@
+"""Experiment sweep and parallel executor tests."""
+
+import json
+import pstats
+import re
+from pathlib import Path
+
+import pytest
+
+from rts_sim.config import Config
+from rts_sim.models import ExperimentPoint
+from rts_sim.experiments.metrics import STAGES, TIME_PREFIX, StageTimer, stage_summary
+from rts_sim.experiments.runner import (
+    PROFILE_DIR_NAME,
+    STAGE_SUMMARY_NAME,
+    PointsFailedError,
+    run_all,
+    run_experiment,
+    run_points,
+    sweep_points,
+)
+from rts_sim.store.checkpoint import RESULTS_LOG_NAME, ResultsLog, iter_results, load_results
+from rts_sim.store.results import RESULTS_STORE_NAME, ResultsStore
+
+
+@pytest.fixture
+def sweep_config(config: Config, tmp_path: Path) -> Config:
+    config.gen.n_tasks = 4
+    config.gen.nodes_per_task_min = 5
+    config.gen.nodes_per_task_max = 10
+    config.sweep.m_values = [2, 4]
+    config.sweep.U_norm_values = [0.3, 0.5]
+    config.sweep.n_seeds = 2
+    config.results_dir = tmp_path / "results"
+    return config
+
+
+def _stored(config: Config) -> list[ExperimentPoint]:
+    """Points of the columnar store, in sweep order."""
+    with ResultsStore(config.results_dir / RESULTS_STORE_NAME) as store:
+        by_key = {p.key: p for p in store.points()}
+    return [by_key[p.key] for p in sweep_points(config)]
+
+
+def test_sweep_points_grid(sweep_config: Config) -> None:
+    points = sweep_points(sweep_config)
+    assert len(points) == 8
+    assert [(p.m, p.U_norm, p.seed) for p in points[:3]] == [(2, 0.3, 0), (2, 0.3, 1), (2, 0.5, 0)]
+
+
+def test_default_sweep_is_single_point(config: Config) -> None:
+    (p,) = sweep_points(config)
+    assert p.n_tasks == config.gen.n_tasks and p.m == config.system.m_max and p.seed == config.seed
+
+
+@pytest.mark.parametrize("chunk_size", [0, 3])
+def test_parallel_matches_serial(sweep_config: Config, chunk_size: int) -> None:
+    """Pool results are identical to the serial run and come back in sweep order."""
+    serial = run_points(sweep_config, sweep_points(sweep_config), workers=1)
+    parallel = run_points(sweep_config, sweep_points(sweep_config), workers=2, chunk_size=chunk_size)
+    assert [p.model_dump() for p in parallel] == [p.model_dump() for p in serial]
+    assert len({p.result.task_set_id for p in serial}) == len(serial)
+
+
+def test_point_beyond_the_generator_cap_is_rejected(config: Config, tmp_path: Path) -> None:
+    """Three tasks cannot carry U_sum = 57.6: a clear error instead of endless rejection."""
+    point = ExperimentPoint(n_tasks=3, m=64, U_norm=0.9, n_resources=2, total_resource_accesses=10, seed=0)
+    with pytest.raises(ValueError, match=re.escape(point.key)):
+        run_experiment(Config(), point)
+    config.sweep.n_tasks_values = [3, 10]
+    config.sweep.U_norm_values = [0.9]
+    config.results_dir = tmp_path / "results"
+    with pytest.raises(ValueError, match="exceeds"):
+        run_all(config, output_dir=tmp_path)
+    assert not (config.results_dir / RESULTS_LOG_NAME).exists()
+
+
+def test_fast_path_agrees_with_simulation(sweep_config: Config) -> None:
+    """Analytically decided points get the verdict the simulation would give."""
+    sweep_config.sweep.U_norm_values = [0.1, 0.5, 1.0]
+    fast = run_points(sweep_config, sweep_points(sweep_config))
+    sweep_config.sched.analytic_fast_path = False
+    full = run_points(sweep_config, sweep_points(sweep_config))
+    tiers = {p.result.metrics["decision_tier"] for p in fast}
+    assert len(tiers) > 1 and {p.result.metrics["decision_tier"] for p in full} <= {1.0, 4.0}
+    assert [p.result.feasible for p in fast] == [p.result.feasible for p in full]
+
+
+def test_stop_at_first_miss_keeps_verdicts(sweep_config: Config) -> None:
+    """sched.stop_at_first_miss reaches the simulator and only shortens failing runs."""
+    sweep_config.sched.analytic_fast_path = False
+    sweep_config.sweep.U_norm_values = [0.5, 1.0]
+    full = run_points(sweep_config, sweep_points(sweep_config))
+    sweep_config.sched.stop_at_first_miss = True
+    short = run_points(sweep_config, sweep_points(sweep_config))
+    assert [p.result.feasible for p in short] == [p.result.feasible for p in full]
+    simulated = [(s.result.metrics, f) for s, f in zip(short, full) if "sim_end_time" in f.result.metrics]
+    cut = [m["sim_end_time"] < f.result.metrics["sim_end_time"] for m, f in simulated]
+    assert any(cut) and not any(c and f.result.feasible for c, (_, f) in zip(cut, simulated))
+
+
+def test_run_all_workers_with_cache(sweep_config: Config, tmp_path: Path) -> None:
+    run_all(sweep_config, output_dir=tmp_path, use_cache=False, workers=1)
+    serial = _stored(sweep_config)
+    run_all(sweep_config, output_dir=tmp_path, workers=2)
+    assert [p.result for p in _stored(sweep_config)] == [p.result for p in serial]
+    assert len(list((tmp_path / "cache").glob("*/*.rtsb"))) == len(serial)
+
+
+def test_results_log_drops_torn_tail(sweep_config: Config, tmp_path: Path) -> None:
+    path = tmp_path / "points.jsonl"
+    points = run_points(sweep_config, sweep_points(sweep_config)[:3])
+    with ResultsLog(path) as log:
+        log.extend(points)
+    with open(path, "ab") as f:
+        f.write(b'{"n_tasks": 4, "m"')
+    with ResultsLog(path, resume=True) as log:
+        assert len(log) == 3 and points[2] in log and log.done == {p.key for p in points}
+        log.append(points[0])
+    assert [p.key for p in load_results(path)] == [p.key for p in points]
+    # Streaming reads yield each key's last line, in file order.
+    assert [p.key for p in iter_results(path)] == [p.key for p in (points[1], points[2], points[0])]
+
+
+def test_resume_skips_finished_points(sweep_config: Config, tmp_path: Path, monkeypatch) -> None:
+    """After an interrupted sweep, --resume runs only the missing points."""
+    run_all(sweep_config, output_dir=tmp_path)
+    full = _stored(sweep_config)
+    log_path = sweep_config.results_dir / RESULTS_LOG_NAME
+    lines = log_path.read_bytes().splitlines(keepends=True)
+    assert len(lines) == 1 + len(full)  # header + one line per point
+    log_path.write_bytes(b"".join(lines[:6]) + lines[6][:10])
+
+    import rts_sim.experiments.runner as runner
+
+    ran = []
+    real = runner.run_experiment
+    monkeypatch.setattr(runner, "run_experiment", lambda c, p, **kw: ran.append(p.key) or real(c, p, **kw))
+    run_all(sweep_config, output_dir=tmp_path, resume=True)
+    assert ran == [p.key for p in full[5:]]
+    assert [p.model_dump() for p in _stored(sweep_config)] == [p.model_dump() for p in full]
+    assert len(load_results(log_path)) == len(full)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failing_point_does_not_lose_the_others(
+    sweep_config: Config, tmp_path: Path, monkeypatch, workers: int
+) -> None:
+    """One raising point is reported by key; every other point is logged and stored."""
+    import rts_sim.experiments.runner as runner
+
+    bad = sweep_points(sweep_config)[3].key
+    real = runner.run_experiment
+
+    def flaky(config, point, **kwargs):
+        if point.key == bad:
+            raise ZeroDivisionError("boom")
+        return real(config, point, **kwargs)
+
+    monkeypatch.setattr(runner, "run_experiment", flaky)
+    with pytest.raises(PointsFailedError, match=re.escape(bad)) as info:
+        run_all(sweep_config, output_dir=tmp_path, workers=workers)
+    assert list(info.value.failures) == [bad] and "ZeroDivisionError" in info.value.failures[bad]
+    others = {p.key for p in sweep_points(sweep_config)} - {bad}
+    with ResultsLog(sweep_config.results_dir / RESULTS_LOG_NAME, resume=True) as log:
+        assert log.done == others
+    with ResultsStore(sweep_config.results_dir / RESULTS_STORE_NAME) as store:
+        assert set(store.keys()) == others
+    monkeypatch.setattr(runner, "run_experiment", real)
+    run_all(sweep_config, output_dir=tmp_path, workers=workers, resume=True)
+    assert all(p.result is not None for p in _stored(sweep_config))
+
+
+def test_resume_refuses_a_log_of_another_config(sweep_config: Config, tmp_path: Path) -> None:
+    """Point keys cover only sweep coordinates, so the log header pins the config."""
+    run_all(sweep_config, output_dir=tmp_path)
+    sweep_config.sweep.workers = 2  # executor settings do not change results
+    sweep_config.sweep.n_seeds = 3
+    with ResultsStore(run_all(sweep_config, output_dir=tmp_path, resume=True)) as store:
+        assert len(store) == 12
+    sweep_config.sched.overrun_prob = 0.5
+    with pytest.raises(ValueError, match="another results_dir"):
+        run_all(sweep_config, output_dir=tmp_path, resume=True)
+    log_path = sweep_config.results_dir / RESULTS_LOG_NAME
+    log_path.write_bytes(b"".join(log_path.read_bytes().splitlines(keepends=True)[1:]))  # no header
+    with pytest.raises(ValueError):
+        run_all(sweep_config, output_dir=tmp_path, resume=True)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_columnar_store_follows_the_log(sweep_config: Config, tmp_path: Path, workers: int) -> None:
+    """Every finished point lands in points.rcol once, also across an interrupted run."""
+    store_path = run_all(sweep_config, output_dir=tmp_path, workers=workers)
+    full = _stored(sweep_config)
+    with ResultsStore(store_path) as store:
+        assert sorted(store.keys()) == sorted(p.key for p in full)
+    log_path = sweep_config.results_dir / RESULTS_LOG_NAME
+    log_path.write_bytes(b"".join(log_path.read_bytes().splitlines(keepends=True)[:4]))
+    run_all(sweep_config, output_dir=tmp_path, workers=workers, resume=True)
+    with ResultsStore(store_path) as store:
+        stored = {p.key: p.model_dump() for p in store.points()}
+        assert len(store) == len(full)
+    assert stored == {p.key: p.model_dump() for p in full}
+
+
+def test_stage_timer() -> None:
+    timer = StageTimer()
+    for stage in ("generate", "schedule", "generate"):
+        timer.lap(stage)
+    m = timer.metrics()
+    assert list(m) == ["time_generate", "time_schedule", "time_total"] and all(v >= 0 for v in m.values())
+    assert m["time_total"] == pytest.approx(m["time_generate"] + m["time_schedule"])
+    off = StageTimer(enabled=False)
+    off.lap("generate")
+    assert off.metrics() == {}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stage_metrics_rollup_and_profile(sweep_config: Config, tmp_path: Path, workers: int) -> None:
+    """Stage times and counters per point, their sweep roll-up and per-process profiles."""
+    sweep_config.sweep.stage_timers = True
+    run_all(sweep_config, output_dir=tmp_path, workers=workers, profile=True)
+    points = _stored(sweep_config)
+    for p in points:
+        metrics = p.result.metrics
+        stages = ("generate", "resources", "partition", "bounds", "grouping", "total")
+        assert {TIME_PREFIX + s for s in stages} <= set(metrics)
+        assert metrics["group_feasible"] in (0.0, 1.0)
+        assert (TIME_PREFIX + "schedule" in metrics) == ("events" in metrics)
+        assert metrics["dag_nodes"] >= p.n_tasks * (sweep_config.gen.nodes_per_task_min + 2)
+    summary = json.loads((sweep_config.results_dir / STAGE_SUMMARY_NAME).read_text(encoding="utf-8"))
+    from_points = stage_summary(points)
+    assert summary.keys() == from_points.keys()
+    for name, row in summary.items():
+        assert row == pytest.approx(from_points[name])
+    assert summary["dag_nodes"]["total"] == sum(p.result.metrics["dag_nodes"] for p in points)
+    assert sum(summary[TIME_PREFIX + s]["share"] for s in STAGES if TIME_PREFIX + s in summary) == pytest.approx(1.0)
+    dumps = list((sweep_config.results_dir / PROFILE_DIR_NAME).glob("worker-*.prof"))
+    assert 1 <= len(dumps) <= workers
+    stats = pstats.Stats(*map(str, dumps))
+    assert any(func[2] == "run_experiment" for func in stats.stats)
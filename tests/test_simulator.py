@@ -0,0 +1,169 @@
+"""Event-driven CA-EDF engine tests on small hand-built task sets."""
+
+import numpy as np
+import pytest
+
+from rts_sim.config import Config
+from rts_sim.gen.dag import generate_packed_task_sets
+from rts_sim.models import Criticality, Segment, TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.sched.ca_edf import build_clusters, ca_edf_schedule
+from rts_sim.sched.simulator import (
+    MODE_NORMAL,
+    MODE_OVERFLOW,
+    STOP_FIRST_MISS,
+    STOP_HORIZON,
+    STOP_STEADY_STATE,
+    Simulator,
+    hyperperiod,
+)
+from tests.helpers import make_node, make_task, run_tasks
+
+HI, LO = Criticality.HI, Criticality.LO
+
+
+def test_chain_response_times() -> None:
+    a, b = make_node("a", 3), make_node("b", 2)
+    t = make_task("t", 10, [a, b], [("t_src", "a"), ("a", "b"), ("b", "t_snk")])
+    st = run_tasks([t], [0], [1], horizon=20)
+    assert st.jobs_released == 2 and st.response_times == [5, 5] and st.feasible
+
+
+@pytest.mark.parametrize("cores, expected", [(1, 8.0), (2, 4.0)])
+def test_parallel_nodes_use_cluster_cores(cores: int, expected: float) -> None:
+    t = make_task("t", 10, [make_node("a", 4), make_node("b", 4)])
+    st = run_tasks([t], [0], [cores], horizon=10)
+    assert st.response_times == [expected]
+
+
+def test_edf_preemption() -> None:
+    long = make_task("long", 20, [make_node("l", 6)])
+    short = make_task("short", 5, [make_node("s", 2)])
+    st = run_tasks([long, short], [0, 0], [1], horizon=10)
+    assert st.preemptions == 1
+    assert sorted(st.response_times) == [2, 2, 10] and st.feasible
+
+
+def test_preemption_picks_the_latest_deadline_in_a_cluster() -> None:
+    """The preemptible-run heap yields the running run with the latest deadline."""
+    specs = [("a", 20, 15), ("b", 30, 15), ("c", 40, 15)]
+    tasks = [make_task(tid, T, [make_node(f"{tid}1", c)]) for tid, T, c in specs]
+    tasks.append(make_task("s", 10, [make_node("s1", 2)]))
+    st = run_tasks(tasks, [0, 0, 0, 0], [3], horizon=20)
+    # s preempts c (deadline 40) at 10, not b (deadline 30): c resumes at 12 and ends at 19.
+    assert st.preemptions == 1
+    assert sorted(st.response_times) == [2, 2, 15, 15, 19]
+
+
+def test_deadline_miss() -> None:
+    st = run_tasks([make_task("t", 5, [make_node("a", 6)])], [0], [1], horizon=10)
+    assert st.deadline_misses == 2 and not st.feasible
+    assert st.first_miss_time == 5 and st.response_times == [6, 7]
+
+
+def test_lock_blocking_suspends_and_hands_over_fifo() -> None:
+    segs = [
+        Segment(kind=Segment.Kind.NORMAL, length_normal=1, length_overflow=1),
+        Segment(kind=Segment.Kind.CRITICAL, length_normal=3, length_overflow=3, resource_id="l1"),
+        Segment(kind=Segment.Kind.NORMAL, length_normal=1, length_overflow=1),
+    ]
+    a = make_task("a", 20, [make_node("a1", 5, segs=segs)])
+    b = make_task("b", 20, [make_node("b1", 5, segs=segs)])
+    st = run_tasks([a, b], [0, 1], [1, 1], horizon=20)
+    assert st.response_times == [5, 8]
+    m = st.metrics()
+    assert (m["lock_requests"], m["lock_waits"], m["lock_blocking_lo"]) == (2, 1, 3)
+
+
+@pytest.mark.parametrize("drop_lo, lo_response", [(True, 2.0), (False, 7.0)])
+def test_overrun_switches_mode_and_drops_lo(drop_lo: bool, lo_response: float) -> None:
+    hi = make_task("hi", 10, [make_node("h", 2, HI, c_over=4)])
+    lo = make_task("lo", 20, [make_node("l", 3, LO)])
+    st = run_tasks([hi, lo], [0, 0], [1], horizon=10, overrun_prob=1.0, drop_lo=drop_lo)
+    assert st.mode_switches == 1
+    assert st.response_times == ([lo_response, 4.0] if drop_lo else [4.0, lo_response])
+    assert st.dropped_nodes == (1 if drop_lo else 0)
+
+
+def test_mode_switch_swaps_preallocated_rows() -> None:
+    hi = make_task("hi", 10, [make_node("h", 2, HI, c_over=4)])
+    lo = make_task("lo", 20, [make_node("l", 3, LO)])
+    sim = Simulator(PackedTaskSet.from_task_set(TaskSet(tasks=[hi, lo])), np.array([0, 0]), np.array([1]))
+    rows = (sim.seg_len_rows, sim.node_active_rows)
+    st = sim.run(horizon=10, overrun_prob=1.0)
+    assert st.mode_switches == 1 and sim.mode == MODE_NORMAL
+    assert (sim.seg_len_rows, sim.node_active_rows) == rows
+    assert sim.seg_len is sim.seg_len_rows[MODE_NORMAL] and sim.node_active is sim.node_active_rows[MODE_NORMAL]
+    sim._set_mode(MODE_OVERFLOW)
+    assert sim.seg_len is sim.seg_len_rows[MODE_OVERFLOW]
+    h, l = (sim.packed.task_ids.index(t) for t in ("hi", "lo"))
+    assert sim.node_active[sim.packed.node_offsets[l] + 1] is False
+    assert sim.node_active[sim.packed.node_offsets[h] + 1] is True
+
+
+def test_overflow_mode_runs_overflow_length_at_once() -> None:
+    a, b = make_node("a", 2, HI, c_over=4), make_node("b", 1, HI, c_over=3)
+    t = make_task("t", 20, [a, b], [("t_src", "a"), ("a", "b"), ("b", "t_snk")])
+    st = run_tasks([t], [0], [1], horizon=20, overrun_prob=1.0)
+    # a: budget end at 2 switches the mode, extended to 4; b starts in overflow mode with 3.
+    assert st.mode_switches == 1 and st.response_times == [7.0]
+    assert st.events == 6  # release, deadline, mode switch, a: budget end + end, b: one end
+
+
+def test_build_clusters() -> None:
+    tc, cores = build_clusters(("a", "b", "c", "d"), {"a": 3, "b": 1, "c": 1, "d": 2}, {0: ["b", "c"]})
+    assert tc.tolist() == [1, 0, 0, 2] and cores.tolist() == [1, 3, 2]
+
+
+def test_ca_edf_schedule_generated_set_is_deterministic(config: Config) -> None:
+    config.gen.n_tasks = 4
+    packed = generate_packed_task_sets(config, seed=1, U_sum=3.0)[0]
+    alloc = {tid: 2 for tid in packed.task_ids}
+    r1 = ca_edf_schedule(packed, alloc, {}, overrun_prob=0.3, seed=7)
+    r2 = ca_edf_schedule(packed.to_task_set(), alloc, {}, overrun_prob=0.3, seed=7)
+    assert r1 == r2
+    m = r1.metrics
+    assert m["jobs_released"] > 0 and m["jobs_completed"] == m["jobs_released"]
+    assert r1.feasible == (m["deadline_misses"] == 0)
+
+
+def test_hyperperiod() -> None:
+    assert hyperperiod([2000.0, 4000.0, 6000.0]) == 12000.0
+    assert hyperperiod([1.5, 2.0]) == 6.0
+
+
+def test_steady_state_stops_early_with_same_verdict() -> None:
+    """A repeating schedule stops at the second identical boundary state."""
+    tasks = [make_task("a", 4, [make_node("a1", 1), make_node("a2", 1)]), make_task("b", 6, [make_node("b1", 2)])]
+    full = run_tasks(tasks, [0, 0], [1], horizon=120, steady_state=False)
+    short = run_tasks(tasks, [0, 0], [1], horizon=120)
+    assert short.hyperperiod == 12 and short.stop_reason == STOP_STEADY_STATE
+    assert short.end_time <= 24 < full.end_time
+    assert short.feasible == full.feasible
+    assert short.metrics()["normalized_response_max"] == full.metrics()["normalized_response_max"]
+
+
+def test_growing_backlog_never_repeats() -> None:
+    """Carried-over work is part of the state: an overloaded set runs the full horizon."""
+    tasks = [make_task("a", 4, [make_node("a1", 3)]), make_task("b", 6, [make_node("b1", 3)])]
+    full = run_tasks(tasks, [0, 0], [1], horizon=240, steady_state=False)
+    short = run_tasks(tasks, [0, 0], [1], horizon=240)
+    assert short.stop_reason == STOP_HORIZON
+    assert short.deadline_misses == full.deadline_misses > 0
+
+
+def test_stop_at_first_miss() -> None:
+    tasks = [make_task("a", 5, [make_node("a1", 6)])]
+    st = run_tasks(tasks, [0], [1], horizon=100, stop_at_first_miss=True)
+    assert st.stop_reason == STOP_FIRST_MISS and st.deadline_misses == 1 and st.end_time == 5
+
+
+def test_overruns_repeat_per_hyperperiod() -> None:
+    """Overrun draws repeat with the hyperperiod, so runs with overruns still stop early."""
+    hi = make_task("hi", 10, [make_node("h", 2, HI, c_over=4)])
+    lo = make_task("lo", 20, [make_node("l", 3)])
+    full = run_tasks([hi, lo], [0, 0], [1], horizon=400, overrun_prob=0.5, seed=3, steady_state=False)
+    short = run_tasks([hi, lo], [0, 0], [1], horizon=400, overrun_prob=0.5, seed=3)
+    assert short.stop_reason == STOP_STEADY_STATE and short.end_time < full.end_time
+    assert short.feasible == full.feasible
+    assert short.metrics()["normalized_response_max"] == full.metrics()["normalized_response_max"]
@@ -0,0 +1,98 @@
+"""Task-set file format tests (binary chunks, JSONL)."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from rts_sim.config import Config
+from rts_sim.gen.dag import generate_dag_task_set, generate_packed_task_sets, generate_task_set_corpus
+from rts_sim.store.tasksets import (
+    BinaryTaskSetReader,
+    BinaryTaskSetWriter,
+    JsonlTaskSetReader,
+    load_task_set,
+    open_task_set_reader,
+    open_task_set_writer,
+)
+
+
+@pytest.mark.parametrize("suffix", [".rtsb", ".jsonl", ".json"])
+def test_round_trip(config: Config, tmp_path: Path, suffix: str) -> None:
+    """Every format reloads exactly the generated task set."""
+    path = tmp_path / f"ts{suffix}"
+    ts = generate_dag_task_set(config, seed=3, output_path=path)
+    assert load_task_set(path) == ts
+
+
+def test_streaming_writer_and_lazy_reader(config: Config, tmp_path: Path) -> None:
+    """Tasks written one by one are read back lazily by index, chunk by chunk."""
+    ts = generate_dag_task_set(config, seed=4)
+    path = tmp_path / "stream.rtsb"
+    with open_task_set_writer(path, chunk_size=3) as w:
+        for t in ts.tasks:
+            w.write_task(t)
+    with open_task_set_reader(path) as r:
+        assert isinstance(r, BinaryTaskSetReader)
+        assert len(r) == len(ts.tasks) and r.n_chunks == -(-len(ts.tasks) // 3)
+        assert r.task(len(ts.tasks) - 1) == ts.tasks[-1]
+        assert list(r) == ts.tasks
+    jpath = tmp_path / "stream.jsonl"
+    with open_task_set_writer(jpath) as w:
+        for t in ts.tasks:
+            w.write_task(t)
+    with open_task_set_reader(jpath) as r:
+        assert len(r) == len(ts.tasks) and r.task(2) == ts.tasks[2]
+    with JsonlTaskSetReader(jpath, chunk_size=3) as r:
+        assert r.n_chunks == -(-len(ts.tasks) // 3) and r.chunk_meta(0) == {}
+        assert [t for c in r.iter_chunks() for t in c.to_task_set().tasks] == ts.tasks
+
+
+def test_jsonl_corpus_keeps_set_boundaries(config: Config, tmp_path: Path) -> None:
+    """A JSONL corpus reads back set by set, like the binary one; loose tasks and a torn
+    set around it do not blur the boundaries."""
+    generate_task_set_corpus(config, 3, tmp_path / "c.rtsb", seed=1)
+    path = tmp_path / "c.jsonl"
+    generate_task_set_corpus(config, 3, path, seed=1)
+    with BinaryTaskSetReader(tmp_path / "c.rtsb") as b, JsonlTaskSetReader(path) as r:
+        assert len(r) == 3 * config.gen.n_tasks and r.n_chunks == 3
+        for j in range(3):
+            assert r.chunk_meta(j) == {"set": j}
+            assert r.chunk(j).to_task_set() == b.chunk(j).to_task_set()
+        with pytest.raises(ValueError, match="3 task sets"):
+            r.to_task_set()
+        with pytest.raises(ValueError, match="3 task sets"):
+            b.to_task_set()
+        loose = b.chunk(0).task(0)
+    with open_task_set_writer(path, append=True) as w:
+        w.write_task(loose)
+        w.write_packed(generate_packed_task_sets(config, seed=9)[0], meta={"set": 3})
+    lines = path.read_bytes().splitlines(keepends=True)
+    path.write_bytes(b"".join(lines[:-2]))  # the last set loses its last two tasks
+    with JsonlTaskSetReader(path) as r:
+        assert r.n_chunks == 4 and r.chunk_meta(3) == {}
+        assert r.chunk(3).to_task_set().tasks == [loose] and len(r) == 3 * config.gen.n_tasks + 1
+
+
+def test_corpus_and_truncated_tail(config: Config, tmp_path: Path) -> None:
+    """A corpus stores one chunk per set; a torn trailing chunk is ignored."""
+    path = tmp_path / "corpus.rtsb"
+    n = generate_task_set_corpus(config, 5, path, seed=1, batch_size=2)
+    assert n == 5 * config.gen.n_tasks
+    with BinaryTaskSetReader(path) as r:
+        assert r.n_chunks == 5 and r.chunk_meta(4) == {"set": 4}
+        last = r.chunk(4)
+        assert last.n_tasks == config.gen.n_tasks
+        assert np.all(last.L_overflow <= last.C_overflow + 1e-9)
+    size = path.stat().st_size
+    with open(path, "r+b") as f:
+        f.truncate(size - 10)
+    with BinaryTaskSetReader(path) as r:
+        assert r.n_chunks == 4
+    # Appending drops the torn chunk and keeps the complete ones.
+    extra = generate_packed_task_sets(config, seed=9)[0]
+    with BinaryTaskSetWriter(path, append=True) as w:
+        w.write_packed(extra)
+    with BinaryTaskSetReader(path) as r:
+        assert r.n_chunks == 5
+        assert r.chunk(4).to_task_set() == extra.to_task_set()
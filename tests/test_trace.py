@@ -0,0 +1,84 @@
+"""Schedule trace recorder and Gantt reader tests."""
+
+import numpy as np
+import pytest
+
+from rts_sim.models import Criticality, TaskSet
+from rts_sim.packed import PackedTaskSet
+from rts_sim.sched.simulator import simulate
+from rts_sim.sched.trace import (
+    TR_DROP,
+    TR_JOB_DONE,
+    TR_LOCK_GRANT,
+    TR_LOCK_WAIT,
+    TR_PREEMPT,
+    TR_RELEASE,
+    TR_STOP,
+    TRACE_DTYPE,
+    TraceRecorder,
+    gantt,
+    read_trace,
+)
+from tests.helpers import cross_lock_tasks, make_node, make_task, run_tasks
+
+HI, LO = Criticality.HI, Criticality.LO
+
+
+def _preempting_pair() -> list:
+    """lo runs 2..10, the second hi job preempts it at 10, lo finishes at 13."""
+    return [make_task("hi", 10, [make_node("h", 2, HI)]), make_task("lo", 20, [make_node("l", 9, LO)])]
+
+
+def test_record_width_is_fixed() -> None:
+    assert TRACE_DTYPE.itemsize == 37
+
+
+def test_traced_run_matches_untraced() -> None:
+    # An overrunning HI node next to the lock users switches modes and drops LO nodes.
+    tasks = [*cross_lock_tasks(), make_task("o", 40, [make_node("o1", 2, HI, c_over=6), make_node("o2", 8)])]
+    trace = TraceRecorder()
+    traced = run_tasks(tasks, [0, 1, 0], [2, 2], horizon=80, overrun_prob=1.0, trace=trace)
+    plain = run_tasks(tasks, [0, 1, 0], [2, 2], horizon=80, overrun_prob=1.0)
+    assert traced.metrics() == plain.metrics()
+    rec = trace.records()
+    kinds = rec["kind"].tolist()
+    assert kinds.count(TR_RELEASE) == plain.jobs_released
+    assert kinds.count(TR_JOB_DONE) == plain.jobs_completed
+    assert kinds.count(TR_DROP) == plain.dropped_nodes > 0
+    assert kinds.count(TR_LOCK_WAIT) == plain.locks.totals()["lock_waits"]
+    assert TR_LOCK_GRANT in kinds
+    assert np.all(np.diff(rec["time"]) >= 0)
+
+
+def test_gantt_bars_per_core() -> None:
+    trace = TraceRecorder()
+    st = run_tasks(_preempting_pair(), [0, 0], [1], horizon=20, trace=trace)
+    assert st.preemptions == 1
+    bars = gantt(trace.records())
+    assert list(bars) == [(0, 0)]
+    b = bars[(0, 0)]
+    assert list(zip(b["start"].tolist(), b["end"].tolist())) == [(0, 2), (2, 10), (10, 12), (12, 13)]
+    assert b["end_kind"].tolist() == [TR_STOP, TR_PREEMPT, TR_STOP, TR_STOP]
+    assert b["task"].tolist() == [0, 1, 0, 1] and b["release"].tolist() == [0, 0, 10, 0]
+
+
+def test_ring_keeps_newest_records() -> None:
+    full, ring = TraceRecorder(), TraceRecorder(capacity=4)
+    for trace in (full, ring):
+        run_tasks(_preempting_pair(), [0, 0], [1], horizon=20, trace=trace)
+    assert ring.total == full.total and ring.dropped == full.total - 4
+    assert ring.records().tobytes() == full.records()[-4:].tobytes()
+
+
+def test_file_chunks_round_trip(tmp_path) -> None:
+    path = tmp_path / "run.trace"
+    full = TraceRecorder()
+    with TraceRecorder(capacity=3, path=path) as chunked:
+        packed = PackedTaskSet.from_task_set(TaskSet(tasks=_preempting_pair()))
+        simulate(packed, np.array([0, 0]), np.array([1]), horizon=20, trace=chunked)
+    run_tasks(_preempting_pair(), [0, 0], [1], horizon=20, trace=full)
+    assert chunked.dropped == 0
+    assert read_trace(path).tobytes() == full.records().tobytes()
+    (tmp_path / "other").write_bytes(b"not a trace")
+    with pytest.raises(ValueError):
+        read_trace(tmp_path / "other")
@@ -0,0 +1,50 @@
+"""Utilization generator tests (RandFixedSum, UUniFast)."""
+
+import numpy as np
+import pytest
+
+from rts_sim.gen.utilization import (
+    UUniFastStats,
+    rand_fixed_sum,
+    rand_fixed_sum_batch,
+    uunifast_discard,
+    uunifast_discard_batch,
+)
+
+
+def test_rand_fixed_sum_batch_sum_and_bounds() -> None:
+    """Every row sums to U_sum and stays inside [a, b]."""
+    x = rand_fixed_sum_batch(12, 4.2, 5000, a=0.05, b=0.9, seed=0)
+    assert x.shape == (5000, 12)
+    assert np.allclose(x.sum(axis=1), 4.2)
+    assert x.min() >= 0.05 and x.max() <= 0.9
+
+
+def test_rand_fixed_sum_batch_uniform_marginal() -> None:
+    """n=2 on [0, 1] with sum 1: first coordinate is uniform."""
+    x = rand_fixed_sum_batch(2, 1.0, 50000, a=0.0, b=1.0, seed=1)
+    hist = np.histogram(x[:, 0], bins=5, range=(0, 1))[0]
+    assert hist.min() > 0.9 * hist.max()
+
+
+def test_rand_fixed_sum_reproducible_and_infeasible() -> None:
+    """Scalar wrapper is seed-reproducible; impossible bounds raise."""
+    assert rand_fixed_sum(5, 2.0, seed=3) == rand_fixed_sum(5, 2.0, seed=3)
+    assert sum(rand_fixed_sum(5, 2.0, seed=3)) == pytest.approx(2.0)
+    with pytest.raises(ValueError):
+        rand_fixed_sum_batch(3, 4.0, 1, a=0.0, b=1.0)
+
+
+def test_uunifast_discard_batch_rejection_and_stats() -> None:
+    """Rows hit their own targets with every value < 1; stats count the retries."""
+    targets = np.array([0.5, 4.0, 9.0] * 50)
+    stats = UUniFastStats()
+    x = uunifast_discard_batch(20, targets, seed=0, stats=stats)
+    assert x.shape == (150, 20)
+    assert np.allclose(x.sum(axis=1), targets)
+    assert x.max() < 1.0 and x.min() >= 0.0
+    assert stats.accepted == 150 and stats.draws > 150
+    assert 0 < stats.acceptance_rate < 1
+    with pytest.raises(ValueError):
+        uunifast_discard_batch(3, 3.0, k=1)
+    assert uunifast_discard(4, 1.0, seed=5) == uunifast_discard(4, 1.0, seed=5)